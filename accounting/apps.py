@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def seed_sales_accounts(sender, using, **kwargs):
+    from accounting.services import ensure_sales_accounts
+    ensure_sales_accounts(using)
 
 
 class AccountingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accounting'
+
+    def ready(self):
+        # the accounts fulfilled orders and payments post to exist before the first outbox run
+        post_migrate.connect(seed_sales_accounts, sender=self)
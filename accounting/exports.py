@@ -0,0 +1,16 @@
+#accounting/exports.py
+from core.exports import Export, register
+from accounting.models import JournalLine
+
+register(Export('journal_lines', JournalLine.objects.order_by('entry__date', 'entry_id', 'id'), [
+    ('Entry', 'entry_id'),
+    ('Date', 'entry__date'),
+    ('Source', 'entry__source'),
+    ('Reference', 'entry__reference'),
+    ('Account', 'account__code'),
+    ('Account name', 'account__name'),
+    ('Currency', 'currency'),
+    ('Debit', 'debit'),
+    ('Credit', 'credit'),
+    ('Memo', 'memo'),
+], filters={'from': 'entry__date__gte', 'to': 'entry__date__lt', 'account': 'account__code'}))
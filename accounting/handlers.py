@@ -0,0 +1,37 @@
+#accounting/handlers.py
+from datetime import datetime
+from decimal import Decimal
+
+from django.conf import settings
+
+from accounting.invoices import invoice_for_order
+from accounting.models import JournalEntry
+from accounting.services import post_entry
+from core.outbox import handles
+
+
+# ------------------------------------------------
+# 🔹 Outbox handlers
+# ------------------------------------------------
+@handles('sales_order.fulfilled')
+def post_sale(event):
+    """Dr receivable / Cr revenue for the order total (once per order)."""
+    payload = event.payload
+    total = Decimal(payload['total'])
+    if not total or JournalEntry.objects.filter(source='sale', reference=payload['order_id']).exists():
+        return
+    accounts = settings.ACCOUNTING_SALES_ACCOUNTS
+    post_entry(
+        datetime.fromisoformat(payload['at']).date(),
+        [
+            {'account': accounts['receivable'], 'debit': total, 'currency': payload['currency']},
+            {'account': accounts['revenue'], 'credit': total, 'currency': payload['currency']},
+        ],
+        source='sale', reference=payload['order_id'], memo=payload['reference'],
+    )
+
+
+@handles('sales_order.fulfilled')
+def issue_sale_invoice(event):
+    """Issues the order's invoice; the PDF is rendered on first download or by `render_invoices`."""
+    invoice_for_order(event.payload['order_id'], issue_date=datetime.fromisoformat(event.payload['at']).date())
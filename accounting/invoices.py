@@ -0,0 +1,202 @@
+#accounting/invoices.py
+"""
+Invoice issuing and PDF rendering.
+
+Templates come from the project `templates/` directory (INVOICE_TEMPLATE) and
+are compiled once per process: pool workers compile them in their
+initializer, so a batch pays the parse cost once per worker, not per invoice.
+HTML is turned into PDF with WeasyPrint on a process pool; the parent only
+reads invoices and stores the PDFs in `documents`.
+
+Each invoice keeps the hash of what it was rendered from (template source +
+invoice content); while that hash is unchanged the stored document is served
+again without rendering.
+"""
+import hashlib
+import json
+from concurrent.futures import as_completed
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import F, Prefetch
+from django.template import engines
+from django.utils import timezone
+
+from accounting.models import Invoice, InvoiceLine, InvoiceSequence, default_currency
+from core.processes import django_process_pool
+from documents.services import store_file
+from operations.models import SalesOrder, SalesOrderLine
+
+ZERO = Decimal('0.00')
+
+_compiled = {}
+_digests = {}
+
+
+# ------------------------------------------------
+# ✅ Issuing
+# ------------------------------------------------
+def next_number(issue_date):
+    """INV-<year>-<000001>: gap-free per year; concurrent issuers wait on the sequence row."""
+    with transaction.atomic():
+        InvoiceSequence.objects.get_or_create(year=issue_date.year)
+        InvoiceSequence.objects.filter(year=issue_date.year).update(last=F('last') + 1, updated_at=timezone.now())
+        last = InvoiceSequence.objects.get(year=issue_date.year).last
+    return f"INV-{issue_date.year}-{last:06d}"
+
+
+def create_invoice(source, lines, customer_id=None, order_id=None, ticket_id=None, issue_date=None,
+                   currency=None, memo=''):
+    """`lines`: [{'description', 'quantity'?, 'unit_price'}]; amounts go through Decimal(str(x))."""
+    issue_date = issue_date or timezone.localdate()
+    invoice_lines = []
+    for line in lines:
+        quantity = Decimal(str(line.get('quantity', 1)))
+        unit_price = Decimal(str(line['unit_price'])).quantize(ZERO)
+        invoice_lines.append(InvoiceLine(description=line['description'], quantity=quantity,
+                                         unit_price=unit_price, amount=(quantity * unit_price).quantize(ZERO)))
+    with transaction.atomic():
+        invoice = Invoice.objects.create(
+            number=next_number(issue_date), source=source, customer_id=customer_id, order_id=order_id,
+            ticket_id=ticket_id, issue_date=issue_date, memo=memo, currency=currency or default_currency(),
+            due_date=issue_date + timedelta(days=getattr(settings, 'INVOICE_DUE_DAYS', 30)),
+            total=sum((l.amount for l in invoice_lines), ZERO),
+        )
+        for line in invoice_lines:
+            line.invoice = invoice
+        InvoiceLine.objects.bulk_create(invoice_lines)
+    return invoice
+
+
+def invoice_for_order(order_id, issue_date=None):
+    """The sale invoice of an order, issued on first call."""
+    existing = Invoice.objects.filter(order_id=order_id).first()
+    if existing is not None:
+        return existing
+    order = SalesOrder.objects.get(pk=order_id)
+    lines = [
+        {'description': f"{line.product.sku} - {line.product.name}", 'quantity': line.quantity,
+         'unit_price': line.unit_price}
+        for line in SalesOrderLine.objects.filter(order_id=order_id).select_related('product').order_by('id')
+    ]
+    return create_invoice('sale', lines, customer_id=order.customer_id, order_id=order.pk,
+                          issue_date=issue_date, memo=order.reference)
+
+
+# ------------------------------------------------
+# ✅ Rendering (runs in pool workers)
+# ------------------------------------------------
+def template_name():
+    return getattr(settings, 'INVOICE_TEMPLATE', 'invoices/invoice.html')
+
+
+def _template(name):
+    template = _compiled.get(name)
+    if template is None:
+        _compiled[name] = template = engines['django'].get_template(name)
+    return template
+
+
+def precompile():
+    """Pool warmup: parse and compile the invoice templates once per process."""
+    _template(template_name())
+
+
+def render_html(context, name=None):
+    return _template(name or template_name()).render(context)
+
+
+def render_pdf(context, name=None):
+    from weasyprint import HTML
+
+    return HTML(string=render_html(context, name), base_url=str(settings.BASE_DIR)).write_pdf()
+
+
+def _render_task(invoice_id, context, name):
+    return invoice_id, render_pdf(context, name)
+
+
+# ------------------------------------------------
+# ✅ Batches and the render cache
+# ------------------------------------------------
+def template_digest(name):
+    """Hash of the template source, so editing the template invalidates cached PDFs."""
+    digest = _digests.get(name)
+    if digest is None:
+        with open(_template(name).origin.name, 'rb') as f:
+            _digests[name] = digest = hashlib.sha256(f.read()).hexdigest()
+    return digest
+
+
+def invoice_context(invoice):
+    """Everything the template shows, as plain strings (hashable and picklable)."""
+    customer = invoice.customer
+    return {
+        'issuer': getattr(settings, 'INVOICE_ISSUER', {}),
+        'number': invoice.number,
+        'source': invoice.source,
+        'issue_date': invoice.issue_date.isoformat(),
+        'due_date': invoice.due_date.isoformat(),
+        'currency': invoice.currency,
+        'total': str(invoice.total),
+        'memo': invoice.memo,
+        'customer': {'name': customer.name, 'email': customer.email or '', 'phone': customer.phone or ''}
+        if customer else None,
+        'lines': [
+            {'description': line.description, 'quantity': str(line.quantity),
+             'unit_price': str(line.unit_price), 'amount': str(line.amount)}
+            for line in invoice.lines.all()
+        ],
+    }
+
+
+def render_hash(context, name):
+    payload = json.dumps(context, sort_keys=True, separators=(',', ':')).encode()
+    return hashlib.sha256(template_digest(name).encode() + payload).hexdigest()
+
+
+def render_invoices(invoice_ids, workers=None, force=False):
+    """
+    Renders the given invoices into `documents`, skipping those whose stored
+    PDF was rendered from identical content. One invoice renders in-process;
+    more go to a process pool. Returns {'rendered': n, 'cached': n}.
+    """
+    name = template_name()
+    invoices = (Invoice.objects.filter(pk__in=invoice_ids).select_related('customer')
+                .prefetch_related(Prefetch('lines', queryset=InvoiceLine.objects.order_by('id'))))
+    todo, counts = {}, {'rendered': 0, 'cached': 0}
+    for invoice in invoices:
+        context = invoice_context(invoice)
+        digest = render_hash(context, name)
+        if not force and invoice.document_id and invoice.render_hash == digest:
+            counts['cached'] += 1
+            continue
+        todo[invoice.pk] = (invoice, context, digest)
+
+    def store(invoice_id, pdf):
+        invoice, _, digest = todo[invoice_id]
+        document, _ = store_file(ContentFile(pdf, name=f"{invoice.number}.pdf"), kind='invoice',
+                                 content_type='application/pdf')
+        Invoice.objects.filter(pk=invoice_id).update(render_hash=digest, document=document,
+                                                     updated_at=timezone.now())
+        counts['rendered'] += 1
+
+    if len(todo) == 1:
+        invoice_id, (_, context, _) = next(iter(todo.items()))
+        store(invoice_id, render_pdf(context, name))
+    elif todo:
+        workers = min(workers or getattr(settings, 'INVOICE_WORKERS', 2), len(todo))
+        with django_process_pool(workers, warmup='accounting.invoices.precompile') as pool:
+            futures = [pool.submit(_render_task, pk, context, name) for pk, (_, context, _) in todo.items()]
+            for future in as_completed(futures):
+                store(*future.result())
+    return counts
+
+
+def invoice_document(invoice_id):
+    """The invoice's PDF document, rendered now only if the cached one is stale."""
+    render_invoices([invoice_id], workers=1)
+    return Invoice.objects.select_related('document').get(pk=invoice_id).document
@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounting.models import Period
+from accounting.services import close_period
+
+
+class Command(BaseCommand):
+    help = (
+        "Closes every open accounting period up to and including --through (YYYY-MM), "
+        "oldest first, freezing their per-account balance snapshots."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--through", required=True, help="Last month to close, YYYY-MM")
+
+    def handle(self, *args, **options):
+        try:
+            through = datetime.strptime(options["through"], "%Y-%m").date()
+        except ValueError:
+            raise CommandError("--through must look like 2025-12")
+
+        periods = Period.objects.filter(status="open", start_date__lte=through).order_by("start_date")
+        for period in periods:
+            snapshots = close_period(period)
+            self.stdout.write(f"{period.start_date:%Y-%m}: {snapshots} balances frozen")
+        self.stdout.write(self.style.SUCCESS(f"Closed {len(periods)} periods through {through:%Y-%m}"))
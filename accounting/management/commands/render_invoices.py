@@ -0,0 +1,47 @@
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounting.invoices import render_invoices
+from accounting.models import Invoice
+
+
+class Command(BaseCommand):
+    help = (
+        "Renders invoice PDFs into documents on a process pool, e.g. every service "
+        "invoice of a corporate client for a month. Invoices whose PDF is current are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--month", default=None, help="Issue month, YYYY-MM")
+        parser.add_argument("--customer", default=None, help="Customer id")
+        parser.add_argument("--source", choices=[c[0] for c in Invoice.SOURCE_CHOICES], default=None)
+        parser.add_argument("--workers", type=int, default=None)
+        parser.add_argument("--chunk-size", type=int, default=500, help="Invoices per batch")
+        parser.add_argument("--force", action="store_true", help="Render even if the cached PDF is current")
+
+    def handle(self, *args, **options):
+        invoices = Invoice.objects.order_by("id")
+        if options["month"]:
+            try:
+                month = datetime.strptime(options["month"], "%Y-%m").date()
+            except ValueError:
+                raise CommandError("--month must look like 2025-01")
+            invoices = invoices.filter(issue_date__year=month.year, issue_date__month=month.month)
+        if options["customer"]:
+            invoices = invoices.filter(customer_id=options["customer"])
+        if options["source"]:
+            invoices = invoices.filter(source=options["source"])
+
+        ids = list(invoices.values_list("id", flat=True))
+        totals = {"rendered": 0, "cached": 0}
+        started = time.perf_counter()
+        for i in range(0, len(ids), options["chunk_size"]):
+            counts = render_invoices(ids[i:i + options["chunk_size"]], workers=options["workers"],
+                                     force=options["force"])
+            for key, value in counts.items():
+                totals[key] += value
+        self.stdout.write(self.style.SUCCESS(
+            f"{totals['rendered']} rendered, {totals['cached']} already current "
+            f"in {time.perf_counter() - started:.1f}s"))
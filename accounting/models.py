@@ -1,3 +1,240 @@
+#accounting/models.py
+from django.conf import settings
+from django.core.validators import RegexValidator
 from django.db import models
+from django.core.exceptions import ValidationError
+from core.models import Base
 
-# Create your models here.
+MONEY = {'max_digits': 18, 'decimal_places': 2}
+currency_validator = RegexValidator(r'^[A-Z]{3}$', "Currency must be an ISO 4217 code, e.g. USD.")
+
+
+def default_currency():
+    return getattr(settings, 'DEFAULT_CURRENCY', 'USD')
+
+
+class Account(Base):
+    TYPE_CHOICES = [
+        ('asset', 'Asset'),
+        ('liability', 'Liability'),
+        ('equity', 'Equity'),
+        ('income', 'Income'),
+        ('expense', 'Expense'),
+    ]
+    DEBIT_NORMAL = ('asset', 'expense')
+
+    code = models.CharField(max_length=20, unique=True)
+    name = models.CharField(max_length=255)
+    type = models.CharField(max_length=20, choices=TYPE_CHOICES)
+    is_active = models.BooleanField(default=True)
+
+    class Meta:
+        db_table = 'account'
+
+    def __str__(self):
+        return f"{self.code} - {self.name}"
+
+
+class Period(Base):
+    """An accounting month. Closed periods are frozen into AccountBalance snapshots."""
+    STATUS_CHOICES = [
+        ('open', 'Open'),
+        ('closed', 'Closed'),
+    ]
+
+    start_date = models.DateField(unique=True)
+    end_date = models.DateField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='open')
+    closed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'accounting_period'
+        ordering = ['start_date']
+
+    def __str__(self):
+        return f"{self.start_date:%Y-%m} ({self.status})"
+
+
+class JournalEntry(Base):
+    """
+    A balanced set of journal lines. Posted through accounting.services.post_entry,
+    which checks debits == credits per currency before the transaction commits.
+    Entries are never edited; mistakes are corrected with a reversing entry.
+    """
+    SOURCE_CHOICES = [
+        ('manual', 'Manual'),
+        ('sale', 'Sale'),
+        ('purchase', 'Purchase'),
+        ('service', 'Service'),
+        ('payment', 'Payment'),
+        ('reversal', 'Reversal'),
+    ]
+
+    period = models.ForeignKey(Period, on_delete=models.PROTECT, related_name="entries")
+    date = models.DateField()
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES, default='manual')
+    reference = models.CharField(max_length=64, blank=True, default='', help_text="Order / invoice id")
+    memo = models.CharField(max_length=255, blank=True, default='')
+    reverses = models.OneToOneField('self', on_delete=models.PROTECT, null=True, blank=True, related_name="reversed_by")
+
+    class Meta:
+        db_table = 'journal_entry'
+        indexes = [
+            models.Index(fields=['reference'], name='journal_entry_reference_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.source} {self.reference}".strip()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValidationError("Posted journal entries cannot be changed; post a reversal instead.")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValidationError("Posted journal entries cannot be deleted; post a reversal instead.")
+
+
+class JournalLine(Base):
+    """
+    One debit or credit. `period` is copied from the entry so period
+    aggregates read only this table, through (period, account, currency).
+    """
+    entry = models.ForeignKey(JournalEntry, on_delete=models.PROTECT, related_name="lines")
+    period = models.ForeignKey(Period, on_delete=models.PROTECT, related_name="lines")
+    account = models.ForeignKey(Account, on_delete=models.PROTECT, related_name="lines")
+    currency = models.CharField(max_length=3, default=default_currency, validators=[currency_validator])
+    debit = models.DecimalField(default=0, **MONEY)
+    credit = models.DecimalField(default=0, **MONEY)
+    memo = models.CharField(max_length=255, blank=True, default='')
+
+    class Meta:
+        db_table = 'journal_line'
+        indexes = [
+            models.Index(fields=['period', 'account', 'currency'], name='journal_line_period_acct_idx'),
+            models.Index(fields=['account', 'period'], name='journal_line_account_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=(models.Q(debit__gt=0, credit=0) | models.Q(debit=0, credit__gt=0)),
+                name='journal_line_one_side',
+            ),
+        ]
+
+    def __str__(self):
+        side = f"Dr {self.debit}" if self.debit else f"Cr {self.credit}"
+        return f"{self.account_id} {side} {self.currency}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValidationError("Journal lines are append-only.")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValidationError("Journal lines are append-only.")
+
+
+class AccountBalance(Base):
+    """
+    Frozen per-account, per-period snapshot written when a period closes:
+    the period's debit/credit totals and the cumulative balance (debit - credit)
+    at period end. Reports read the latest snapshot plus the open periods' lines.
+    """
+    account = models.ForeignKey(Account, on_delete=models.PROTECT, related_name="balances")
+    period = models.ForeignKey(Period, on_delete=models.PROTECT, related_name="balances")
+    currency = models.CharField(max_length=3, validators=[currency_validator])
+    debit = models.DecimalField(default=0, **MONEY)
+    credit = models.DecimalField(default=0, **MONEY)
+    balance = models.DecimalField(default=0, **MONEY)
+
+    class Meta:
+        db_table = 'account_balance'
+        constraints = [
+            models.UniqueConstraint(fields=['period', 'account', 'currency'], name='account_balance_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.account_id} {self.period_id} {self.currency}: {self.balance}"
+
+
+class CustomerPayment(Base):
+    """Money received from a customer against their receivable; posted by accounting.services.receive_payment."""
+    customer = models.ForeignKey('crm.Customer', on_delete=models.PROTECT, related_name="payments")
+    entry = models.OneToOneField(JournalEntry, on_delete=models.PROTECT, related_name="payment")
+    date = models.DateField()
+    currency = models.CharField(max_length=3, default=default_currency, validators=[currency_validator])
+    amount = models.DecimalField(**MONEY)
+    reference = models.CharField(max_length=64, blank=True, default='')
+
+    class Meta:
+        db_table = 'customer_payment'
+        indexes = [
+            models.Index(fields=['customer', 'date'], name='customer_payment_customer_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(condition=models.Q(amount__gt=0), name='customer_payment_amount_gt_0'),
+        ]
+
+    def __str__(self):
+        return f"{self.customer_id} {self.amount} {self.currency}"
+
+
+class InvoiceSequence(Base):
+    """Last invoice number issued per year; the row lock serializes numbering."""
+    year = models.PositiveIntegerField(unique=True)
+    last = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'invoice_sequence'
+
+    def __str__(self):
+        return f"{self.year}: {self.last}"
+
+
+class Invoice(Base):
+    """
+    A customer invoice for a sale or a service job. The PDF is rendered by
+    accounting.invoices into a documents.Document and reused while the
+    invoice's render_hash (template + content) is unchanged.
+    """
+    SOURCE_CHOICES = [
+        ('sale', 'Sale'),
+        ('service', 'Service'),
+    ]
+
+    number = models.CharField(max_length=32, unique=True)
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES)
+    customer = models.ForeignKey('crm.Customer', on_delete=models.PROTECT, null=True, blank=True, related_name="invoices")
+    order = models.OneToOneField('operations.SalesOrder', on_delete=models.PROTECT, null=True, blank=True, related_name="invoice")
+    ticket = models.ForeignKey('crm.ServiceTicket', on_delete=models.PROTECT, null=True, blank=True, related_name="invoices")
+    issue_date = models.DateField()
+    due_date = models.DateField()
+    currency = models.CharField(max_length=3, default=default_currency, validators=[currency_validator])
+    total = models.DecimalField(default=0, **MONEY)
+    memo = models.CharField(max_length=255, blank=True, default='')
+    render_hash = models.CharField(max_length=64, blank=True, default='', editable=False)
+    document = models.ForeignKey('documents.Document', on_delete=models.SET_NULL, null=True, blank=True, related_name="invoices")
+
+    class Meta:
+        db_table = 'invoice'
+        indexes = [
+            models.Index(fields=['customer', 'issue_date'], name='invoice_customer_date_idx'),
+            models.Index(fields=['render_hash'], name='invoice_render_hash_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.number} {self.total} {self.currency}"
+
+
+class InvoiceLine(Base):
+    invoice = models.ForeignKey(Invoice, on_delete=models.CASCADE, related_name="lines")
+    description = models.CharField(max_length=255)
+    quantity = models.DecimalField(max_digits=12, decimal_places=2, default=1)
+    unit_price = models.DecimalField(**MONEY)
+    amount = models.DecimalField(**MONEY)
+
+    class Meta:
+        db_table = 'invoice_line'
+
+    def __str__(self):
+        return f"{self.description} {self.amount}"
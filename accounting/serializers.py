@@ -0,0 +1,44 @@
+from rest_framework import serializers
+from accounting.models import Invoice, InvoiceLine
+from crm.models import Customer, ServiceTicket
+
+
+# ------------------------------------------------
+# ✅ Invoice Serializers
+# ------------------------------------------------
+class InvoiceLineSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = InvoiceLine
+        fields = ['id', 'description', 'quantity', 'unit_price', 'amount']
+
+
+class InvoiceSerializer(serializers.ModelSerializer):
+    lines = InvoiceLineSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Invoice
+        fields = ['id', 'number', 'source', 'customer', 'order', 'ticket', 'issue_date', 'due_date', 'currency',
+                  'total', 'memo', 'document', 'lines', 'created_at']
+        read_only_fields = fields
+
+
+class InvoiceLineInputSerializer(serializers.Serializer):
+    description = serializers.CharField(max_length=255)
+    quantity = serializers.DecimalField(max_digits=12, decimal_places=2, min_value=0, default=1)
+    unit_price = serializers.DecimalField(max_digits=18, decimal_places=2, min_value=0)
+
+
+class ServiceInvoiceSerializer(serializers.Serializer):
+    customer_id = serializers.PrimaryKeyRelatedField(queryset=Customer.objects.all())
+    ticket_id = serializers.PrimaryKeyRelatedField(
+        queryset=ServiceTicket.objects.all(), required=False, allow_null=True, default=None
+    )
+    issue_date = serializers.DateField(required=False, default=None)
+    memo = serializers.CharField(max_length=255, required=False, allow_blank=True, default='')
+    lines = InvoiceLineInputSerializer(many=True, allow_empty=False)
+
+    def validate(self, attrs):
+        ticket = attrs['ticket_id']
+        if ticket is not None and ticket.customer_id != attrs['customer_id'].pk:
+            raise serializers.ValidationError({'ticket_id': "Ticket belongs to another customer."})
+        return attrs
@@ -0,0 +1,292 @@
+#accounting/services.py
+import calendar
+from collections import defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from core.outbox import publish
+
+from accounting.models import Account, AccountBalance, CustomerPayment, JournalEntry, JournalLine, Period, default_currency
+
+ZERO = Decimal('0.00')
+
+
+class UnbalancedEntry(ValidationError):
+    pass
+
+
+class PeriodClosed(ValidationError):
+    pass
+
+
+# ------------------------------------------------
+# ✅ Accounts the automatic postings use (seeded after migrate)
+# ------------------------------------------------
+SALES_ACCOUNT_DEFAULTS = {
+    'receivable': ('Accounts Receivable', 'asset'),
+    'revenue': ('Sales Revenue', 'income'),
+    'cash': ('Cash', 'asset'),
+}
+
+
+def ensure_sales_accounts(using='default'):
+    """
+    Creates any ACCOUNTING_SALES_ACCOUNTS code missing from the chart, so the
+    sale and payment postings work on a fresh install. Returns the codes created.
+    """
+    created = []
+    for role, code in settings.ACCOUNTING_SALES_ACCOUNTS.items():
+        name, kind = SALES_ACCOUNT_DEFAULTS.get(role, (role.title(), 'asset'))
+        _, was_created = Account.objects.using(using).get_or_create(code=code, defaults={'name': name, 'type': kind})
+        if was_created:
+            created.append(code)
+    return created
+
+
+# ------------------------------------------------
+# ✅ Periods
+# ------------------------------------------------
+def period_for(date):
+    """The monthly period containing `date`, created on first use."""
+    start = date.replace(day=1)
+    end = date.replace(day=calendar.monthrange(date.year, date.month)[1])
+    period, _ = Period.objects.get_or_create(start_date=start, defaults={'end_date': end})
+    return period
+
+
+def _lock_period_shared(period):
+    """
+    FOR KEY SHARE on the period row and every later one: concurrent postings
+    do not block each other, but close_period (FOR UPDATE) waits for them and
+    they wait for it, so the statuses read here stay true until commit.
+
+    Nothing may be posted in or before a closed period: trial_balance reads
+    only the periods after the latest snapshot, so a backdated entry (or a
+    new, earlier period) would never reach the balances. Corrections go into
+    the current open period, e.g. with reverse_entry.
+    """
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT start_date, status FROM accounting_period WHERE start_date >= %s "
+                "ORDER BY start_date FOR KEY SHARE",
+                [period.start_date],
+            )
+            rows = cursor.fetchall()
+    else:
+        rows = list(Period.objects.filter(start_date__gte=period.start_date)
+                    .order_by('start_date').values_list('start_date', 'status'))
+    closed = [start for start, status in rows if status == 'closed']
+    if closed:
+        raise PeriodClosed(
+            f"Books are closed through {max(closed):%Y-%m}; post into the current open period instead."
+        )
+
+
+# ------------------------------------------------
+# ✅ Posting
+# ------------------------------------------------
+def _check_balanced(lines):
+    totals = defaultdict(lambda: [ZERO, ZERO])
+    for line in lines:
+        if (line.debit > 0) == (line.credit > 0) or line.debit < 0 or line.credit < 0:
+            raise UnbalancedEntry("Each line needs exactly one positive debit or credit.")
+        totals[line.currency][0] += line.debit
+        totals[line.currency][1] += line.credit
+    if len(lines) < 2:
+        raise UnbalancedEntry("A journal entry needs at least two lines.")
+    for currency, (debit, credit) in totals.items():
+        if debit != credit:
+            raise UnbalancedEntry(f"Entry is unbalanced in {currency}: debit {debit} != credit {credit}")
+
+
+def post_entry(date, lines, source='manual', reference='', memo='', reverses=None):
+    """
+    Posts a journal entry in one transaction. Raises PeriodClosed when `date`
+    falls in or before a closed period.
+
+    `lines`: [{'account': code or Account, 'debit'?, 'credit'?, 'currency'?, 'memo'?}]
+    Amounts go through Decimal(str(x)); debits must equal credits per currency.
+    """
+    codes = {l['account'] for l in lines if not isinstance(l['account'], Account)}
+    accounts = {a.code: a for a in Account.objects.filter(code__in=codes)}
+    missing = codes - set(accounts)
+    if missing:
+        raise ValidationError(f"Unknown accounts: {', '.join(sorted(missing))}")
+
+    journal_lines = [
+        JournalLine(
+            account=line['account'] if isinstance(line['account'], Account) else accounts[line['account']],
+            currency=line.get('currency') or default_currency(),
+            debit=Decimal(str(line.get('debit') or 0)).quantize(ZERO),
+            credit=Decimal(str(line.get('credit') or 0)).quantize(ZERO),
+            memo=line.get('memo', ''),
+        )
+        for line in lines
+    ]
+    _check_balanced(journal_lines)
+
+    with transaction.atomic():
+        period = period_for(date)
+        _lock_period_shared(period)
+        entry = JournalEntry.objects.create(
+            period=period, date=date, source=source, reference=reference, memo=memo, reverses=reverses,
+        )
+        for line in journal_lines:
+            line.entry = entry
+            line.period = period
+        JournalLine.objects.bulk_create(journal_lines)
+    return entry
+
+
+def reverse_entry(entry, date=None, memo=''):
+    """Posts the mirror image of `entry`, dated `date` (default today, in the current open period)."""
+    lines = [
+        {'account': line.account, 'currency': line.currency,
+         'debit': line.credit, 'credit': line.debit, 'memo': line.memo}
+        for line in entry.lines.select_related('account')
+    ]
+    return post_entry(date or timezone.localdate(), lines, source='reversal',
+                      reference=entry.reference, memo=memo or f"Reversal of {entry.pk}", reverses=entry)
+
+
+def receive_payment(customer_id, amount, date=None, currency=None, reference=''):
+    """Dr cash / Cr receivable for a customer payment, recorded and published in the same transaction."""
+    amount = Decimal(str(amount)).quantize(ZERO)
+    if amount <= 0:
+        raise ValidationError("Payment amount must be positive.")
+    date = date or timezone.localdate()
+    currency = currency or default_currency()
+    accounts = settings.ACCOUNTING_SALES_ACCOUNTS
+    with transaction.atomic():
+        entry = post_entry(
+            date,
+            [
+                {'account': accounts['cash'], 'debit': amount, 'currency': currency},
+                {'account': accounts['receivable'], 'credit': amount, 'currency': currency},
+            ],
+            source='payment', reference=str(customer_id), memo=reference,
+        )
+        payment = CustomerPayment.objects.create(
+            customer_id=customer_id, entry=entry, date=date, currency=currency, amount=amount, reference=reference,
+        )
+        publish('customer_payment.received', {
+            'payment_id': str(payment.pk), 'customer_id': str(customer_id),
+            'date': date.isoformat(), 'currency': currency, 'amount': str(amount),
+        })
+    return payment
+
+
+# ------------------------------------------------
+# ✅ Period close
+# ------------------------------------------------
+def _period_totals(periods):
+    """{(account_id, currency): [debit, credit]} over the journal lines of `periods`."""
+    rows = (JournalLine.objects.filter(period__in=periods)
+            .values('account_id', 'currency')
+            .annotate(debit=Sum('debit'), credit=Sum('credit'))
+            .order_by())
+    return {(row['account_id'], row['currency']): [row['debit'], row['credit']] for row in rows}
+
+
+def close_period(period):
+    """
+    Freezes `period`: writes one AccountBalance per (account, currency) with
+    the period totals and the cumulative balance carried from the previous
+    snapshot. Periods close in order.
+    """
+    with transaction.atomic():
+        period = Period.objects.select_for_update().get(pk=period.pk)
+        if period.status == 'closed':
+            raise PeriodClosed(f"Period {period.start_date:%Y-%m} is already closed.")
+        if Period.objects.filter(start_date__lt=period.start_date, status='open').exists():
+            raise ValidationError("Earlier periods must be closed first.")
+
+        previous = (Period.objects.filter(start_date__lt=period.start_date, status='closed')
+                    .order_by('-start_date').first())
+        carried = {}
+        if previous is not None:
+            carried = {
+                (b.account_id, b.currency): b.balance
+                for b in AccountBalance.objects.filter(period=previous).only('account_id', 'currency', 'balance')
+            }
+        totals = _period_totals([period])
+
+        snapshots = []
+        for key in sorted(set(carried) | set(totals), key=str):
+            debit, credit = totals.get(key, (ZERO, ZERO))
+            balance = carried.get(key, ZERO) + debit - credit
+            if not (debit or credit or balance):
+                continue
+            snapshots.append(AccountBalance(account_id=key[0], period=period, currency=key[1],
+                                            debit=debit, credit=credit, balance=balance))
+        AccountBalance.objects.bulk_create(snapshots, batch_size=1000)
+
+        period.status = 'closed'
+        period.closed_at = timezone.now()
+        period.save()
+    return len(snapshots)
+
+
+# ------------------------------------------------
+# ✅ Reports (snapshot + open periods only)
+# ------------------------------------------------
+def _latest_closed(before=None):
+    closed = Period.objects.filter(status='closed')
+    if before is not None:
+        closed = closed.filter(start_date__lte=before)
+    return closed.order_by('-start_date').first()
+
+
+def trial_balance(as_of=None):
+    """
+    {(account code, currency): balance (debit - credit)} at the end of the
+    period containing `as_of` (default: everything posted). Reads the latest
+    closed snapshot and aggregates only the open periods after it.
+    """
+    snapshot = _latest_closed(as_of)
+    balances = defaultdict(lambda: ZERO)
+    if snapshot is not None:
+        for row in AccountBalance.objects.filter(period=snapshot).values('account_id', 'currency', 'balance'):
+            balances[(row['account_id'], row['currency'])] += row['balance']
+
+    open_periods = Period.objects.all()
+    if snapshot is not None:
+        open_periods = open_periods.filter(start_date__gt=snapshot.start_date)
+    if as_of is not None:
+        open_periods = open_periods.filter(start_date__lte=as_of)
+    for key, (debit, credit) in _period_totals(open_periods).items():
+        balances[key] += debit - credit
+
+    codes = dict(Account.objects.filter(pk__in={k[0] for k in balances}).values_list('id', 'code'))
+    return {(codes[account_id], currency): balance
+            for (account_id, currency), balance in sorted(balances.items(), key=lambda i: (codes[i[0][0]], i[0][1]))
+            if balance}
+
+
+def profit_and_loss(start, end):
+    """
+    {(account code, currency): net} for income and expense accounts between the
+    periods containing `start` and `end`; income is reported positive.
+    Closed periods use their snapshot totals, open ones their lines.
+    """
+    periods = Period.objects.filter(start_date__gte=start.replace(day=1), start_date__lte=end)
+    net = defaultdict(lambda: ZERO)
+    rows = (AccountBalance.objects.filter(period__in=periods.filter(status='closed'),
+                                          account__type__in=('income', 'expense'))
+            .values('account_id', 'currency').annotate(debit=Sum('debit'), credit=Sum('credit')).order_by())
+    for row in rows:
+        net[(row['account_id'], row['currency'])] += row['credit'] - row['debit']
+    rows = (JournalLine.objects.filter(period__in=periods.filter(status='open'),
+                                       account__type__in=('income', 'expense'))
+            .values('account_id', 'currency').annotate(debit=Sum('debit'), credit=Sum('credit')).order_by())
+    for row in rows:
+        net[(row['account_id'], row['currency'])] += row['credit'] - row['debit']
+
+    codes = dict(Account.objects.filter(pk__in={k[0] for k in net}).values_list('id', 'code'))
+    return {(codes[account_id], currency): amount for (account_id, currency), amount in net.items() if amount}
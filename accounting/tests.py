@@ -1,3 +1,135 @@
+import datetime as dt
+import io
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from accounting import services
+from accounting.models import Account, AccountBalance, Invoice, JournalLine, Period
+from crm.models import Customer
+from crm.services import open_ticket
+from users.models import User
+
+
+def make_accounts():
+    for code, kind in [("1000", "asset"), ("1100", "asset"), ("2000", "liability"), ("4000", "income"), ("5000", "expense")]:
+        Account.objects.get_or_create(code=code, defaults={"name": code, "type": kind})
+
+
+def sale(date, amount):
+    return services.post_entry(date, [{"account": "1000", "debit": amount}, {"account": "4000", "credit": amount}], source="sale")
+
+
+def close_through(month):
+    call_command("close_period", "--through", month, stdout=io.StringIO())
+
+
+# ------------------------------------------------
+# 🔹 Double-entry posting and period close
+# ------------------------------------------------
+class JournalTests(TestCase):
+    def setUp(self):
+        make_accounts()
+
+    def test_unbalanced_entries_rejected(self):
+        with self.assertRaises(services.UnbalancedEntry):
+            services.post_entry(dt.date(2025, 1, 9), [{"account": "5000", "debit": 40}, {"account": "1000", "credit": 39}])
+        with self.assertRaises(services.UnbalancedEntry):
+            services.post_entry(dt.date(2025, 1, 9), [{"account": "5000", "debit": 40}, {"account": "1000", "credit": 40, "currency": "EUR"}])
+        with self.assertRaises(ValidationError):
+            services.post_entry(dt.date(2025, 1, 9), [{"account": "9999", "debit": 1}, {"account": "1000", "credit": 1}])
+        self.assertFalse(JournalLine.objects.exists())
+
+    def test_entries_are_immutable(self):
+        entry = sale(dt.date(2025, 1, 5), "10")
+        with self.assertRaises(ValidationError):
+            entry.delete()
+        with self.assertRaises(ValidationError):
+            entry.save()
+
+    def test_trial_balance_across_closed_and_open_periods(self):
+        sale(dt.date(2025, 1, 5), "100.10")
+        services.post_entry(dt.date(2025, 1, 9), [{"account": "5000", "debit": 40}, {"account": "1000", "credit": 40}])
+        sale(dt.date(2025, 2, 1), "10")
+        close_through("2025-01")
+
+        self.assertEqual(AccountBalance.objects.count(), 3)
+        balances = services.trial_balance()
+        self.assertEqual(balances[("1000", "USD")], Decimal("70.10"))
+        self.assertEqual(balances[("4000", "USD")], Decimal("-110.10"))
+        self.assertEqual(sum(balances.values()), 0)
+        self.assertEqual(services.trial_balance(dt.date(2025, 1, 31))[("1000", "USD")], Decimal("60.10"))
+
+        pnl = services.profit_and_loss(dt.date(2025, 1, 1), dt.date(2025, 2, 28))
+        self.assertEqual(pnl[("4000", "USD")], Decimal("110.10"))
+        self.assertEqual(pnl[("5000", "USD")], Decimal("-40"))
+
+    def test_posting_into_closed_period_rejected(self):
+        sale(dt.date(2025, 1, 5), "10")
+        close_through("2025-01")
+        with self.assertRaises(services.PeriodClosed):
+            sale(dt.date(2025, 1, 9), "1")
+
+    def test_backdated_posting_before_closed_period_rejected(self):
+        sale(dt.date(2025, 3, 5), "10")
+        close_through("2025-03")
+        # no December period exists yet: it must not be created behind the closed books
+        with self.assertRaises(services.PeriodClosed):
+            sale(dt.date(2024, 12, 20), "5")
+        self.assertFalse(Period.objects.filter(start_date=dt.date(2024, 12, 1)).exists())
+        self.assertEqual(services.trial_balance()[("1000", "USD")], Decimal("10"))
+
+    def test_correction_reversed_in_open_period(self):
+        entry = sale(dt.date(2025, 1, 5), "10")
+        close_through("2025-01")
+        services.reverse_entry(entry, date=dt.date(2025, 2, 3))
+        self.assertNotIn(("4000", "USD"), services.trial_balance())
+        close_through("2025-02")
+        self.assertEqual(services.trial_balance(), {})
+
+    def test_periods_close_in_order(self):
+        sale(dt.date(2025, 1, 5), "10")
+        sale(dt.date(2025, 2, 5), "10")
+        with self.assertRaises(ValidationError):
+            services.close_period(Period.objects.get(start_date=dt.date(2025, 2, 1)))
+
+
+# ------------------------------------------------
+# 🔹 Service invoices
+# ------------------------------------------------
+class ServiceInvoiceTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(
+            username="admin", password="Passw0rd!", email="admin@gmail.com", is_staff=True))
+        self.acme = Customer.objects.create(name="Acme")
+        self.globex = Customer.objects.create(name="Globex")
+        self.ticket = open_ticket(self.acme.pk, "Printer repair")
+
+    def issue(self, customer_id, ticket_id=None):
+        body = {"customer_id": str(customer_id), "lines": [{"description": "Labour", "quantity": "2", "unit_price": "40"}]}
+        if ticket_id:
+            body["ticket_id"] = str(ticket_id)
+        return self.client.post("/accounting/invoices", body, format="json")
+
+    def test_invoice_for_customer_ticket(self):
+        response = self.issue(self.acme.pk, self.ticket.pk)
+        self.assertEqual(response.status_code, 201, response.content)
+        invoice = Invoice.objects.get()
+        self.assertEqual((invoice.customer, invoice.ticket, invoice.total), (self.acme, self.ticket, Decimal("80.00")))
+
+    def test_unknown_customer_or_ticket_rejected(self):
+        unknown = "01900000-0000-7000-8000-000000000000"
+        for response, field in ((self.issue(unknown), "customer_id"), (self.issue(self.acme.pk, unknown), "ticket_id")):
+            self.assertEqual(response.status_code, 400)
+            self.assertIn(field, response.json())
+        self.assertFalse(Invoice.objects.exists())
 
-# Create your tests here.
+    def test_ticket_of_other_customer_rejected(self):
+        response = self.issue(self.globex.pk, self.ticket.pk)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["ticket_id"], ["Ticket belongs to another customer."])
+        self.assertFalse(Invoice.objects.exists())
@@ -0,0 +1,9 @@
+# accounting/urls.py
+from django.urls import path
+from .views import *
+
+urlpatterns = [
+    path('invoices', ServiceInvoiceCreateView.as_view(), name='invoice-create'),
+    path('invoices/<uuid:pk>', InvoiceDetailView.as_view(), name='invoice-detail'),
+    path('invoices/<uuid:pk>/pdf', InvoicePdfView.as_view(), name='invoice-pdf'),
+]
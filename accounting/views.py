@@ -1,3 +1,44 @@
-from django.shortcuts import render
+#accounting/views.py
+from rest_framework import generics
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from core.status import *
+from accounting.invoices import create_invoice, invoice_document
+from accounting.models import Invoice
+from accounting.serializers import InvoiceSerializer, ServiceInvoiceSerializer
+from documents.serving import document_response
 
-# Create your views here.
+
+# ------------------------------------------------
+# ✅ Invoices
+# ------------------------------------------------
+class ServiceInvoiceCreateView(generics.GenericAPIView):
+    """Issues an invoice for a service job (sale invoices are issued when the order is fulfilled)."""
+    serializer_class = ServiceInvoiceSerializer
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        ticket = data['ticket_id']
+        invoice = create_invoice('service', data['lines'], customer_id=data['customer_id'].pk,
+                                 ticket_id=ticket.pk if ticket else None, issue_date=data['issue_date'], memo=data['memo'])
+        return Response({"message": "Invoice issued.", "data": InvoiceSerializer(invoice).data}, status=S201)
+
+
+class InvoiceDetailView(generics.RetrieveAPIView):
+    queryset = Invoice.objects.prefetch_related('lines')
+    serializer_class = InvoiceSerializer
+    permission_classes = [IsAdminUser]
+
+
+class InvoicePdfView(generics.GenericAPIView):
+    """The invoice PDF; rendered only when no PDF exists for the invoice's current content."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, pk, *args, **kwargs):
+        if not Invoice.objects.filter(pk=pk).exists():
+            return Response({"error": "Invoice not found."}, status=S404)
+        document = invoice_document(pk)
+        return document_response(request, document, as_attachment=request.query_params.get('inline') != '1')
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AuthApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'auth_api'
+
+    def ready(self):
+        from auth_api import signals  # noqa: F401
@@ -0,0 +1,100 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.utils.functional import LazyObject, empty
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from auth_api.tokens import USER_CLAIMS, VERSION_CLAIM, get_user_state
+
+
+def _claim(name):
+    def getter(self):
+        if self._wrapped is not empty:
+            return getattr(self._wrapped, name)
+        return self._claims[name]
+    return property(getter)
+
+
+# ------------------------------------------------
+# 🔹 Lazy user backed by the token claims
+# ------------------------------------------------
+class ClaimsUser(LazyObject):
+    """
+    Stands in for `users.User` on authenticated requests.
+    Claimed attributes (id, username, is_active, role flags) are served from
+    the token; reading anything else loads the real row once and proxies to it.
+    Passes isinstance(user, User), so it can be assigned to FKs and used in filters.
+    """
+
+    def __init__(self, validated_token):
+        claims = {name: validated_token[name] for name in USER_CLAIMS}
+        claims["id"] = uuid.UUID(str(validated_token[api_settings.USER_ID_CLAIM]))
+        self.__dict__["_claims"] = claims
+        super().__init__()
+
+    def _setup(self):
+        self._wrapped = get_user_model().objects.get(pk=self._claims["id"])
+
+    id = _claim("id")
+    pk = _claim("id")
+    username = _claim("username")
+    is_active = _claim("is_active")
+    is_staff = _claim("is_staff")
+    is_superuser = _claim("is_superuser")
+
+    is_authenticated = True
+    is_anonymous = False
+
+    @property
+    def __class__(self):
+        return get_user_model()
+
+    @property
+    def _meta(self):
+        return get_user_model()._meta
+
+    def __bool__(self):
+        return True
+
+    def __str__(self):
+        return self.username
+
+    def __repr__(self):
+        return f"<ClaimsUser: {self.username}>"
+
+
+# ------------------------------------------------
+# 🔹 JWT authentication without the per-request user fetch
+# ------------------------------------------------
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Builds request.user from the token claims instead of SELECTing the user.
+    The `ver` claim is compared with the cached (token_version, is_active) state,
+    so deactivation, User.revoke_tokens() and any change to a claimed field
+    (User.save() bumps token_version, e.g. when is_staff is revoked) reject old tokens.
+    Tokens issued before the claim set existed fall back to the stock lookup.
+    """
+
+    def get_user(self, validated_token):
+        if VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        state = get_user_state(user_id)
+        if state is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        version, is_active = state
+        if api_settings.CHECK_USER_IS_ACTIVE and not is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if validated_token[VERSION_CLAIM] != version:
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+
+        return ClaimsUser(validated_token)
@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+SHARED_CACHE_PREFIX = "auth:jti:"
+BLACKLISTED = 1
+GOOD = 0
+
+
+# ------------------------------------------------
+# 🔹 Bounded in-process LRU with per-entry expiry
+# ------------------------------------------------
+class LRUTTLCache:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+_local = LRUTTLCache(getattr(settings, "AUTH_BLACKLIST_LRU_SIZE", 10000))
+
+
+def _shared():
+    return caches[getattr(settings, "AUTH_BLACKLIST_CACHE", "default")]
+
+
+def _shared_is_local(cache):
+    """LocMem/Dummy caches live in one process, so a logout on another worker never reaches them."""
+    return isinstance(cache, (LocMemCache, DummyCache))
+
+
+def _ttl(exp):
+    """Seconds until the token expires, never more than REFRESH_TOKEN_LIFETIME."""
+    lifetime = api_settings.REFRESH_TOKEN_LIFETIME.total_seconds()
+    return int(max(0, min(exp - time.time(), lifetime)))
+
+
+# ------------------------------------------------
+# 🔹 Blacklist lookups: local LRU -> shared cache -> token_blacklist tables
+# ------------------------------------------------
+def is_blacklisted(jti, exp):
+    """
+    Known-blacklisted JTIs are cached until the token expires.
+    Known-good JTIs are cached until expiry only in a shared cache that every
+    worker reads (mark_blacklisted overwrites them there); in the local LRU, and
+    in a per-process shared alias (the LocMemCache default), only for
+    AUTH_BLACKLIST_LOCAL_GOOD_TTL seconds, since a logout served by another
+    worker cannot reach them.
+    """
+    status = _local.get(jti)
+    if status is not None:
+        return status == BLACKLISTED
+
+    ttl = _ttl(exp)
+    good_ttl = min(ttl, getattr(settings, "AUTH_BLACKLIST_LOCAL_GOOD_TTL", 30))
+    shared = _shared()
+    status = shared.get(SHARED_CACHE_PREFIX + jti)
+    if status is None:
+        status = BLACKLISTED if BlacklistedToken.objects.filter(token__jti=jti).exists() else GOOD
+        if status == BLACKLISTED or not _shared_is_local(shared):
+            shared.set(SHARED_CACHE_PREFIX + jti, status, ttl)
+        elif good_ttl > 0:
+            shared.set(SHARED_CACHE_PREFIX + jti, status, good_ttl)
+
+    _local.set(jti, status, ttl if status == BLACKLISTED else good_ttl)
+    return status == BLACKLISTED
+
+
+def mark_blacklisted(jti, exp):
+    ttl = _ttl(exp)
+    _shared().set(SHARED_CACHE_PREFIX + jti, BLACKLISTED, ttl)
+    _local.set(jti, BLACKLISTED, ttl)
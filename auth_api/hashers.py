@@ -0,0 +1,60 @@
+"""
+Password hashers tuned from settings, plus the process pool bulk imports use.
+
+Login hashing runs on the request thread. There used to be a bounded thread
+pool for it (PASSWORD_HASH_WORKERS / PooledHashBackend), but the request
+thread waited on the pool's result, so it bounded nothing the server's own
+worker/thread count does not already bound and only added a thread hop; it
+was removed. Size concurrent login hashing through the WSGI worker and thread
+counts, and the per-hash cost through `manage.py calibrate_hasher`.
+"""
+import threading
+
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, ScryptPasswordHasher
+
+from core.processes import django_process_pool
+
+_params = getattr(settings, "PASSWORD_HASHER_PARAMS", {})
+
+
+# ------------------------------------------------
+# 🔹 Hashers tuned from settings (see `manage.py calibrate_hasher`)
+# ------------------------------------------------
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    time_cost = _params.get("argon2", {}).get("time_cost", Argon2PasswordHasher.time_cost)
+    memory_cost = _params.get("argon2", {}).get("memory_cost", Argon2PasswordHasher.memory_cost)
+    parallelism = _params.get("argon2", {}).get("parallelism", Argon2PasswordHasher.parallelism)
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    work_factor = _params.get("scrypt", {}).get("work_factor", ScryptPasswordHasher.work_factor)
+    block_size = _params.get("scrypt", {}).get("block_size", ScryptPasswordHasher.block_size)
+    parallelism = _params.get("scrypt", {}).get("parallelism", ScryptPasswordHasher.parallelism)
+    # OpenSSL caps scrypt at 32 MiB unless told otherwise; leave room for the chosen n * r
+    maxmem = 2 * 128 * work_factor * block_size
+
+
+# ------------------------------------------------
+# 🔹 Process pool for batch hashing (bulk imports)
+# ------------------------------------------------
+def hash_process_pool(workers):
+    """Map make_password over it to hash a batch on all cores."""
+    return django_process_pool(workers)
+
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+def shared_hash_process_pool():
+    """
+    One hash_process_pool per web worker, started on first use and reused, so
+    an import request does not pay for spawning and django.setup() each time.
+    Replaced if a worker process died and broke it.
+    """
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None or getattr(_shared_pool, '_broken', False):
+            _shared_pool = hash_process_pool(getattr(settings, 'USER_IMPORT_WORKERS', 2))
+        return _shared_pool
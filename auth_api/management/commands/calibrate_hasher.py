@@ -0,0 +1,75 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.crypto import get_random_string
+
+from auth_api.hashers import TunedArgon2PasswordHasher, TunedScryptPasswordHasher
+
+
+def _median_ms(hasher, samples):
+    password = get_random_string(16)
+    timings = []
+    for _ in range(samples):
+        salt = hasher.salt()
+        start = time.perf_counter()
+        hasher.encode(password, salt)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+class Command(BaseCommand):
+    help = (
+        "Times the argon2/scrypt hashers on this host and prints the cost parameters "
+        "(as OERP_* environment variables) of the cheapest setting that reaches --target-ms per hash."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--algorithm", choices=["scrypt", "argon2"], default="scrypt")
+        parser.add_argument("--target-ms", type=float, default=100.0)
+        parser.add_argument("--max-memory-mb", type=int, default=64,
+                            help="Upper bound on memory used by a single hash")
+        parser.add_argument("--samples", type=int, default=5)
+
+    def handle(self, *args, **options):
+        calibrate = getattr(self, f"_calibrate_{options['algorithm']}")
+        params, elapsed = calibrate(options["target_ms"], options["max_memory_mb"], options["samples"])
+
+        self.stdout.write(f"# {options['algorithm']}: {elapsed:.1f} ms per hash")
+        self.stdout.write(f"export OERP_PASSWORD_HASHER={options['algorithm']}")
+        for name, value in params.items():
+            self.stdout.write(f"export OERP_{options['algorithm'].upper()}_{name.upper()}={value}")
+
+    def _calibrate_scrypt(self, target_ms, max_memory_mb, samples):
+        hasher = TunedScryptPasswordHasher()
+        hasher.block_size, hasher.parallelism = 8, 1
+        # scrypt needs 128 * n * r bytes; double n while it fits and stays under target
+        hasher.work_factor = 2 ** 10
+        hasher.maxmem = 2 * max_memory_mb * 1024 * 1024
+        elapsed = _median_ms(hasher, samples)
+        while elapsed < target_ms and 128 * hasher.work_factor * 2 * hasher.block_size <= max_memory_mb * 1024 * 1024:
+            hasher.work_factor *= 2
+            elapsed = _median_ms(hasher, samples)
+        return {
+            "work_factor": hasher.work_factor,
+            "block_size": hasher.block_size,
+            "parallelism": hasher.parallelism,
+        }, elapsed
+
+    def _calibrate_argon2(self, target_ms, max_memory_mb, samples):
+        hasher = TunedArgon2PasswordHasher()
+        try:
+            hasher._load_library()
+        except ValueError as e:
+            raise CommandError(str(e))
+        # memory is the main defence, so pin it at the cap and raise passes to reach the target
+        hasher.memory_cost, hasher.parallelism, hasher.time_cost = max_memory_mb * 1024, 1, 1
+        elapsed = _median_ms(hasher, samples)
+        while elapsed < target_ms:
+            hasher.time_cost += 1
+            elapsed = _median_ms(hasher, samples)
+        return {
+            "time_cost": hasher.time_cost,
+            "memory_cost": hasher.memory_cost,
+            "parallelism": hasher.parallelism,
+        }, elapsed
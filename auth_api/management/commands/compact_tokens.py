@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes expired OutstandingToken rows (and their BlacklistedToken rows) in batches. "
+        "Meant to run periodically, e.g. from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--sleep", type=float, default=0.0,
+                            help="Seconds to pause between batches to spare the primary")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        cutoff = aware_utcnow()
+        expired = OutstandingToken.objects.filter(expires_at__lte=cutoff).order_by("id")
+
+        total = 0
+        while True:
+            ids = list(expired.values_list("id", flat=True)[:batch_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                deleted, _ = OutstandingToken.objects.filter(id__in=ids).delete()
+            total += len(ids)
+            self.stdout.write(f"Deleted {len(ids)} expired tokens ({deleted} rows incl. blacklist)")
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(self.style.SUCCESS(f"Compacted {total} expired outstanding tokens"))
@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from auth_api.tokens import invalidate_user_state
+
+
+# ------------------------------------------------
+# 🔹 Drop the cached token state whenever the user row changes
+# ------------------------------------------------
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def drop_user_state(sender, instance, **kwargs):
+    invalidate_user_state(instance.pk)
@@ -1,3 +1,147 @@
-from django.test import TestCase
+import time
 
-# Create your tests here.
+from django.contrib.auth.hashers import make_password
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from auth_api import blacklist
+from users.models import User
+
+PASSWORD = "Passw0rd!"
+
+
+def make_user(username="bob", **fields):
+    user = User(username=username, email=f"{username}@gmail.com", city="Cairo", country="Egypt", postal_code="11511", **fields)
+    user.set_password(PASSWORD)
+    user.save()
+    return user
+
+
+# ------------------------------------------------
+# 🔹 JWT login / refresh / logout
+# ------------------------------------------------
+class JWTFlowTests(TestCase):
+    def setUp(self):
+        blacklist._local.clear()
+        caches["default"].clear()
+        self.user = make_user()
+        self.client = APIClient()
+
+    def login(self):
+        response = self.client.post("/auth/login/", {"username": "bob", "password": PASSWORD}, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.data
+
+    def test_access_token_authenticates_until_tokens_revoked(self):
+        tokens = self.login()
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + tokens["access"])
+        self.assertEqual(self.client.get("/users/profile").status_code, 200)
+
+        self.user.revoke_tokens()
+        self.assertEqual(self.client.get("/users/profile").status_code, 401)
+
+    def test_deactivated_user_is_rejected(self):
+        tokens = self.login()
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + tokens["access"])
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get("/users/profile").status_code, 401)
+
+    def test_demoted_admin_tokens_are_rejected(self):
+        self.user.is_staff = True
+        self.user.save()
+        tokens = self.login()
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + tokens["access"])
+        self.assertEqual(self.client.get("/users/profile").status_code, 200)
+
+        self.user.is_staff = False
+        self.user.save()
+        self.assertEqual(self.client.get("/users/profile").status_code, 401)
+        self.client.credentials()
+        self.assertEqual(self.client.post("/auth/refresh/", {"refresh": tokens["refresh"]}, format="json").status_code, 401)
+
+    def test_password_change_revokes_tokens(self):
+        tokens = self.login()
+        self.user.set_password("N3w-Passw0rd!")
+        self.user.save(update_fields=["password"])
+        self.assertEqual(self.client.post("/auth/refresh/", {"refresh": tokens["refresh"]}, format="json").status_code, 401)
+
+    def test_unrelated_change_keeps_tokens(self):
+        tokens = self.login()
+        self.user.city = "Giza"
+        self.user.save()
+        self.assertEqual(self.client.post("/auth/refresh/", {"refresh": tokens["refresh"]}, format="json").status_code, 200)
+
+    def test_logout_blacklists_refresh_token(self):
+        refresh = self.login()["refresh"]
+        self.assertEqual(self.client.post("/auth/refresh/", {"refresh": refresh}, format="json").status_code, 200)
+        self.assertEqual(self.client.post("/auth/logout/", {"refresh": refresh}, format="json").status_code, 200)
+        self.assertEqual(self.client.post("/auth/refresh/", {"refresh": refresh}, format="json").status_code, 401)
+
+        blacklist._local.clear()
+        self.assertEqual(self.client.post("/auth/refresh/", {"refresh": refresh}, format="json").status_code, 401)
+
+    def test_wrong_password(self):
+        response = self.client.post("/auth/login/", {"username": "bob", "password": "nope"}, format="json")
+        self.assertEqual(response.status_code, 401)
+
+
+# ------------------------------------------------
+# 🔹 Blacklist cache tiers
+# ------------------------------------------------
+class BlacklistCacheTests(TestCase):
+    def setUp(self):
+        blacklist._local.clear()
+        caches["default"].clear()
+        self.user = make_user()
+
+    def _outstanding(self, jti):
+        return OutstandingToken.objects.create(user=self.user, jti=jti, token="t", expires_at="2099-01-01T00:00:00Z")
+
+    def _exp(self):
+        return time.time() + 3600
+
+    @override_settings(AUTH_BLACKLIST_LOCAL_GOOD_TTL=0)
+    def test_logout_on_another_worker_seen_with_per_process_cache(self):
+        token = self._outstanding("jti-1")
+        self.assertFalse(blacklist.is_blacklisted("jti-1", self._exp()))
+
+        # another worker blacklists it: neither this process's LRU nor its LocMem cache hear about it
+        BlacklistedToken.objects.create(token=token)
+        self.assertTrue(blacklist.is_blacklisted("jti-1", self._exp()))
+
+    def test_good_status_kept_briefly_in_per_process_cache(self):
+        self._outstanding("jti-2")
+        self.assertFalse(blacklist.is_blacklisted("jti-2", self._exp()))
+        shared = caches["default"]
+        key = shared.make_key(blacklist.SHARED_CACHE_PREFIX + "jti-2")
+        self.assertLessEqual(shared._expire_info[key] - time.time(), 30 + 1)
+
+    def test_blacklisted_status_cached(self):
+        token = self._outstanding("jti-3")
+        BlacklistedToken.objects.create(token=token)
+        self.assertTrue(blacklist.is_blacklisted("jti-3", self._exp()))
+        BlacklistedToken.objects.all().delete()
+        self.assertTrue(blacklist.is_blacklisted("jti-3", self._exp()))
+
+
+# ------------------------------------------------
+# 🔹 Hasher upgrade on login
+# ------------------------------------------------
+@override_settings(PASSWORD_HASHERS=[
+    "auth_api.hashers.TunedScryptPasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+])
+class HasherUpgradeTests(TestCase):
+    def test_legacy_hash_upgraded_on_login(self):
+        user = make_user()
+        user.password = make_password(PASSWORD, hasher="pbkdf2_sha256")
+        user.save()
+
+        response = APIClient().post("/auth/login/", {"username": "bob", "password": PASSWORD}, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("scrypt$"))
+        self.assertTrue(user.check_password(PASSWORD))
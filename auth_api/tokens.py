@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from auth_api import blacklist
+
+# claims copied from the user row into every token (id travels as USER_ID_CLAIM)
+USER_CLAIMS = ("username", "is_active", "is_staff", "is_superuser")
+VERSION_CLAIM = "ver"
+
+STATE_CACHE_PREFIX = "auth:user-state:"
+
+
+# ------------------------------------------------
+# 🔹 Refresh token carrying the user claim set
+# ------------------------------------------------
+class ClaimsRefreshToken(RefreshToken):
+    """
+    Refresh token that embeds a compact user claim set.
+    The access tokens derived from it (on login and on /auth/refresh/)
+    copy the same claims, so the API can authenticate without a user fetch.
+    Blacklist checks go through the JTI cache in auth_api.blacklist.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        token[VERSION_CLAIM] = user.token_version
+        return token
+
+    def check_blacklist(self):
+        if blacklist.is_blacklisted(self.payload[api_settings.JTI_CLAIM], self.payload["exp"]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        result = super().blacklist()
+        blacklist.mark_blacklisted(self.payload[api_settings.JTI_CLAIM], self.payload["exp"])
+        return result
+
+
+# ------------------------------------------------
+# 🔹 Cached (token_version, is_active) per user
+# ------------------------------------------------
+def _state_key(user_id):
+    return f"{STATE_CACHE_PREFIX}{user_id}"
+
+
+def get_user_state(user_id):
+    """
+    Returns (token_version, is_active) for the user, or None if the user is gone.
+    One indexed values_list() on a cache miss, nothing on a hit.
+    """
+    key = _state_key(user_id)
+    state = cache.get(key)
+    if state is None:
+        User = get_user_model()
+        state = (
+            User.objects.filter(**{api_settings.USER_ID_FIELD: user_id})
+            .values_list("token_version", "is_active")
+            .first()
+        )
+        if state is None:
+            return None
+        cache.set(key, tuple(state), getattr(settings, "AUTH_USER_STATE_TTL", 60))
+    return tuple(state)
+
+
+def invalidate_user_state(user_id):
+    cache.delete(_state_key(user_id))
@@ -2,8 +2,11 @@ from rest_framework import serializers, generics, status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from django.contrib.auth import authenticate
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.views import TokenRefreshView
+from auth_api.tokens import VERSION_CLAIM, ClaimsRefreshToken, get_user_state
 from core.status import *
 
 # -------------------------------
@@ -22,6 +25,42 @@ class JWTLogoutSerializer(serializers.Serializer):
         return attrs
 
 
+class JWTRefreshSerializer(TokenRefreshSerializer):
+    """
+    Same contract as simplejwt's refresh serializer, but the blacklist check
+    goes through the JTI cache and the active-user and `ver` checks through
+    the cached user state, so a refresh burst does not hit the token/user tables.
+    """
+    token_class = ClaimsRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        if user_id:
+            state = get_user_state(user_id)
+            if state is None or not state[1]:
+                raise AuthenticationFailed(
+                    self.error_messages["no_active_account"], "no_active_account"
+                )
+            # role flags or credentials changed since login: the claims it would copy are stale
+            if VERSION_CLAIM in refresh.payload and refresh.payload[VERSION_CLAIM] != state[0]:
+                raise AuthenticationFailed("Token has been revoked", "token_revoked")
+
+        data = {"access": str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data["refresh"] = str(refresh)
+
+        return data
+
+
 # -------------------------------
 # 🔹 Login View
 # -------------------------------
@@ -42,7 +81,7 @@ class JWTLoginView(generics.GenericAPIView):
         if not user.is_active:
             return Response({"error": "Account is not active"}, status=403)
 
-        refresh = RefreshToken.for_user(user)
+        refresh = ClaimsRefreshToken.for_user(user)
         return Response(
             {
                 "access": str(refresh.access_token),
@@ -53,6 +92,7 @@ class JWTLoginView(generics.GenericAPIView):
         )
 
 class JWTRefreshView(TokenRefreshView):
+    serializer_class = JWTRefreshSerializer
     permission_classes = [AllowAny]
 # -------------------------------
 # 🔹 Logout View
@@ -67,7 +107,7 @@ class JWTLogoutView(generics.GenericAPIView):
         serializer.is_valid(raise_exception=True)
 
         try:
-            token = RefreshToken(serializer.token)
+            token = ClaimsRefreshToken(serializer.token)
             token.blacklist()
             return Response({"message": "Logged out successfully"}, status=S200)
         except Exception:
@@ -0,0 +1,240 @@
+"""
+API load test: register, login, refresh, logout and profile over HTTP.
+
+Seeds `--users` users, each with phone numbers and a profile, sharing one
+password hashed with the configured hasher, so login pays the real verify
+cost. It also mints the refresh/access tokens the refresh, logout and
+profile scenarios need. Then it drives a running server with an asyncio
+httpx client at `--concurrency` in-flight requests.
+
+The report is JSON: p50/p95/p99/max latency, throughput and status
+counts per endpoint, tagged with the git commit. `--compare` adds the
+change against an earlier report.
+
+Run it against the local PostgreSQL (OERP_DB_*) with a server on the same
+settings, e.g.:
+
+    gunicorn business_core.wsgi -w 4 -b 127.0.0.1:8000
+    python -m benchmarks.api_load --users 2000 --requests 2000 --concurrency 50 --output load.json
+    python -m benchmarks.api_load --requests 2000 --concurrency 50 --compare load.json
+
+The driver is one asyncio process; check it is not the CPU bottleneck
+before trusting high throughput numbers. `--cleanup` deletes every
+loadtest_* user.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+import uuid
+from collections import Counter
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "business_core.settings")
+django.setup()
+
+import httpx  # noqa: E402
+from django.contrib.auth.hashers import make_password  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from auth_api.tokens import ClaimsRefreshToken  # noqa: E402
+from users.models import PhoneNumber, Profile, User  # noqa: E402
+
+PREFIX = "loadtest_"
+PASSWORD = "Load#Test2025"
+SCENARIOS = ("register", "login", "refresh", "profile", "logout")
+
+
+# ------------------------------------------------
+# 🔹 Fixtures
+# ------------------------------------------------
+def seed(count, batch=1000):
+    """Creates loadtest_0..count-1 (skipping existing ones) with 1-3 phone numbers and a profile."""
+    existing = set(User.objects.filter(username__startswith=PREFIX).values_list("username", flat=True))
+    encoded = make_password(PASSWORD)
+    created = 0
+    for start in range(0, count, batch):
+        users = [
+            User(username=f"{PREFIX}{i}", email=f"{PREFIX}{i}@gmail.com", password=encoded,
+                 country="Egypt", city="Cairo", postal_code=f"{11511 + i % 500}", address=f"{i} Nile Street")
+            for i in range(start, min(start + batch, count)) if f"{PREFIX}{i}" not in existing
+        ]
+        if not users:
+            continue
+        User.objects.bulk_create(users)
+        PhoneNumber.objects.bulk_create([
+            PhoneNumber(user=user, country_code="+20", number=f"10{i:08d}{n}",
+                        type=("primary", "whatsapp", "telegram")[n])
+            for i, user in enumerate(users, start) for n in range(1 + i % 3)
+        ])
+        Profile.objects.bulk_create([
+            Profile(user=user, full_name=f"Load Test {i}", job_title="Tester", bio="Seeded for benchmarks.api_load")
+            for i, user in enumerate(users, start)
+        ])
+        created += len(users)
+    return created
+
+
+def mint_tokens(count, users):
+    """`count` fresh (refresh, access) pairs spread over the seeded users."""
+    users = list(User.objects.filter(username__regex=rf"^{PREFIX}\d+$").order_by("username")[:users])
+    tokens = []
+    for i in range(count):
+        refresh = ClaimsRefreshToken.for_user(users[i % len(users)])
+        tokens.append((str(refresh), str(refresh.access_token)))
+    return tokens
+
+
+def cleanup():
+    return User.objects.filter(username__startswith=PREFIX).delete()[0]
+
+
+# ------------------------------------------------
+# 🔹 Scenarios: i -> (method, path, json body, headers)
+# ------------------------------------------------
+def build_scenarios(users, requests):
+    run = uuid.uuid4().hex[:8]
+    tokens = mint_tokens(requests, users)
+    logout_tokens = mint_tokens(requests, users)
+    return {
+        "register": lambda i: ("POST", "/users/register", {
+            "username": f"{PREFIX}r{run}_{i}", "email": f"{PREFIX}r{run}_{i}@gmail.com",
+            "password": PASSWORD, "password2": PASSWORD,
+            "country": "Egypt", "city": "Cairo", "postal_code": "11511",
+        }, None),
+        "login": lambda i: ("POST", "/auth/login/", {"username": f"{PREFIX}{i % users}", "password": PASSWORD}, None),
+        "refresh": lambda i: ("POST", "/auth/refresh/", {"refresh": tokens[i % len(tokens)][0]}, None),
+        "profile": lambda i: ("GET", "/users/profile", None,
+                              {"Authorization": f"Bearer {tokens[i % len(tokens)][1]}"}),
+        "logout": lambda i: ("POST", "/auth/logout/", {"refresh": logout_tokens[i % len(logout_tokens)][0]}, None),
+    }
+
+
+# ------------------------------------------------
+# 🔹 Driver
+# ------------------------------------------------
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))]
+
+
+async def drive(client, build, requests, concurrency, offset=0):
+    latencies, statuses = [], Counter()
+    counter = itertools.count()
+
+    async def worker():
+        while (n := next(counter)) < requests:
+            method, path, body, headers = build(offset + n)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body, headers=headers)
+                statuses[str(response.status_code)] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, statuses, time.perf_counter() - started
+
+
+def summarize(latencies, statuses, elapsed):
+    values = sorted(latencies)
+    ok = sum(count for status, count in statuses.items() if status.startswith("2"))
+    return {
+        "requests": len(values),
+        "ok": ok,
+        "statuses": dict(sorted(statuses.items())),
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(values) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(percentile(values, 0.50), 2) if values else None,
+        "p95_ms": round(percentile(values, 0.95), 2) if values else None,
+        "p99_ms": round(percentile(values, 0.99), 2) if values else None,
+        "max_ms": round(values[-1], 2) if values else None,
+    }
+
+
+async def run(base_url, builds, scenarios, requests, concurrency, warmup):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    results = {}
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        for name in scenarios:
+            if warmup:
+                await drive(client, builds[name], warmup, min(concurrency, warmup))
+            results[name] = summarize(*await drive(client, builds[name], requests, concurrency, offset=warmup))
+    return results
+
+
+def compare(results, baseline):
+    """Relative change per scenario: negative latency / positive throughput is better."""
+    changes = {}
+    for name, current in results.items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        changes[name] = {
+            key: f"{(current[key] - before[key]) / before[key]:+.1%}"
+            for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+            if current.get(key) is not None and before.get(key)
+        }
+    return {"baseline_commit": baseline.get("commit"), "changes": changes}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--users", type=int, default=1000, help="Seeded users (created once, then reused)")
+    parser.add_argument("--requests", type=int, default=1000, help="Timed requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=50, help="Untimed requests per scenario first")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--output", default=None, help="Also write the report to this file")
+    parser.add_argument("--compare", default=None, help="Earlier report to diff against")
+    parser.add_argument("--cleanup", action="store_true", help="Delete the loadtest_* users and exit")
+    args = parser.parse_args()
+
+    if args.cleanup:
+        print(json.dumps({"deleted": cleanup()}))
+        return
+    if connection.vendor != "postgresql":
+        print("warning: not running on PostgreSQL; numbers will not match production", file=sys.stderr)
+
+    seeded = seed(args.users)
+    # ORM work happens here, before the event loop starts
+    builds = build_scenarios(args.users, args.requests + args.warmup)
+    results = asyncio.run(run(args.base_url, builds, args.scenarios, args.requests, args.concurrency, args.warmup))
+    report = {
+        "commit": git_commit(),
+        "base_url": args.base_url,
+        "users": args.users,
+        "seeded_now": seeded,
+        "concurrency": args.concurrency,
+        "scenarios": results,
+    }
+    if args.compare:
+        with open(args.compare) as f:
+            report["compare"] = compare(results, json.load(f))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Catalog search latency: SKU lookup, full-text, trigram and prefix autocomplete.
+
+Seeds `--products` rows into the product table on the configured PostgreSQL
+database (OERP_DB_* settings) with COPY, fills search_vector, then times each
+query path and reports p50/p95 in milliseconds.
+
+    python -m benchmarks.catalog_search --products 1000000 --queries 500
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "business_core.settings")
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from core.ids import uuid7  # noqa: E402
+from inventory.models import Product, refresh_search_vectors  # noqa: E402
+from inventory.search import CatalogTrie, search_products  # noqa: E402
+
+ADJECTIVES = ["compact", "wireless", "heavy", "duty", "smart", "portable", "steel", "organic", "mini", "pro"]
+NOUNS = ["laptop", "lamp", "drill", "kettle", "router", "blender", "chair", "monitor", "speaker", "bottle"]
+SKU_PREFIX = "BENCH-"
+
+
+def _name(rng):
+    return f"{rng.choice(ADJECTIVES)} {rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {rng.randint(1, 999)}"
+
+
+def seed(products, batch, rng):
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        cursor.execute("DELETE FROM product WHERE sku LIKE %s", [SKU_PREFIX + "%"])
+        raw = cursor.cursor  # psycopg cursor, for COPY
+        columns = "id, created_at, updated_at, sku, barcode, name, description, is_active"
+        start = time.perf_counter()
+        for offset in range(0, products, batch):
+            now = timezone.now()
+            with raw.copy(f"COPY product ({columns}) FROM STDIN") as copy:
+                for i in range(offset, min(offset + batch, products)):
+                    copy.write_row((uuid7(), now, now, f"{SKU_PREFIX}{i:08d}", f"{i:013d}",
+                                    _name(rng), "", True))
+        copy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    refresh_search_vectors(Product.objects.filter(sku__startswith=SKU_PREFIX))
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE product")
+    return {"copy_seconds": round(copy_seconds, 2), "vector_seconds": round(time.perf_counter() - start, 2)}
+
+
+def _timed(fn, inputs):
+    samples = []
+    for value in inputs:
+        start = time.perf_counter()
+        fn(value)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 3),
+    }
+
+
+def main(products, queries, batch, keep):
+    if connection.vendor != "postgresql":
+        raise SystemExit("This benchmark needs the PostgreSQL database from OERP_DB_*.")
+    rng = random.Random(42)
+    result = {"products": products, "queries": queries, "seed": seed(products, batch, rng)}
+
+    skus = [f"{SKU_PREFIX}{rng.randrange(products):08d}" for _ in range(queries)]
+    words = [f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}" for _ in range(queries)]
+    typos = [rng.choice(NOUNS)[:-1] + "x" for _ in range(queries)]
+    prefixes = [rng.choice(NOUNS)[:rng.randint(2, 4)] for _ in range(queries)]
+
+    result["sku"] = _timed(lambda q: search_products(q, limit=20), skus)
+    result["full_text"] = _timed(lambda q: search_products(q, limit=20), words)
+    result["trigram"] = _timed(lambda q: search_products(q, limit=20), typos)
+
+    trie = CatalogTrie()
+    start = time.perf_counter()
+    trie.rebuild()
+    result["trie_build_seconds"] = round(time.perf_counter() - start, 2)
+    result["trie_terms"] = len(trie._postings)
+    result["autocomplete"] = _timed(lambda q: trie.complete(q, limit=10), prefixes)
+
+    if not keep:
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM product WHERE sku LIKE %s", [SKU_PREFIX + "%"])
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=50_000)
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded products for inspection")
+    args = parser.parse_args()
+    print(json.dumps(main(args.products, args.queries, args.batch, args.keep), indent=2))
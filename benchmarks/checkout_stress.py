@@ -0,0 +1,156 @@
+"""
+Concurrency stress test for operations.services.checkout.
+
+Seeds a few hot products across several locations on the configured PostgreSQL
+database (OERP_DB_* settings), then runs `--checkouts` multi-line orders from
+`--workers` threads. Lines are shuffled per order so lock ordering is exercised,
+and `--duplicate-rate` of requests replay an earlier idempotency key.
+Afterwards it checks the invariants and prints a JSON report:
+
+  * reserved on every balance row equals the sum of its order lines,
+  * 0 <= reserved <= on_hand,
+  * one order per idempotency key.
+
+    python -m benchmarks.checkout_stress --workers 32 --checkouts 2000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "business_core.settings")
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.db.models import Count, Sum  # noqa: E402
+
+from inventory.models import Location, Product, StockBalance  # noqa: E402
+from inventory.services import InsufficientStock, record_movement  # noqa: E402
+from operations.models import SalesOrder, SalesOrderLine  # noqa: E402
+from operations.services import checkout  # noqa: E402
+
+PREFIX = "STRESS-"
+
+
+def cleanup():
+    orders = SalesOrder.objects.filter(idempotency_key__startswith=PREFIX)
+    SalesOrderLine.objects.filter(order__in=orders).delete()
+    orders.delete()
+    with connection.cursor() as cursor:
+        # ledger rows are append-only at the model level; remove the seeded ones directly
+        cursor.execute(
+            "DELETE FROM stock_movement WHERE product_id IN (SELECT id FROM product WHERE sku LIKE %s)",
+            [PREFIX + "%"],
+        )
+    StockBalance.objects.filter(product__sku__startswith=PREFIX).delete()
+    Product.objects.filter(sku__startswith=PREFIX).delete()
+    Location.objects.filter(code__startswith=PREFIX).delete()
+
+
+def seed(products, locations, stock):
+    cleanup()
+    product_ids = [Product.objects.create(sku=f"{PREFIX}{i}", name=f"Stress {i}").pk for i in range(products)]
+    location_ids = [Location.objects.create(code=f"{PREFIX}{i}", name=f"Stress {i}").pk for i in range(locations)]
+    for product_id in product_ids:
+        for location_id in location_ids:
+            record_movement(product_id, location_id, stock, "receipt")
+    return product_ids
+
+
+def check_invariants(product_ids):
+    problems = []
+    lines = {
+        (row["product_id"], row["location_id"], row["condition"]): row["total"]
+        for row in SalesOrderLine.objects.filter(order__idempotency_key__startswith=PREFIX, order__status="reserved")
+        .values("product_id", "location_id", "condition").annotate(total=Sum("quantity"))
+    }
+    for balance in StockBalance.objects.filter(product_id__in=product_ids):
+        expected = lines.get((balance.product_id, balance.location_id, balance.condition), 0)
+        if balance.reserved != expected:
+            problems.append(f"{balance}: reserved {balance.reserved} != lines {expected}")
+        if not 0 <= balance.reserved <= balance.on_hand:
+            problems.append(f"{balance}: reserved outside 0..on_hand")
+    duplicates = (SalesOrder.objects.filter(idempotency_key__startswith=PREFIX)
+                  .values("idempotency_key").annotate(n=Count("id")).filter(n__gt=1).count())
+    if duplicates:
+        problems.append(f"{duplicates} idempotency keys with more than one order")
+    return problems
+
+
+def main(workers, checkouts, products, locations, stock, max_lines, duplicate_rate, keep):
+    if connection.vendor != "postgresql":
+        raise SystemExit("This benchmark needs the PostgreSQL database from OERP_DB_*.")
+    product_ids = seed(products, locations, stock)
+    rng = random.Random(7)
+
+    requests = []
+    for i in range(checkouts):
+        if requests and rng.random() < duplicate_rate:
+            requests.append(rng.choice(requests))
+            continue
+        chosen = rng.sample(product_ids, rng.randint(1, min(max_lines, len(product_ids))))
+        lines = [{"product_id": p, "quantity": rng.randint(1, 3)} for p in chosen]
+        requests.append((f"{PREFIX}{i}", lines))
+
+    outcomes = Counter()
+    latencies = []
+    lock = threading.Lock()
+
+    def run(request):
+        key, lines = request
+        started = time.perf_counter()
+        try:
+            _, created = checkout(lines, key)
+            outcome = "created" if created else "replayed"
+        except InsufficientStock:
+            outcome = "insufficient_stock"
+        except Exception as e:
+            outcome = type(e).__name__
+        with lock:
+            outcomes[outcome] += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(run, requests))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    report = {
+        "workers": workers,
+        "checkouts": checkouts,
+        "seconds": round(elapsed, 2),
+        "checkouts_per_sec": round(checkouts / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+        "outcomes": dict(outcomes),
+        "invariant_violations": check_invariants(product_ids),
+    }
+    if not keep:
+        cleanup()
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--checkouts", type=int, default=2000)
+    parser.add_argument("--products", type=int, default=5, help="Few products = heavy contention")
+    parser.add_argument("--locations", type=int, default=3)
+    parser.add_argument("--stock", type=int, default=500, help="Initial on_hand per product and location")
+    parser.add_argument("--max-lines", type=int, default=4)
+    parser.add_argument("--duplicate-rate", type=float, default=0.1)
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded rows for inspection")
+    args = parser.parse_args()
+    report = main(args.workers, args.checkouts, args.products, args.locations, args.stock,
+                  args.max_lines, args.duplicate_rate, args.keep)
+    print(json.dumps(report, indent=2))
+    if report["invariant_violations"]:
+        raise SystemExit(1)
@@ -0,0 +1,97 @@
+"""
+Response rendering: DRF's JSONRenderer vs core.renderers.ORJSONRenderer.
+
+Builds in-memory users with phone numbers (no database needed), serializes
+them with users.serializers.UserSerializer, then times rendering the same
+payload with each renderer for several list sizes. Also times a payload of
+raw model values (UUID, datetime, Decimal), as .values() rows would be.
+
+    python -m benchmarks.json_render --sizes 1 50 1000 --repeat 200
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+from decimal import Decimal
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "business_core.settings")
+django.setup()
+
+from django.utils import timezone  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from core.renderers import ORJSONRenderer  # noqa: E402
+from users.models import PhoneNumber, User  # noqa: E402
+from users.serializers import UserSerializer  # noqa: E402
+
+RENDERERS = {"drf_json": JSONRenderer(), "orjson": ORJSONRenderer()}
+
+
+def make_users(count, rng):
+    users = []
+    for i in range(count):
+        user = User(username=f"user{i}", email=f"user{i}@gmail.com", country="Egypt", city="Cairo",
+                    postal_code=f"{rng.randint(10000, 99999)}", address=f"{i} Nile Street", is_active=True)
+        phones = [
+            PhoneNumber(user=user, country_code="+20", number=f"10{rng.randint(10_000_000, 99_999_999)}",
+                        type=rng.choice(["primary", "whatsapp", "telegram"]))
+            for _ in range(rng.randint(1, 3))
+        ]
+        # what prefetch_related('phone_numbers') leaves behind, so no query runs
+        prefetched = PhoneNumber.objects.none()
+        prefetched._result_cache, prefetched._prefetch_done = phones, True
+        user._prefetched_objects_cache = {"phone_numbers": prefetched}
+        users.append(user)
+    return users
+
+
+def raw_rows(count, rng):
+    now = timezone.now()
+    return [
+        {"id": User().id, "username": f"user{i}", "created_at": now, "updated_at": now,
+         "balance": Decimal(rng.randint(0, 10_000_000)) / 100, "is_active": True}
+        for i in range(count)
+    ]
+
+
+def _median_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(samples), 4)
+
+
+def main(sizes, repeat):
+    rng = random.Random(18)
+    results = []
+    for size in sizes:
+        users = make_users(size, rng)
+        payload = UserSerializer(users, many=True).data
+        rows = raw_rows(size, rng)
+        assert json.loads(RENDERERS["drf_json"].render(payload)) == json.loads(RENDERERS["orjson"].render(payload))
+
+        entry = {
+            "users": size,
+            "serializer_ms": _median_ms(lambda: UserSerializer(users, many=True).data, max(1, repeat // 10)),
+        }
+        for name, renderer in RENDERERS.items():
+            entry[f"{name}_ms"] = _median_ms(lambda: renderer.render(payload), repeat)
+            entry[f"{name}_raw_values_ms"] = _median_ms(lambda: renderer.render(rows), repeat)
+            entry[f"{name}_bytes"] = len(renderer.render(payload))
+        entry["speedup"] = round(entry["drf_json_ms"] / entry["orjson_ms"], 1)
+        results.append(entry)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 50, 1000])
+    parser.add_argument("--repeat", type=int, default=200, help="Median of N renders")
+    args = parser.parse_args()
+    print(json.dumps(main(args.sizes, args.repeat), indent=2))
@@ -0,0 +1,82 @@
+"""
+Login throughput benchmark for password hashing.
+
+Simulates a burst of logins (verify + transparent rehash check) for every
+configured hasher, run two ways: serially and one thread per login. Logins
+hash on the request thread (there is no separate hash pool, see
+auth_api/hashers.py), so `--concurrency` should match the server's total
+worker threads; use the results to pick that count and the hasher cost.
+
+    python -m benchmarks.login_throughput --logins 200 --concurrency 50
+"""
+import argparse
+import json
+import os
+import threading
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "business_core.settings")
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.hashers import verify_password  # noqa: E402
+from django.utils.module_loading import import_string  # noqa: E402
+
+PASSWORD = "Bench#Passw0rd"
+
+
+def _serial(encoded, logins):
+    for _ in range(logins):
+        verify_password(PASSWORD, encoded)
+
+
+def _threads(encoded, logins, concurrency, verify):
+    def worker(n):
+        for _ in range(n):
+            verify(PASSWORD, encoded)
+
+    per_thread = [logins // concurrency + (1 if i < logins % concurrency else 0) for i in range(concurrency)]
+    threads = [threading.Thread(target=worker, args=(n,)) for n in per_thread if n]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def run(logins, concurrency):
+    results = []
+    for path in settings.PASSWORD_HASHERS:
+        hasher = import_string(path)()
+        try:
+            encoded = hasher.encode(PASSWORD, hasher.salt())
+        except ValueError as e:  # library missing (argon2-cffi)
+            results.append({"hasher": hasher.algorithm, "skipped": str(e)})
+            continue
+
+        modes = {
+            "serial": lambda: _serial(encoded, logins),
+            "thread_per_login": lambda: _threads(encoded, logins, concurrency, verify_password),
+        }
+        for mode, fn in modes.items():
+            start = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - start
+            results.append({
+                "hasher": hasher.algorithm,
+                "mode": mode,
+                "logins": logins,
+                "concurrency": 1 if mode == "serial" else concurrency,
+                "seconds": round(elapsed, 4),
+                "logins_per_sec": round(logins / elapsed, 2),
+            })
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+    print(json.dumps(run(args.logins, args.concurrency), indent=2))
@@ -0,0 +1,106 @@
+"""
+Deep-page latency: keyset pagination (core.pagination) vs OFFSET.
+
+Seeds `--rows` outbox events (a plain Base table) on the configured PostgreSQL
+database (OERP_DB_* settings) with COPY, then times fetching page N of
+`--page-size` rows, newest first, both ways.
+
+    python -m benchmarks.pagination --rows 1000000 --pages 1 10 100 1000
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+from datetime import timedelta
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "business_core.settings")
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from rest_framework.request import Request  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from core.ids import uuid7  # noqa: E402
+from core.models import OutboxEvent  # noqa: E402
+from core.pagination import KeysetPagination  # noqa: E402
+
+TOPIC = "bench.pagination"
+
+
+def seed(rows, batch):
+    OutboxEvent.objects.filter(topic=TOPIC).delete()
+    start = timezone.now() - timedelta(seconds=rows)
+    raw = connection.cursor().cursor  # psycopg cursor, for COPY
+    columns = "id, created_at, updated_at, topic, payload, status, attempts, available_at, last_error"
+    for offset in range(0, rows, batch):
+        with raw.copy(f"COPY outbox_event ({columns}) FROM STDIN") as copy:
+            for i in range(offset, min(offset + batch, rows)):
+                # a few equal timestamps so the id tie-break is exercised
+                at = start + timedelta(seconds=i // 3)
+                copy.write_row((uuid7(), at, at, TOPIC, "{}", "done", 0, at, ""))
+    raw.execute("ANALYZE outbox_event")
+
+
+def _median_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def main(rows, pages, page_size, repeat, batch, keep):
+    if connection.vendor != "postgresql":
+        raise SystemExit("This benchmark needs the PostgreSQL database from OERP_DB_*.")
+    seed(rows, batch)
+    queryset = OutboxEvent.objects.filter(topic=TOPIC)
+    paginator = KeysetPagination()
+    factory = APIRequestFactory()
+    results = []
+
+    for page in pages:
+        offset = (page - 1) * page_size
+        if offset >= rows:
+            break
+
+        def by_offset():
+            return list(queryset.order_by("-created_at", "-id")[offset:offset + page_size])
+
+        if offset:
+            # the cursor a client would hold after reading page - 1
+            last = queryset.order_by("-created_at", "-id")[offset - 1]
+            params = {"page_size": page_size, "cursor": paginator.encode_cursor("next", last)}
+        else:
+            params = {"page_size": page_size}
+        request = Request(factory.get("/", params))
+
+        def by_keyset():
+            return paginator.paginate_queryset(queryset, request)
+
+        assert [r.pk for r in by_keyset()] == [r.pk for r in by_offset()]
+        results.append({
+            "page": page,
+            "offset_ms": _median_ms(by_offset, repeat),
+            "keyset_ms": _median_ms(by_keyset, repeat),
+        })
+
+    if not keep:
+        OutboxEvent.objects.filter(topic=TOPIC).delete()
+    return {"rows": rows, "page_size": page_size, "pages": results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 100, 1000, 10000])
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20, help="Median of N runs per page")
+    parser.add_argument("--batch", type=int, default=100_000)
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded rows for inspection")
+    args = parser.parse_args()
+    print(json.dumps(main(args.rows, args.pages, args.page_size, args.repeat, args.batch, args.keep), indent=2))
@@ -0,0 +1,115 @@
+"""
+PDF text extraction throughput: documents/extraction.py on a process pool.
+
+Writes synthetic invoice PDFs (a text layer per page, built by hand so no PDF
+writer is needed) or uses the PDFs given with --paths, then extracts them
+with 1..N workers. Reports docs/s, pages/s and pages/s per worker process.
+Needs pypdf. The database is not touched.
+
+    python -m benchmarks.pdf_extraction --docs 200 --pages 5 --workers 1 2 4
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import wait
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "business_core.settings")
+django.setup()
+
+from core.processes import django_process_pool  # noqa: E402
+from documents.extraction import _extract  # noqa: E402
+
+VENDORS = ["Acme Supplies", "Nile Trading", "Delta Motors", "Cairo Office Co", "Giza Electric"]
+
+
+def make_pdf(pages):
+    """Minimal PDF, one Helvetica text block per page: pages = [[line, ...], ...]."""
+    objects = {1: b"<< /Type /Catalog /Pages 2 0 R >>",
+               3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"}
+    kids = []
+    for i, lines in enumerate(pages):
+        page_id, content_id = 4 + 2 * i, 5 + 2 * i
+        kids.append(f"{page_id} 0 R")
+        text = "".join(f"({line.replace('(', '[').replace(')', ']')}) Tj T* " for line in lines)
+        stream = f"BT /F1 11 Tf 14 TL 50 790 Td {text}ET".encode()
+        objects[page_id] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>").encode()
+        objects[content_id] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>".encode()
+
+    out, offsets = bytearray(b"%PDF-1.4\n"), {}
+    for number in sorted(objects):
+        offsets[number] = len(out)
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, objects[number])
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for number in sorted(objects):
+        out += b"%010d 00000 n \n" % offsets[number]
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def invoice_pages(rng, number, pages):
+    vendor = rng.choice(VENDORS)
+    result = []
+    for page in range(1, pages + 1):
+        lines = [f"{vendor} - Invoice INV-2025-{number:05d} - page {page} of {pages}"]
+        lines += [f"Item {rng.randint(1000, 9999)}  qty {rng.randint(1, 20)}  EGP {rng.randint(100, 99999)}.{rng.randint(0, 99):02d}"
+                  for _ in range(40)]
+        result.append(lines)
+    return result
+
+
+def run(paths, workers):
+    with django_process_pool(workers) as pool:
+        # start the processes (spawn + django.setup) before timing
+        wait([pool.submit(_extract, None, paths[0]) for _ in range(workers)])
+        started = time.perf_counter()
+        futures = [pool.submit(_extract, i, path) for i, path in enumerate(paths)]
+        pages = errors = 0
+        for future in futures:
+            _, result, error = future.result()
+            if error:
+                errors += 1
+            else:
+                pages += len(result)
+        elapsed = time.perf_counter() - started
+    return {
+        "workers": workers, "docs": len(paths), "pages": pages, "errors": errors,
+        "seconds": round(elapsed, 3),
+        "docs_per_sec": round(len(paths) / elapsed, 1),
+        "pages_per_sec": round(pages / elapsed, 1),
+        "pages_per_sec_per_worker": round(pages / elapsed / workers, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--pages", type=int, default=5, help="Pages per synthetic document")
+    parser.add_argument("--paths", nargs="*", default=None, help="Real PDFs to use instead of synthetic ones")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 2])
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = args.paths
+        if not paths:
+            rng = random.Random(args.seed)
+            paths = []
+            for i in range(args.docs):
+                path = os.path.join(tmp, f"invoice-{i}.pdf")
+                with open(path, "wb") as f:
+                    f.write(make_pdf(invoice_pages(rng, i, args.pages)))
+                paths.append(path)
+        results = [run(paths, workers) for workers in args.workers]
+    print(json.dumps({"cpu_count": os.cpu_count(), "runs": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Cold-start cost of a worker, measured with `python -X importtime`.
+
+Imports business_core.wsgi, with and without the URLconf a worker loads on its
+first request, in a fresh interpreter. Reports the total import time, the
+modules with the highest self time and whether the heavy validation packages
+were loaded.
+Each run is tagged with the current git commit and can be appended to a JSONL
+file to track the numbers across commits.
+
+    python -m benchmarks.startup --runs 5 --append benchmarks/results/startup.jsonl
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("phonenumbers", "pycountry", "django_countries")
+
+TARGETS = {
+    "wsgi": "import business_core.wsgi",
+    "wsgi+urls": (
+        "import business_core.wsgi\n"
+        "from django.urls import get_resolver\n"
+        "get_resolver().url_patterns"
+    ),
+}
+
+
+def _parse_importtime(stderr):
+    """Returns {module: (self_us, cumulative_us, depth)} from -X importtime output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    return modules
+
+
+def measure(code, env):
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    modules = _parse_importtime(proc.stderr)
+    top_level = {name: cum for name, (_, cum, depth) in modules.items() if depth == 0}
+    return {
+        "wall_ms": wall_ms,
+        "import_ms": sum(top_level.values()) / 1000,
+        "top": sorted(((name, own) for name, (own, _, _) in modules.items()),
+                      key=lambda item: item[1], reverse=True)[:10],
+        "heavy_loaded": [m for m in HEAVY_MODULES if m in modules],
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(runs, preload):
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get("DJANGO_SETTINGS_MODULE", "business_core.settings"))
+    env["OERP_VALIDATION_PRELOAD"] = "true" if preload else "false"
+
+    results = []
+    for target, code in TARGETS.items():
+        samples = [measure(code, env) for _ in range(runs)]
+        results.append({
+            "commit": git_commit(),
+            "target": target,
+            "preload": preload,
+            "runs": runs,
+            "wall_ms_median": round(statistics.median(s["wall_ms"] for s in samples), 1),
+            "import_ms_median": round(statistics.median(s["import_ms"] for s in samples), 1),
+            "heavy_loaded": samples[-1]["heavy_loaded"],
+            "top_self_import_ms": [(name, round(us / 1000, 1)) for name, us in samples[-1]["top"]],
+        })
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--preload", action="store_true", help="Measure with OERP_VALIDATION_PRELOAD=true")
+    parser.add_argument("--append", help="Append one JSON line per target to this file")
+    args = parser.parse_args()
+
+    results = main(args.runs, args.preload)
+    if args.append:
+        Path(args.append).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.append, "a") as out:
+            for result in results:
+                out.write(json.dumps(result) + "\n")
+    print(json.dumps(results, indent=2))
@@ -0,0 +1,139 @@
+"""
+Trial balance over a large journal: snapshot + open period vs full aggregation.
+
+Fills the accounting tables on the configured PostgreSQL database (OERP_DB_*
+settings) with `--lines` journal lines spread over `--months` monthly periods
+using COPY, closes every period but the last (timed), then times
+accounting.services.trial_balance against a SUM over every journal line.
+Needs an empty journal; the seeded rows are removed afterwards unless --keep.
+
+    python -m benchmarks.trial_balance --lines 50000000 --months 60
+"""
+import argparse
+import datetime as dt
+import json
+import os
+import random
+import time
+from decimal import Decimal
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "business_core.settings")
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.db.models import Sum  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from accounting.models import Account, JournalLine, Period  # noqa: E402
+from accounting.services import close_period, period_for, trial_balance  # noqa: E402
+from core.ids import uuid7  # noqa: E402
+
+TABLES = ["account_balance", "journal_line", "journal_entry", "accounting_period", "account"]
+
+
+def cleanup():
+    with connection.cursor() as cursor:
+        for table in TABLES:
+            cursor.execute(f"DELETE FROM {table}")
+
+
+def seed(lines, months, accounts, batch, rng):
+    account_ids = [
+        Account.objects.create(code=f"B{i:04d}", name=f"Bench {i}", type=rng.choice(Account.TYPE_CHOICES)[0]).pk
+        for i in range(accounts)
+    ]
+    first = dt.date(2020, 1, 1)
+    periods = []
+    for m in range(months):
+        periods.append(period_for(dt.date(first.year + (first.month - 1 + m) // 12, (first.month - 1 + m) % 12 + 1, 1)))
+
+    entries = lines // 2
+    per_period = -(-entries // months)
+    raw = connection.cursor().cursor  # psycopg cursor, for COPY
+    start = time.perf_counter()
+    written = 0
+    while written < entries:
+        n = min(batch, entries - written)
+        now = timezone.now()
+        entry_rows, line_rows = [], []
+        for i in range(written, written + n):
+            period = periods[min(i // per_period, months - 1)]
+            entry_id = uuid7()
+            amount = Decimal(rng.randint(1, 1_000_000)) / 100
+            debit_account, credit_account = rng.sample(account_ids, 2)
+            entry_rows.append((entry_id, now, now, period.pk, period.start_date, "manual", "", "", None))
+            line_rows.append((uuid7(), now, now, entry_id, period.pk, debit_account, "USD", amount, 0, ""))
+            line_rows.append((uuid7(), now, now, entry_id, period.pk, credit_account, "USD", 0, amount, ""))
+        with raw.copy("COPY journal_entry (id, created_at, updated_at, period_id, date, source, reference,"
+                      " memo, reverses_id) FROM STDIN") as copy:
+            for row in entry_rows:
+                copy.write_row(row)
+        with raw.copy("COPY journal_line (id, created_at, updated_at, entry_id, period_id, account_id,"
+                      " currency, debit, credit, memo) FROM STDIN") as copy:
+            for row in line_rows:
+                copy.write_row(row)
+        written += n
+    raw.execute("ANALYZE journal_line")
+    return periods, round(time.perf_counter() - start, 2)
+
+
+def full_aggregation():
+    return {
+        (row["account__code"], row["currency"]): row["debit"] - row["credit"]
+        for row in JournalLine.objects.values("account__code", "currency")
+        .annotate(debit=Sum("debit"), credit=Sum("credit")).order_by()
+    }
+
+
+def _timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return result, round(min(samples) * 1000, 1)
+
+
+def main(lines, months, accounts, batch, repeat, keep):
+    if connection.vendor != "postgresql":
+        raise SystemExit("This benchmark needs the PostgreSQL database from OERP_DB_*.")
+    if JournalLine.objects.exists() or Period.objects.exists():
+        raise SystemExit("The journal is not empty; run this against a scratch database.")
+
+    periods, seed_seconds = seed(lines, months, accounts, batch, random.Random(13))
+    start = time.perf_counter()
+    for period in periods[:-1]:
+        close_period(period)
+    close_seconds = time.perf_counter() - start
+
+    snapshot, snapshot_ms = _timed(trial_balance, repeat)
+    full, full_ms = _timed(full_aggregation, repeat)
+    full = {key: value for key, value in full.items() if value}
+    result = {
+        "lines": lines,
+        "months": months,
+        "accounts": accounts,
+        "seed_seconds": seed_seconds,
+        "close_seconds_total": round(close_seconds, 2),
+        "trial_balance_ms": snapshot_ms,
+        "full_aggregation_ms": full_ms,
+        "speedup": round(full_ms / snapshot_ms, 1) if snapshot_ms else None,
+        "results_match": snapshot == full,
+    }
+    if not keep:
+        cleanup()
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=50_000_000)
+    parser.add_argument("--months", type=int, default=60)
+    parser.add_argument("--accounts", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=100_000, help="Entries per COPY")
+    parser.add_argument("--repeat", type=int, default=5, help="Best of N timings")
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded journal for inspection")
+    args = parser.parse_args()
+    print(json.dumps(main(args.lines, args.months, args.accounts, args.batch, args.repeat, args.keep), indent=2))
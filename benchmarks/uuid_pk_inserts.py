@@ -0,0 +1,87 @@
+"""
+Insert throughput and primary-key index size: uuid4 vs UUIDv7 (core.ids.uuid7).
+
+Creates two scratch tables shaped like a core.models.Base row on the configured
+PostgreSQL database (OERP_DB_* settings), COPYs the same number of rows into each
+in batches, then reports rows/sec plus the heap and pkey index sizes.
+
+    python -m benchmarks.uuid_pk_inserts --rows 10000000 --batch 50000
+"""
+import argparse
+import json
+import os
+import time
+import uuid
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "business_core.settings")
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from core.ids import uuid7  # noqa: E402
+
+GENERATORS = {"v4": uuid.uuid4, "v7": uuid7}
+
+
+def _size(cursor, relation):
+    cursor.execute("SELECT pg_relation_size(%s::regclass)", [relation])
+    return cursor.fetchone()[0]
+
+
+def run_one(label, generate, rows, batch):
+    table = f"bench_pk_{label}"
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        cursor.execute(
+            f"CREATE TABLE {table} ("
+            " id uuid PRIMARY KEY,"
+            " created_at timestamptz NOT NULL,"
+            " updated_at timestamptz NOT NULL,"
+            " payload varchar(64) NOT NULL)"
+        )
+
+        raw = cursor.cursor  # psycopg cursor, for COPY
+        inserted, elapsed = 0, 0.0
+        while inserted < rows:
+            n = min(batch, rows - inserted)
+            now = timezone.now()
+            start = time.perf_counter()
+            with raw.copy(f"COPY {table} (id, created_at, updated_at, payload) FROM STDIN") as copy:
+                for i in range(n):
+                    copy.write_row((generate(), now, now, f"row-{inserted + i}"))
+            elapsed += time.perf_counter() - start
+            inserted += n
+
+        cursor.execute(f"ANALYZE {table}")
+        result = {
+            "uuid": label,
+            "rows": rows,
+            "seconds": round(elapsed, 2),
+            "rows_per_sec": round(rows / elapsed),
+            "heap_bytes": _size(cursor, table),
+            "pkey_bytes": _size(cursor, f"{table}_pkey"),
+        }
+    return result
+
+
+def main(rows, batch, keep):
+    if connection.vendor != "postgresql":
+        raise SystemExit("This benchmark needs the PostgreSQL database from OERP_DB_*.")
+    results = [run_one(label, gen, rows, batch) for label, gen in GENERATORS.items()]
+    if not keep:
+        with connection.cursor() as cursor:
+            for label in GENERATORS:
+                cursor.execute(f"DROP TABLE IF EXISTS bench_pk_{label}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--batch", type=int, default=50_000)
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch tables for inspection")
+    args = parser.parse_args()
+    print(json.dumps(main(args.rows, args.batch, args.keep), indent=2))
@@ -0,0 +1,99 @@
+"""
+Per-record cost of UserDataValidator, before and after precompilation/caching.
+
+"before" is a copy of the original per-call implementation (re.match on raw
+patterns, pycountry.lookup, list-based domain check, uncached phone parsing);
+"after" is users.validations.UserDataValidator.validate_record.
+
+    python -m benchmarks.validator --records 5000
+"""
+import argparse
+import json
+import os
+import random
+import re
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "business_core.settings")
+django.setup()
+
+import phonenumbers  # noqa: E402
+import pycountry  # noqa: E402
+from django.core.exceptions import ValidationError  # noqa: E402
+
+from users.validations import UserDataValidator  # noqa: E402
+
+COUNTRIES = ["Egypt", "Germany", "United States", "Saudi Arabia", "France", "Arab Republic of Egypt"]
+PHONES = [("+201001234567", "+20"), ("+4915123456789", None), ("+12025550123", None)]
+DOMAINS = ["gmail.com", "outlook.com", "yahoo.com", "mail.icloud.com"]
+
+
+def legacy_validate(record):
+    errors = []
+    try:
+        if not re.match(r'^[A-Za-z0-9_]+$', record["username"]):
+            raise ValidationError("Username cannot contain spaces or special characters.")
+        password = record["password"]
+        for pattern in (r'[A-Z]', r'[a-z]', r'\d', r'[!@#$%^&*(),.?":{}|<>]'):
+            if not re.search(pattern, password):
+                raise ValidationError("weak password")
+        if not re.match(r'^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$', record["email"]):
+            raise ValidationError("Invalid email format.")
+        allowed_domains = ['gmail.com', 'outlook.com', 'yahoo.com', 'hotmail.com', 'icloud.com']
+        domain = record["email"].split('@')[-1].lower()
+        if not any(domain.endswith(d) for d in allowed_domains):
+            raise ValidationError("Email domain is not recognized as a valid provider.")
+        try:
+            pycountry.countries.lookup(record["country"])
+        except LookupError:
+            raise ValidationError("Invalid country name")
+    except ValidationError as e:
+        errors.extend(e.messages)
+    for phone in record["phone_numbers"]:
+        parsed = phonenumbers.parse(phone["number"], phone["country_code"])
+        if phonenumbers.is_valid_number(parsed):
+            phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+    return errors
+
+
+def make_records(n, seed=7):
+    rng = random.Random(seed)
+    records = []
+    for i in range(n):
+        number, code = rng.choice(PHONES)
+        records.append({
+            "username": f"user_{i}",
+            "password": "Str0ng!Passw0rd",
+            "email": f"user_{i}@{rng.choice(DOMAINS)}",
+            "country": rng.choice(COUNTRIES),
+            "city": "Cairo",
+            "phone_numbers": [{"number": number, "country_code": code}],
+        })
+    return records
+
+
+def timed(fn, records):
+    start = time.perf_counter()
+    fn(records)
+    return time.perf_counter() - start
+
+
+def main(n):
+    records = make_records(n)
+    UserDataValidator.validate_record(records[0])  # build the country index outside the timing
+    before = timed(lambda rs: [legacy_validate(r) for r in rs], records)
+    after = timed(UserDataValidator.validate_many, records)
+    return {
+        "records": n,
+        "before_us_per_record": round(before / n * 1e6, 2),
+        "after_us_per_record": round(after / n * 1e6, 2),
+        "speedup": round(before / after, 2),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=5000)
+    print(json.dumps(main(parser.parse_args().records), indent=2))
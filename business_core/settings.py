@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+import tempfile
 from datetime import timedelta
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -40,6 +41,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
  # Third-party apps
     'rest_framework',
@@ -54,6 +56,7 @@ INSTALLED_APPS = [
     # 'modeltranslation',
 
     # Business core modules
+    'core',
     'accounting',
     # 'analytics',
     'crm',
@@ -70,17 +73,25 @@ INSTALLED_APPS = [
     'auth_api'
 ]
 REST_FRAMEWORK = {
-    #to add  button for access token
-        'DEFAULT_RENDERER_CLASSES': (
-        'rest_framework.renderers.JSONRenderer',
-        'rest_framework.renderers.BrowsableAPIRenderer',
+    # orjson for every JSON response/request; the browsable API only while DEBUG
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.ORJSONRenderer',
+    ) + (('rest_framework.renderers.BrowsableAPIRenderer',) if DEBUG else ()),
+    'DEFAULT_PARSER_CLASSES': (
+        'core.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ),
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',  # use JWT auth
+        'auth_api.authentication.ClaimsJWTAuthentication',  # JWT auth from token claims, no user fetch
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',  # default: protected endpoints
     ),
+    # keyset pagination on (created_at, id); list endpoints never use OFFSET.
+    # Views over non-Base models, or with keyset_pagination = False, stay unpaginated
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetPagination',
+    'PAGE_SIZE': 50,
 }
 '''
 REST_FRAMEWORK = {
@@ -102,8 +113,25 @@ SIMPLE_JWT = {
     "SIGNING_KEY": SECRET_KEY,
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
+# seconds a cached (token_version, is_active) pair is trusted by ClaimsJWTAuthentication
+AUTH_USER_STATE_TTL = int(os.getenv('OERP_AUTH_STATE_TTL', '60'))
+# refresh-token blacklist lookups: in-process LRU in front of a shared cache alias; "not blacklisted"
+# is kept only LOCAL_GOOD_TTL seconds unless the alias is really shared (not LocMem/Dummy)
+AUTH_BLACKLIST_CACHE = os.getenv('OERP_BLACKLIST_CACHE', 'default')
+AUTH_BLACKLIST_LRU_SIZE = int(os.getenv('OERP_BLACKLIST_LRU_SIZE', '10000'))
+AUTH_BLACKLIST_LOCAL_GOOD_TTL = int(os.getenv('OERP_BLACKLIST_LOCAL_GOOD_TTL', '30'))
+
+# local-memory stand-in; point OERP_CACHE_BACKEND/LOCATION at redis/memcached to share across workers
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('OERP_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('OERP_CACHE_LOCATION', 'oerp-default'),
+    }
+}
 
 MIDDLEWARE = [
+    # opt-in (INSTRUMENTATION_ENABLED); removes itself from the stack otherwise
+    'core.instrumentation.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -116,6 +144,11 @@ MIDDLEWARE = [
 ROOT_URLCONF = 'business_core.urls'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# uploads go straight to a temp file (hashed while streaming), never into worker memory
+FILE_UPLOAD_HANDLERS = ['core.uploads.HashingTemporaryFileUploadHandler']
+# profile image variants rendered in the background: {name: max edge in px}
+PROFILE_IMAGE_VARIANTS = {'thumb': 128, 'medium': 512}
+PROFILE_IMAGE_WORKERS = int(os.getenv('OERP_PROFILE_IMAGE_WORKERS', '2'))
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -169,6 +202,113 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# OERP_PASSWORD_HASHER picks the preferred hasher (argon2 needs argon2-cffi);
+# the others stay listed so existing hashes still verify and get upgraded on login.
+# Run `python manage.py calibrate_hasher` to pick the cost parameters for the host.
+# Login hashing runs on the request thread (no separate hash pool, see auth_api/hashers.py):
+# the gunicorn worker/thread count is what bounds concurrent hashes.
+
+PASSWORD_HASHER = os.getenv('OERP_PASSWORD_HASHER', 'scrypt')
+_PASSWORD_HASHER_CLASSES = {
+    'argon2': 'auth_api.hashers.TunedArgon2PasswordHasher',
+    'scrypt': 'auth_api.hashers.TunedScryptPasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHER_CLASSES[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHER_CLASSES.items() if name != PASSWORD_HASHER
+]
+PASSWORD_HASHER_PARAMS = {
+    'argon2': {
+        'time_cost': int(os.getenv('OERP_ARGON2_TIME_COST', '2')),
+        'memory_cost': int(os.getenv('OERP_ARGON2_MEMORY_COST', '65536')),  # KiB
+        'parallelism': int(os.getenv('OERP_ARGON2_PARALLELISM', '1')),
+    },
+    'scrypt': {
+        'work_factor': int(os.getenv('OERP_SCRYPT_WORK_FACTOR', str(2 ** 14))),
+        'block_size': int(os.getenv('OERP_SCRYPT_BLOCK_SIZE', '8')),
+        'parallelism': int(os.getenv('OERP_SCRYPT_PARALLELISM', '1')),
+    },
+}
+
+# load phonenumbers/pycountry data at startup (before fork with gunicorn --preload)
+# instead of on the first validation in each worker
+VALIDATION_PRELOAD = os.getenv('OERP_VALIDATION_PRELOAD', 'false').lower() in ('1', 'true', 'yes')
+
+# bulk user import (users/bulk_import.py): rows per bulk_create transaction, hashing processes
+USER_IMPORT_CHUNK_SIZE = int(os.getenv('OERP_USER_IMPORT_CHUNK_SIZE', '500'))
+USER_IMPORT_WORKERS = int(os.getenv('OERP_USER_IMPORT_WORKERS', str(os.cpu_count() or 2)))
+
+# product autocomplete (inventory/search.py): seconds between background pulls of products changed by
+# other workers, how far before the last seen updated_at each pull re-reads (late-committing writes),
+# and seconds between full reloads (the only way deletes/deactivations by other workers drop out)
+CATALOG_TRIE_SYNC_SECONDS = int(os.getenv('OERP_CATALOG_TRIE_SYNC_SECONDS', '30'))
+CATALOG_TRIE_SYNC_OVERLAP = int(os.getenv('OERP_CATALOG_TRIE_SYNC_OVERLAP', '120'))
+CATALOG_TRIE_REBUILD_SECONDS = int(os.getenv('OERP_CATALOG_TRIE_REBUILD_SECONDS', '3600'))
+
+# transactions rerun on serialization failure / deadlock (core/db.py): attempts, first backoff in seconds
+DB_RETRY_ATTEMPTS = int(os.getenv('OERP_DB_RETRY_ATTEMPTS', '5'))
+DB_RETRY_BASE_DELAY = float(os.getenv('OERP_DB_RETRY_BASE_DELAY', '0.02'))
+
+# ISO 4217 code for journal lines posted without an explicit currency
+DEFAULT_CURRENCY = os.getenv('OERP_DEFAULT_CURRENCY', 'USD')
+
+# account codes fulfilled orders (accounting/handlers.py) and customer payments (receive_payment) post to;
+# created after `migrate` when missing (accounting.services.ensure_sales_accounts)
+ACCOUNTING_SALES_ACCOUNTS = {
+    'receivable': os.getenv('OERP_ACCOUNT_RECEIVABLE', '1100'),
+    'revenue': os.getenv('OERP_ACCOUNT_REVENUE', '4000'),
+    'cash': os.getenv('OERP_ACCOUNT_CASH', '1000'),
+}
+
+# outbox delivery (core/outbox.py, `manage.py outbox_worker`)
+OUTBOX_BATCH_SIZE = int(os.getenv('OERP_OUTBOX_BATCH_SIZE', '100'))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv('OERP_OUTBOX_MAX_ATTEMPTS', '8'))
+OUTBOX_RETRY_BASE_SECONDS = int(os.getenv('OERP_OUTBOX_RETRY_BASE_SECONDS', '5'))
+
+# streaming exports (core/exports.py): rows per server-side cursor fetch, background job threads
+EXPORT_CHUNK_SIZE = int(os.getenv('OERP_EXPORT_CHUNK_SIZE', '2000'))
+EXPORT_WORKERS = int(os.getenv('OERP_EXPORT_WORKERS', '2'))
+# where background export files go: private (not under MEDIA_ROOT), downloaded via exports/jobs/<id>/file
+EXPORTS_ROOT = os.getenv('OERP_EXPORTS_ROOT', os.path.join(BASE_DIR, 'private', 'exports'))
+
+# chunked document uploads (documents/services.py): part files (same filesystem as MEDIA_ROOT, so
+# completion is a rename; empty means MEDIA_ROOT/.uploads, resolved when used), largest PATCH body
+# and largest whole upload in bytes
+DOCUMENTS_UPLOAD_DIR = os.getenv('OERP_DOCUMENTS_UPLOAD_DIR', '')
+DOCUMENTS_MAX_CHUNK_BYTES = int(os.getenv('OERP_DOCUMENTS_MAX_CHUNK_BYTES', str(64 * 1024 * 1024)))
+DOCUMENTS_MAX_UPLOAD_BYTES = int(os.getenv('OERP_DOCUMENTS_MAX_UPLOAD_BYTES', str(2 * 1024 ** 3)))
+# document downloads (documents/serving.py): '' (Django, with Range), 'x-accel-redirect' (nginx) or 'x-sendfile'
+DOCUMENTS_SENDFILE = os.getenv('OERP_DOCUMENTS_SENDFILE', '')
+# nginx `internal` location aliased to MEDIA_ROOT, used with x-accel-redirect
+DOCUMENTS_ACCEL_PREFIX = os.getenv('OERP_DOCUMENTS_ACCEL_PREFIX', '/protected-media/')
+# PDF text extraction (documents/extraction.py): seconds one document may take before it is marked failed
+DOCUMENTS_EXTRACT_TIMEOUT = int(os.getenv('OERP_DOCUMENTS_EXTRACT_TIMEOUT', '300'))
+
+# invoice PDFs (accounting/invoices.py): template under templates/, render processes, payment terms, letterhead
+INVOICE_TEMPLATE = os.getenv('OERP_INVOICE_TEMPLATE', 'invoices/invoice.html')
+INVOICE_WORKERS = int(os.getenv('OERP_INVOICE_WORKERS', str(os.cpu_count() or 2)))
+INVOICE_DUE_DAYS = int(os.getenv('OERP_INVOICE_DUE_DAYS', '30'))
+INVOICE_ISSUER = {
+    'name': os.getenv('OERP_COMPANY_NAME', 'Active Computer'),
+    'address': os.getenv('OERP_COMPANY_ADDRESS', ''),
+    'tax_id': os.getenv('OERP_COMPANY_TAX_ID', ''),
+}
+
+# request instrumentation (core/instrumentation.py): Server-Timing header and Prometheus metrics at /metrics,
+# served to scrapers sending `Authorization: Bearer <OERP_METRICS_TOKEN>`, or without a token only to
+# direct (not proxied) requests from the listed client addresses
+INSTRUMENTATION_ENABLED = os.getenv('OERP_INSTRUMENTATION', 'false').lower() in ('1', 'true', 'yes')
+INSTRUMENTATION_METRICS_TOKEN = os.getenv('OERP_METRICS_TOKEN', '')
+INSTRUMENTATION_METRICS_ALLOWED = os.getenv('OERP_METRICS_ALLOWED', '127.0.0.1,::1').split(',')
+# sampled profiles: this fraction of requests, plus any request sending `X-Profile: <token>`
+INSTRUMENTATION_PROFILE_RATE = float(os.getenv('OERP_PROFILE_RATE', '0'))
+INSTRUMENTATION_PROFILE_TOKEN = os.getenv('OERP_PROFILE_TOKEN', '')
+# 'cprofile' (.prof) or 'pyinstrument' (.html, needs pyinstrument installed)
+INSTRUMENTATION_PROFILER = os.getenv('OERP_PROFILER', 'cprofile')
+INSTRUMENTATION_PROFILE_DIR = os.getenv('OERP_PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'oerp-profiles'))
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -21,4 +21,12 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('users/', include('users.urls')),
     path('auth/', include('auth_api.urls')),
+    path('inventory/', include('inventory.urls')),
+    path('operations/', include('operations.urls')),
+    path('dashboard/', include('dashboard.urls')),
+    path('crm/', include('crm.urls')),
+    path('documents/', include('documents.urls')),
+    path('accounting/', include('accounting.urls')),
+    path('', include('core.urls')),
+    path('store/', include('ecommerce.urls')),
 ]
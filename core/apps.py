@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from django.conf import settings
+        from core import exports, instrumentation, outbox
+        outbox.autodiscover()
+        exports.autodiscover()
+        if getattr(settings, 'INSTRUMENTATION_ENABLED', False):
+            instrumentation.install()
@@ -0,0 +1,38 @@
+#core/db.py
+import random
+import time
+
+from django.conf import settings
+from django.db import OperationalError, connection
+
+# SQLSTATEs PostgreSQL expects the client to retry the whole transaction on
+RETRYABLE_SQLSTATES = {
+    '40001',  # serialization_failure
+    '40P01',  # deadlock_detected
+}
+
+
+def is_retryable(exc):
+    cause = exc.__cause__
+    code = getattr(cause, 'sqlstate', None) or getattr(cause, 'pgcode', None)
+    return code in RETRYABLE_SQLSTATES
+
+
+def run_with_retries(fn, attempts=None, base_delay=None):
+    """
+    Runs `fn` (which opens its own transaction) and reruns it on serialization
+    failures and deadlocks, with exponential backoff plus full jitter.
+    Inside an outer atomic block the transaction cannot be retried here,
+    so `fn` runs once and the error goes to the caller.
+    """
+    attempts = attempts or getattr(settings, 'DB_RETRY_ATTEMPTS', 5)
+    base_delay = base_delay if base_delay is not None else getattr(settings, 'DB_RETRY_BASE_DELAY', 0.02)
+    if connection.in_atomic_block:
+        return fn()
+    for attempt in range(attempts):
+        try:
+            return fn()
+        except OperationalError as e:
+            if attempt == attempts - 1 or not is_retryable(e):
+                raise
+            time.sleep(random.uniform(0, base_delay * (2 ** attempt)))
@@ -0,0 +1,219 @@
+#core/exports.py
+"""
+Streaming exports: rows come from `.values_list(...).iterator(chunk_size=...)`
+(a server-side cursor on PostgreSQL) and are written straight into the
+response or a file, so memory stays flat whatever the row count.
+
+Apps declare exports in `<app>/exports.py`:
+
+    register(Export('journal_lines', JournalLine.objects.order_by('created_at'),
+                    [('Date', 'entry__date'), ('Account', 'account__code'), ...]))
+"""
+import csv
+import datetime
+import io
+import logging
+import os
+import tempfile
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import close_old_connections, transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from core.models import ExportJob
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'csv.gz': ('application/gzip', 'csv.gz'),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+}
+WRITE_CHUNK = 64 * 1024
+# a text cell starting with one of these is a formula to Excel/LibreOffice (CSV injection)
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+_registry = {}
+
+# export jobs are mostly waiting on the DB cursor and the disk
+_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'EXPORT_WORKERS', 2),
+    thread_name_prefix='export',
+)
+
+
+class Export:
+    """
+    A named export: a queryset plus (header, values_list path) columns.
+    `filters` maps query parameters to lookups, e.g. {'from': 'created_at__gte'}.
+    """
+
+    def __init__(self, name, queryset, columns, filters=None):
+        self.name = name
+        self.queryset = queryset
+        self.columns = columns
+        self.filters = filters or {'from': 'created_at__gte', 'to': 'created_at__lt'}
+
+    @property
+    def headers(self):
+        return [header for header, _ in self.columns]
+
+    def lookups(self, params=None):
+        """
+        Filter kwargs for `params`. Building the filter converts each value to
+        its field type, so a bad value raises ValidationError here rather than
+        halfway through a streamed response.
+        """
+        lookups = {lookup: params[key] for key, lookup in self.filters.items() if params and params.get(key)}
+        try:
+            self.queryset.filter(**lookups)
+        except (ValueError, TypeError) as e:
+            raise ValidationError(str(e))
+        return lookups
+
+    def rows(self, params=None, chunk_size=None):
+        chunk_size = chunk_size or getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+        queryset = self.queryset.filter(**self.lookups(params))
+        return queryset.values_list(*[path for _, path in self.columns]).iterator(chunk_size=chunk_size)
+
+
+def register(export):
+    _registry[export.name] = export
+    return export
+
+
+def get_export(name):
+    return _registry.get(name)
+
+
+def autodiscover():
+    autodiscover_modules('exports')
+
+
+# ------------------------------------------------
+# ✅ Writers (generators of bytes)
+# ------------------------------------------------
+def _csv_chunks(headers, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(headers)
+    for row in rows:
+        writer.writerow([_text_cell(value) for value in row])
+        if buffer.tell() >= WRITE_CHUNK:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+def _gzip(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def _xlsx_chunks(headers, rows, title):
+    """
+    openpyxl write-only mode streams rows into a temporary file (constant
+    memory); the zip container is only complete at save(), so the bytes are
+    sent from the file afterwards.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=title[:31])
+    sheet.append(headers)
+    for row in rows:
+        sheet.append([_xlsx_value(value) for value in row])
+    with tempfile.TemporaryFile() as tmp:
+        workbook.save(tmp)
+        tmp.seek(0)
+        while chunk := tmp.read(WRITE_CHUNK):
+            yield chunk
+
+
+def _text_cell(value):
+    # user-entered text (names, references) must not run as a formula when opened
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def _xlsx_value(value):
+    # Excel has no timezone-aware datetimes or UUIDs
+    if isinstance(value, datetime.datetime) and value.tzinfo is not None:
+        return timezone.make_naive(value)
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return _text_cell(value)
+
+
+def render(export, fmt, params=None):
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format {fmt!r}")
+    rows = export.rows(params)
+    if fmt == 'xlsx':
+        return _xlsx_chunks(export.headers, rows, export.name)
+    chunks = _csv_chunks(export.headers, rows)
+    return _gzip(chunks) if fmt == 'csv.gz' else chunks
+
+
+def filename(export, fmt):
+    return f"{export.name}-{timezone.now():%Y%m%d-%H%M%S}.{FORMATS[fmt][1]}"
+
+
+def streaming_response(export, fmt, params=None):
+    response = StreamingHttpResponse(render(export, fmt, params), content_type=FORMATS[fmt][0])
+    response['Content-Disposition'] = f'attachment; filename="{filename(export, fmt)}"'
+    return response
+
+
+# ------------------------------------------------
+# ✅ Background jobs (very large exports, written under MEDIA_ROOT)
+# ------------------------------------------------
+def run_job(job_id):
+    """
+    Writes the export to EXPORTS_ROOT/<random>/<name>-<timestamp>.<ext> (via a
+    .part file, renamed when complete); the random directory keeps the path
+    unguessable and the file name readable for the download.
+    """
+    close_old_connections()
+    job = ExportJob.objects.get(pk=job_id)
+    export = get_export(job.export)
+    job.status, job.started_at = 'running', timezone.now()
+    job.save()
+    try:
+        if export is None:
+            raise LookupError(f"Unknown export '{job.export}'.")
+        storage = job.file.storage
+        name = f"{uuid.uuid4().hex}/{filename(export, job.format)}"
+        path = storage.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.part", 'wb') as out:
+            for chunk in render(export, job.format, job.params):
+                out.write(chunk)
+        os.replace(f"{path}.part", path)
+        job.file.name = name
+        job.status = 'done'
+    except Exception as e:
+        logger.exception("Export job %s (%s) failed", job.pk, job.export)
+        job.status, job.error = 'failed', str(e)[:1000]
+    job.finished_at = timezone.now()
+    job.save()
+    close_old_connections()
+
+
+def start_job(export, fmt, params=None, user=None):
+    """Creates an ExportJob and runs it on the export pool once the transaction commits."""
+    job = ExportJob.objects.create(export=export.name, format=fmt, params=params or {}, created_by=user)
+    transaction.on_commit(lambda: _executor.submit(run_job, job.pk))
+    return job
@@ -0,0 +1,328 @@
+#core/instrumentation.py
+"""
+Opt-in request instrumentation (INSTRUMENTATION_ENABLED).
+
+Per request: wall time, DB query count and time (connection.execute_wrapper
+on every database alias), and time spent in serializers and password
+hashing. Totals go to an in-process Prometheus registry served by
+`metrics_view`, and to a `Server-Timing` response header for the browser /
+load-test client.
+
+Profiles: a sampled fraction of requests (INSTRUMENTATION_PROFILE_RATE), or
+any request sending `X-Profile: <INSTRUMENTATION_PROFILE_TOKEN>`, is run
+under cProfile (.prof, open with snakeviz / pstats) or pyinstrument (.html)
+and written to INSTRUMENTATION_PROFILE_DIR.
+
+Metrics are per process: with several workers, scrape each one (or run the
+load test against a single worker). With INSTRUMENTATION_METRICS_TOKEN set,
+/metrics wants `Authorization: Bearer <token>`; without it, only direct
+(unproxied) requests from INSTRUMENTATION_METRICS_ALLOWED are answered.
+"""
+import contextlib
+import contextvars
+import hmac
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpResponse, HttpResponseNotFound
+
+SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+_current = contextvars.ContextVar('request_stats', default=None)
+
+
+# ------------------------------------------------
+# ✅ Prometheus registry
+# ------------------------------------------------
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)] + list(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter:
+    def __init__(self, name, help, labels=()):
+        self.name, self.help, self.labels = name, help, labels
+        self._values = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[tuple(labels)] += amount
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labels, key)} {value:g}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help, labels=(), buckets=SECONDS_BUCKETS):
+        self.name, self.help, self.labels, self.buckets = name, help, labels, buckets
+        self._values = {}  # labels -> [bucket counts..., count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, labels=()):
+        key = tuple(labels)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                self._values[key] = row = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[i] += 1
+            row[-2] += 1
+            row[-1] += value
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, row in sorted(self._values.items()):
+                for bound, count in zip(self.buckets, row):
+                    le = 'le="%g"' % bound
+                    lines.append(f"{self.name}_bucket{_labels(self.labels, key, [le])} {count}")
+                le = 'le="+Inf"'
+                lines.append(f"{self.name}_bucket{_labels(self.labels, key, [le])} {row[-2]}")
+                lines.append(f"{self.name}_count{_labels(self.labels, key)} {row[-2]}")
+                lines.append(f"{self.name}_sum{_labels(self.labels, key)} {row[-1]:.6f}")
+        return lines
+
+
+REQUESTS = Counter('oerp_http_requests_total', 'Requests by view, method and status.', ('view', 'method', 'status'))
+DURATION = Histogram('oerp_http_request_duration_seconds', 'Request wall time.', ('view', 'method'))
+PHASES = Histogram('oerp_request_phase_seconds', 'Time per request spent in db / serializer / hashing.',
+                   ('view', 'phase'))
+QUERIES = Histogram('oerp_db_queries_per_request', 'DB queries per request.', ('view',), QUERY_BUCKETS)
+PROFILES = Counter('oerp_profiles_total', 'Requests profiled.', ('view', 'profiler'))
+METRICS = (REQUESTS, DURATION, PHASES, QUERIES, PROFILES)
+
+
+def expose():
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.expose())
+    return '\n'.join(lines) + '\n'
+
+
+# ------------------------------------------------
+# ✅ Per-request timers
+# ------------------------------------------------
+class RequestStats:
+    __slots__ = ('queries', 'phases', '_depth')
+
+    def __init__(self):
+        self.queries = 0
+        self.phases = defaultdict(float)
+        self._depth = defaultdict(int)
+
+
+@contextlib.contextmanager
+def timed(phase):
+    """Adds the block's wall time to `phase` of the current request (outermost block only)."""
+    stats = _current.get()
+    if stats is None or stats._depth[phase]:
+        yield
+        return
+    stats._depth[phase] += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.phases[phase] += time.perf_counter() - start
+        stats._depth[phase] -= 1
+
+
+def _query_wrapper(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.phases['db'] += time.perf_counter() - start
+
+
+def _wrap_property(cls, name, phase):
+    original = cls.__dict__[name]
+
+    def fget(self):
+        with timed(phase):
+            return original.fget(self)
+    setattr(cls, name, property(fget, original.fset, original.fdel, original.__doc__))
+
+
+def _wrap_method(cls, name, phase):
+    original = cls.__dict__[name]
+    is_classmethod = isinstance(original, classmethod)
+    func = original.__func__ if is_classmethod else original
+
+    def wrapper(*args, **kwargs):
+        with timed(phase):
+            return func(*args, **kwargs)
+    wrapper.__name__, wrapper.__doc__, wrapper.__wrapped__ = func.__name__, func.__doc__, func
+    setattr(cls, name, classmethod(wrapper) if is_classmethod else wrapper)
+
+
+_installed = False
+
+
+def install():
+    """Times serializers, read schemas and password hashers. Called from CoreConfig.ready when enabled."""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    from django.utils.module_loading import import_string
+    from rest_framework.serializers import BaseSerializer
+
+    from core.readers import Schema
+
+    _wrap_property(BaseSerializer, 'data', 'serializer')
+    _wrap_method(BaseSerializer, 'is_valid', 'serializer')
+    _wrap_method(Schema, 'dump_rows', 'serializer')
+    for path in settings.PASSWORD_HASHERS:
+        hasher = import_string(path)
+        for name in ('encode', 'verify'):
+            if name in hasher.__dict__:
+                _wrap_method(hasher, name, 'hashing')
+
+
+# ------------------------------------------------
+# ✅ Middleware
+# ------------------------------------------------
+def _view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    return match.route or match.view_name or 'unresolved'
+
+
+class InstrumentationMiddleware:
+    """First in MIDDLEWARE so the timings cover the whole stack."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'INSTRUMENTATION_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.profile_rate = getattr(settings, 'INSTRUMENTATION_PROFILE_RATE', 0.0)
+        self.profile_token = getattr(settings, 'INSTRUMENTATION_PROFILE_TOKEN', '')
+        self.profiler = getattr(settings, 'INSTRUMENTATION_PROFILER', 'cprofile')
+
+    def _should_profile(self, request):
+        if self.profile_token and request.headers.get('X-Profile') == self.profile_token:
+            return True
+        return self.profile_rate > 0 and random.random() < self.profile_rate
+
+    def __call__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        profile = None
+        try:
+            with contextlib.ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(_query_wrapper))
+                if self._should_profile(request):
+                    profile = _Profile(self.profiler)
+                    with profile:
+                        response = self.get_response(request)
+                else:
+                    response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        elapsed = time.perf_counter() - start
+
+        view, method = _view_name(request), request.method
+        REQUESTS.inc((view, method, response.status_code))
+        DURATION.observe(elapsed, (view, method))
+        QUERIES.observe(stats.queries, (view,))
+        for phase in ('db', 'serializer', 'hashing'):
+            PHASES.observe(stats.phases.get(phase, 0.0), (view, phase))
+
+        timings = [f'total;dur={elapsed * 1000:.1f}',
+                   f'db;dur={stats.phases.get("db", 0.0) * 1000:.1f};desc="{stats.queries} queries"']
+        for phase in ('serializer', 'hashing'):
+            if phase in stats.phases:
+                timings.append(f'{phase};dur={stats.phases[phase] * 1000:.1f}')
+        response['Server-Timing'] = ', '.join(timings)
+        if profile is not None:
+            response['X-Profile-File'] = profile.dump(view)
+            PROFILES.inc((view, profile.kind))
+        return response
+
+
+class _Profile:
+    def __init__(self, kind):
+        if kind == 'pyinstrument':
+            from pyinstrument import Profiler
+
+            self.kind, self.profiler = 'pyinstrument', Profiler()
+        else:
+            import cProfile
+
+            self.kind, self.profiler = 'cprofile', cProfile.Profile()
+
+    def __enter__(self):
+        if self.kind == 'pyinstrument':
+            self.profiler.start()
+        else:
+            self.profiler.enable()
+
+    def __exit__(self, *exc):
+        if self.kind == 'pyinstrument':
+            self.profiler.stop()
+        else:
+            self.profiler.disable()
+
+    def dump(self, view):
+        directory = getattr(settings, 'INSTRUMENTATION_PROFILE_DIR', None) or os.path.join(tempfile.gettempdir(), 'oerp-profiles')
+        os.makedirs(directory, exist_ok=True)
+        slug = ''.join(c if c.isalnum() else '_' for c in view)[:60].strip('_') or 'root'
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{slug}-{random.getrandbits(24):06x}"
+        if self.kind == 'pyinstrument':
+            name += '.html'
+            with open(os.path.join(directory, name), 'w') as f:
+                f.write(self.profiler.output_html())
+        else:
+            name += '.prof'
+            self.profiler.dump_stats(os.path.join(directory, name))
+        return name
+
+
+# ------------------------------------------------
+# ✅ /metrics (plain Django view: no auth or renderers in the way of the scraper)
+# ------------------------------------------------
+PROXY_HEADERS = ('HTTP_X_FORWARDED_FOR', 'HTTP_X_REAL_IP', 'HTTP_FORWARDED')
+
+
+def metrics_allowed(request):
+    token = getattr(settings, 'INSTRUMENTATION_METRICS_TOKEN', '')
+    if token:
+        return hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {token}")
+    # behind nginx REMOTE_ADDR is the proxy's own (loopback) address, so any
+    # proxied request would pass the address check
+    if any(header in request.META for header in PROXY_HEADERS):
+        return False
+    allowed = getattr(settings, 'INSTRUMENTATION_METRICS_ALLOWED', ('127.0.0.1', '::1'))
+    return request.META.get('REMOTE_ADDR') in allowed
+
+
+def metrics_view(request):
+    if not getattr(settings, 'INSTRUMENTATION_ENABLED', False) or not metrics_allowed(request):
+        return HttpResponseNotFound()
+    return HttpResponse(expose(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,50 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from core.models import OutboxEvent
+from core.outbox import process_batch, requeue_dead
+
+
+class Command(BaseCommand):
+    help = (
+        "Delivers outbox events to their handlers. Run several copies in parallel; "
+        "batches are claimed with FOR UPDATE SKIP LOCKED."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None, help="Events per transaction")
+        parser.add_argument("--idle-sleep", type=float, default=1.0, help="Seconds to wait when the queue is empty")
+        parser.add_argument("--once", action="store_true", help="Drain the due events and exit")
+        parser.add_argument("--requeue-dead", action="store_true", help="Move dead-lettered events back to pending and exit")
+        parser.add_argument("--purge-done-days", type=int, default=None,
+                            help="Delete delivered events older than N days and exit")
+
+    def handle(self, *args, **options):
+        if options["requeue_dead"]:
+            self.stdout.write(self.style.SUCCESS(f"Requeued {requeue_dead()} events"))
+            return
+        if options["purge_done_days"] is not None:
+            cutoff = timezone.now() - timedelta(days=options["purge_done_days"])
+            deleted, _ = OutboxEvent.objects.filter(status="done", processed_at__lt=cutoff).delete()
+            self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} delivered events"))
+            return
+
+        totals = {"done": 0, "retry": 0, "dead": 0}
+        try:
+            while True:
+                close_old_connections()
+                counts = process_batch(options["batch_size"])
+                for key, value in counts.items():
+                    totals[key] += value
+                if not any(counts.values()):
+                    if options["once"]:
+                        break
+                    time.sleep(options["idle_sleep"])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(
+            f"{totals['done']} delivered, {totals['retry']} to retry, {totals['dead']} dead-lettered"))
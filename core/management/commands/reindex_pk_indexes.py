@@ -0,0 +1,46 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core.models import Base
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the primary-key index of every core.models.Base table with "
+        "REINDEX CONCURRENTLY. Run once after switching Base to UUIDv7: existing "
+        "uuid4 ids stay valid, and this compacts the pages split by random inserts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", action="append", help="app_label.Model; repeatable, default: all")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("REINDEX CONCURRENTLY needs PostgreSQL.")
+
+        if options["model"]:
+            models = [apps.get_model(label) for label in options["model"]]
+        else:
+            models = [m for m in apps.get_models() if issubclass(m, Base) and not m._meta.proxy]
+
+        with connection.cursor() as cursor:
+            for model in models:
+                table = model._meta.db_table
+                cursor.execute(
+                    "SELECT indexrelid::regclass::text, pg_relation_size(indexrelid) "
+                    "FROM pg_index WHERE indrelid = %s::regclass AND indisprimary",
+                    [connection.ops.quote_name(table)],
+                )
+                row = cursor.fetchone()
+                if row is None:
+                    continue
+                index, size_before = row
+                if options["dry_run"]:
+                    self.stdout.write(f"{table}: would reindex {index} ({size_before} bytes)")
+                    continue
+                cursor.execute(f"REINDEX INDEX CONCURRENTLY {index}")
+                cursor.execute("SELECT pg_relation_size(%s::regclass)", [index])
+                size_after = cursor.fetchone()[0]
+                self.stdout.write(f"{table}: {index} {size_before} -> {size_after} bytes")
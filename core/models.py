@@ -1,19 +1,222 @@
-from django.db import models
+import copy
 
-import uuid
 from django.db import models
+from django.conf import settings
+from django.db.backends.utils import names_digest
+from django.db.models.fields.files import FieldFile
+from django.db.models.signals import class_prepared
+from django.dispatch import receiver
 from django.utils import timezone
 
+from core.ids import uuid7
+from core.storage import export_storage
+
 
 class Base(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    """
+    Shared base for every ERP table.
+
+    Primary keys are time-ordered UUIDv7 (core.ids.uuid7), so inserts append to
+    the right edge of the pkey B-tree; rows created with uuid4 keep their ids.
+
+    Tracks which fields changed since the row was loaded (or last saved):
+    `from_db` keeps a snapshot of the loaded values, and `save()` on a loaded
+    instance only writes the changed columns (plus `updated_at`). Mutable
+    values (JSONField dicts/lists) are deep-copied into the snapshot, so
+    in-place edits like `obj.payload['x'] = 1` count as changes.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     created_at = models.DateTimeField(default=timezone.now, editable=False)
     updated_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
         abstract = True
 
+    # ------------------------------------------------
+    # 🔹 Dirty tracking
+    # ------------------------------------------------
+    @staticmethod
+    def _snapshot_value(value):
+        if isinstance(value, FieldFile):
+            return value.name
+        if isinstance(value, (dict, list)):
+            return copy.deepcopy(value)
+        return value
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            name: cls._snapshot_value(value) for name, value in zip(field_names, values)
+        }
+        return instance
+
+    def _tracked_value(self, field):
+        value = getattr(self, field.attname)
+        if isinstance(value, FieldFile):
+            return value.name
+        return value
+
+    def _snapshot(self, attnames=None):
+        deferred = self.get_deferred_fields()
+        snapshot = self.__dict__.setdefault('_loaded_values', {})
+        for field in self._meta.concrete_fields:
+            if field.attname in deferred or (attnames is not None and field.attname not in attnames):
+                continue
+            snapshot[field.attname] = self._snapshot_value(getattr(self, field.attname))
+
+    @property
+    def is_tracked(self):
+        """True when the instance has a snapshot to diff against."""
+        return '_loaded_values' in self.__dict__
+
+    def get_loaded_value(self, attname, default=None):
+        return self.__dict__.get('_loaded_values', {}).get(attname, default)
+
+    def get_dirty_fields(self):
+        """{attname: loaded value} for every field changed since load/save."""
+        if not self.is_tracked:
+            return {}
+        snapshot = self._loaded_values
+        deferred = self.get_deferred_fields()
+        dirty = {}
+        for field in self._meta.concrete_fields:
+            if field.attname in deferred:
+                continue
+            if field.attname not in snapshot:
+                dirty[field.attname] = None  # deferred at load time, assigned since
+                continue
+            value = getattr(self, field.attname)
+            if isinstance(value, FieldFile) and not value._committed:
+                dirty[field.attname] = snapshot[field.attname]  # new upload, even if the name matches
+            elif self._tracked_value(field) != snapshot[field.attname]:
+                dirty[field.attname] = snapshot[field.attname]
+        return dirty
+
+    def has_changed(self, attname):
+        return attname in self.get_dirty_fields()
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        fields = kwargs.get('fields')
+        self._snapshot(set(fields) if fields is not None else None)
+
     def save(self, *args, **kwargs):
         self.updated_at = timezone.now()
+        if (
+            kwargs.get('update_fields') is None
+            and not kwargs.get('force_insert')
+            and not self._state.adding
+            and self.is_tracked
+        ):
+            # loaded row: write only what changed
+            dirty = self.get_dirty_fields()
+            kwargs['update_fields'] = [
+                self._meta.get_field(attname).name for attname in dirty
+            ] + ['updated_at']
         super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        self._snapshot(
+            {self._meta.get_field(name).attname for name in update_fields}
+            if update_fields is not None else None
+        )
+
+
+
+# ------------------------------------------------
+# 🔹 (created_at, id) index on every Base table, for core.pagination.KeysetPagination
+# ------------------------------------------------
+@receiver(class_prepared)
+def add_keyset_index(sender, **kwargs):
+    opts = sender._meta
+    if not issubclass(sender, Base) or opts.abstract or opts.proxy or not opts.managed:
+        return
+    if any(list(index.fields) == ['created_at', 'id'] for index in opts.indexes):
+        return
+    name = f"{opts.db_table[:19]}_{names_digest(opts.db_table, length=6)}_ks"
+    opts.indexes.append(models.Index(fields=['created_at', 'id'], name=name))
+
+class OutboxEvent(Base):
+    """
+    Transactional outbox: written by core.outbox.publish in the same transaction
+    as the business row, delivered later to the registered handlers by the
+    `outbox_worker` command.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('done', 'Done'),
+        ('dead', 'Dead'),
+    ]
+
+    topic = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now, help_text="Not claimed before this time (retry backoff)")
+    processed_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default='')
+
+    class Meta:
+        db_table = 'outbox_event'
+        indexes = [
+            models.Index(fields=['available_at'], condition=models.Q(status='pending'), name='outbox_pending_idx'),
+            models.Index(fields=['topic', 'status'], name='outbox_topic_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.topic} ({self.status})"
+
+
+class OutboxDelivery(Base):
+    """
+    Outcome of one handler for one OutboxEvent. Each handler runs in its own
+    savepoint and is retried, dead-lettered and requeued on its own; handlers
+    that already succeeded are not run again.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('done', 'Done'),
+        ('dead', 'Dead'),
+    ]
+
+    event = models.ForeignKey(OutboxEvent, on_delete=models.CASCADE, related_name="deliveries")
+    handler = models.CharField(max_length=255, help_text="Dotted path of the handler function")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default='')
+
+    class Meta:
+        db_table = 'outbox_delivery'
+        constraints = [
+            models.UniqueConstraint(fields=['event', 'handler'], name='outbox_delivery_event_handler'),
+        ]
+
+    def __str__(self):
+        return f"{self.handler} ({self.status})"
+
+
+class ExportJob(Base):
+    """A background export (core.exports.start_job) written to EXPORTS_ROOT (core.storage.PrivateExportStorage)."""
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    export = models.CharField(max_length=64)
+    format = models.CharField(max_length=10)
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    file = models.FileField(storage=export_storage, max_length=255, blank=True, null=True)
+    error = models.TextField(blank=True, default='')
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="export_jobs")
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'export_job'
 
+    def __str__(self):
+        return f"{self.export}.{self.format} ({self.status})"
@@ -0,0 +1,169 @@
+#core/outbox.py
+import logging
+import traceback
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from core.models import OutboxDelivery, OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+_handlers = defaultdict(list)
+
+
+# ------------------------------------------------
+# ✅ Publishing
+# ------------------------------------------------
+def publish(topic, payload):
+    """
+    Queues an event in the caller's transaction: it is delivered only if that
+    transaction commits, and the request never waits for the handlers.
+    """
+    return OutboxEvent.objects.create(topic=topic, payload=payload)
+
+
+# ------------------------------------------------
+# ✅ Handlers
+# ------------------------------------------------
+def handles(*topics):
+    """
+    Registers a handler: `fn(event)`, called with the OutboxEvent inside the
+    worker's transaction, in a savepoint of its own. Apps declare handlers in
+    `<app>/handlers.py`. Delivery is at-least-once and unordered across
+    workers; a handler that succeeded is not called again for the event.
+    """
+    def register(fn):
+        for topic in topics:
+            _handlers[topic].append(fn)
+        return fn
+    return register
+
+
+def autodiscover():
+    autodiscover_modules('handlers')
+
+
+def handlers_for(topic):
+    return list(_handlers.get(topic, ()))
+
+
+def handler_name(fn):
+    """Key of the handler's OutboxDelivery rows."""
+    return f"{fn.__module__}.{fn.__qualname__}"
+
+
+# ------------------------------------------------
+# ✅ Delivery
+# ------------------------------------------------
+def _retry_delay(attempts):
+    base = getattr(settings, 'OUTBOX_RETRY_BASE_SECONDS', 5)
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), 3600))
+
+
+def _deliver(event, deliveries, max_attempts):
+    """
+    Runs each handler of `event` that has not succeeded yet in its own
+    savepoint, so one failing handler neither rolls back nor repeats the
+    others. Returns the OutboxDelivery rows it created or changed.
+    """
+    touched = []
+    for handler in handlers_for(event.topic):
+        name = handler_name(handler)
+        delivery = deliveries.get((event.pk, name))
+        if delivery is None:
+            delivery = OutboxDelivery(event=event, handler=name)
+        elif delivery.status != 'pending':
+            continue
+        try:
+            with transaction.atomic():
+                handler(event)
+        except Exception:
+            delivery.attempts += 1
+            delivery.last_error = traceback.format_exc(limit=5)
+            if delivery.attempts >= max_attempts:
+                delivery.status = 'dead'
+                logger.error("Outbox handler %s dead-lettered for event %s after %s attempts",
+                             name, event.pk, delivery.attempts)
+            else:
+                logger.warning("Outbox handler %s failed for event %s, attempt %s", name, event.pk, delivery.attempts)
+        else:
+            delivery.status = 'done'
+            delivery.processed_at = timezone.now()
+            delivery.last_error = ''
+        delivery.updated_at = timezone.now()
+        deliveries[(event.pk, name)] = delivery
+        touched.append(delivery)
+    return touched
+
+
+def process_batch(batch_size=None):
+    """
+    Claims up to `batch_size` due events with FOR UPDATE SKIP LOCKED (parallel
+    workers never get the same rows) and dispatches them. Every handler has
+    its own savepoint and OutboxDelivery row: a failing handler rolls back
+    only its own writes and is retried with backoff, dead-lettered after
+    OUTBOX_MAX_ATTEMPTS, while the handlers that succeeded stay done.
+    An event is done once all its handlers are, and dead once the only ones
+    left are dead. Returns {'done': n, 'retry': n, 'dead': n} per event.
+    """
+    batch_size = batch_size or getattr(settings, 'OUTBOX_BATCH_SIZE', 100)
+    max_attempts = getattr(settings, 'OUTBOX_MAX_ATTEMPTS', 8)
+    counts = {'done': 0, 'retry': 0, 'dead': 0}
+
+    with transaction.atomic():
+        events = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True)
+            .filter(status='pending', available_at__lte=timezone.now())
+            .order_by('available_at')[:batch_size]
+        )
+        deliveries = {
+            (d.event_id, d.handler): d
+            for d in OutboxDelivery.objects.filter(event__in=[e.pk for e in events])
+        }
+        touched = []
+        for event in events:
+            touched.extend(_deliver(event, deliveries, max_attempts))
+            own = [d for (event_id, _), d in deliveries.items() if event_id == event.pk]
+            failed = [d for d in own if d.status == 'pending' and d.last_error]
+            dead = [d for d in own if d.status == 'dead']
+            if failed:
+                event.attempts += 1
+                event.available_at = timezone.now() + _retry_delay(max(d.attempts for d in failed))
+                counts['retry'] += 1
+            elif dead:
+                event.status = 'dead'
+                counts['dead'] += 1
+            else:
+                event.status = 'done'
+                event.processed_at = timezone.now()
+                counts['done'] += 1
+            event.last_error = '\n'.join(f"{d.handler}: {d.last_error}" for d in failed + dead)
+            event.updated_at = timezone.now()
+
+        OutboxDelivery.objects.bulk_create([d for d in touched if d._state.adding])
+        OutboxDelivery.objects.bulk_update(
+            [d for d in touched if not d._state.adding],
+            ['status', 'attempts', 'processed_at', 'last_error', 'updated_at'])
+        OutboxEvent.objects.bulk_update(
+            events, ['status', 'attempts', 'available_at', 'processed_at', 'last_error', 'updated_at'])
+    return counts
+
+
+def requeue_dead(topic=None):
+    """
+    Puts dead-lettered events back in the queue (after the handler is fixed);
+    only their dead handlers run again.
+    """
+    dead = OutboxEvent.objects.filter(status='dead')
+    deliveries = OutboxDelivery.objects.filter(status='dead')
+    if topic:
+        dead = dead.filter(topic=topic)
+        deliveries = deliveries.filter(event__topic=topic)
+    with transaction.atomic():
+        deliveries.update(status='pending', attempts=0, last_error='', updated_at=timezone.now())
+        return dead.update(status='pending', attempts=0, available_at=timezone.now(), updated_at=timezone.now())
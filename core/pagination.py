@@ -0,0 +1,128 @@
+#core/pagination.py
+import base64
+import uuid
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param, remove_query_param
+
+from core.models import Base
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset ("seek") pagination on (created_at, id), newest first.
+
+    The cursor is the (created_at, id) of the last row sent, and the next page
+    is `created_at <= c AND (created_at < c OR id < i)` read from the
+    (created_at, id) index that core.models adds to every Base table. Page
+    1000 costs the same as page 1; OFFSET has to walk and discard every
+    earlier row.
+
+    The project default (DEFAULT_PAGINATION_CLASS); the page order replaces
+    any ordering on the view's queryset. A view is left unpaginated when its
+    model is not a Base model, its values() rows leave out created_at or id,
+    or it sets `keyset_pagination = False` (e.g. to keep its own ordering).
+    """
+    page_size = api_settings.PAGE_SIZE or 50
+    max_page_size = 200
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    @staticmethod
+    def applies(queryset, view=None):
+        if not getattr(view, 'keyset_pagination', True) or not issubclass(queryset.model, Base):
+            return False
+        fields = getattr(queryset, '_fields', None)  # set by .values(...) (core.readers)
+        return not fields or {'created_at', 'id'} <= set(fields)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.applies(queryset, view):
+            return None
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        direction, position = self.decode_cursor(request)
+        self.direction = direction
+
+        if position is not None:
+            created_at, pk = position
+            if direction == 'next':
+                queryset = queryset.filter(Q(created_at__lt=created_at) | Q(id__lt=pk), created_at__lte=created_at)
+            else:
+                queryset = queryset.filter(Q(created_at__gt=created_at) | Q(id__gt=pk), created_at__gte=created_at)
+        ordering = ('-created_at', '-id') if direction == 'next' else ('created_at', 'id')
+
+        rows = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if direction == 'previous':
+            rows.reverse()
+
+        self.has_next = has_more if direction == 'next' else position is not None
+        self.has_previous = position is not None if direction == 'next' else has_more
+        self.first, self.last = (rows[0], rows[-1]) if rows else (None, None)
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    # ---- cursor encoding ----
+    def encode_cursor(self, direction, row):
+        # model instances, or .values() rows (core.readers)
+        created_at, pk = (row['created_at'], row['id']) if isinstance(row, dict) else (row.created_at, row.pk)
+        raw = f"{direction[0]}|{created_at.isoformat()}|{pk}"
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return 'next', None
+        try:
+            raw = base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)).decode()
+            direction, created_at, pk = raw.split('|')
+            return {'n': 'next', 'p': 'previous'}[direction], (datetime.fromisoformat(created_at), uuid.UUID(pk))
+        except (ValueError, KeyError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _link(self, direction, row):
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(direction, row))
+
+    def get_next_link(self):
+        if not self.has_next or self.last is None:
+            return None
+        return self._link('next', self.last)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.first is None:
+            return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+        return self._link('previous', self.first)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
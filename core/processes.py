@@ -0,0 +1,33 @@
+#core/processes.py
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+
+
+def _init_django_process(settings_module, warmup=None):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    django.setup()
+    if warmup is not None:
+        from django.utils.module_loading import import_string
+
+        import_string(warmup)()
+
+
+def django_process_pool(workers, warmup=None):
+    """
+    ProcessPoolExecutor whose workers run django.setup() first. Spawned (not
+    forked) processes, so they never inherit the parent's DB connections;
+    each worker opens its own on first query.
+
+    `warmup`: dotted path of a function each worker runs once after setup
+    (e.g. compiling templates) instead of on its first task. A path, not the
+    function, because unpickling it would import app modules before setup.
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_django_process,
+        initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", "business_core.settings"), warmup),
+    )
@@ -0,0 +1,201 @@
+#core/readers.py
+"""
+Read-only schemas compiled to plain functions over `.values()` rows.
+
+For hot list/detail GETs where ModelSerializer's per-field, per-instance work
+and nested N+1 queries dominate:
+
+    class PhoneNumberRead(Schema):
+        model = PhoneNumber
+        fields = ('id', 'number', 'type')
+
+    class UserRead(Schema):
+        model = User
+        fields = ('id', 'username', 'email', 'created_at')
+        city_name = Field('city')                         # renamed column
+        phone_numbers = Nested(PhoneNumberRead, many=True)  # one extra query per page
+
+    UserRead.dump(User.objects.filter(is_active=True))   # -> [dict, ...]
+
+Values are left as Python objects (UUID, datetime, Decimal); the orjson
+renderer encodes them with the same output as the DRF fields.
+"""
+from collections import defaultdict
+
+from django.http import Http404
+from rest_framework.response import Response
+
+
+class Field:
+    """A column (`source` may span relations, e.g. 'location__code'), optionally transformed."""
+
+    def __init__(self, source=None, transform=None):
+        self.source = source
+        self.transform = transform
+
+
+class Nested:
+    """
+    A related schema: reverse FK / M2M (`many=True`) or forward FK. Loaded with
+    one `__in` query per page of parent rows, like prefetch_related.
+    """
+
+    def __init__(self, schema, many=False, source=None):
+        self.schema = schema
+        self.many = many
+        self.source = source
+
+
+class SchemaMeta(type):
+    def __new__(mcs, name, bases, attrs):
+        cls = super().__new__(mcs, name, bases, attrs)
+        if attrs.get('model') is None and not any(getattr(b, 'model', None) for b in bases):
+            return cls  # the base Schema
+        cls._compile()
+        return cls
+
+
+class Schema(metaclass=SchemaMeta):
+    model = None
+    fields = ()
+    ordering = None  # applied to nested querysets
+
+    @classmethod
+    def _compile(cls):
+        declared = {}
+        for klass in reversed(cls.__mro__):
+            for key, value in vars(klass).items():
+                if isinstance(value, (Field, Nested)):
+                    declared[key] = value
+
+        columns, outputs, transforms, nested = [], [], {}, {}
+        for name in cls.fields:
+            if name not in declared:
+                columns.append(name)
+                outputs.append((name, name, None))
+        for name, spec in declared.items():
+            if isinstance(spec, Field):
+                source = spec.source or name
+                columns.append(source)
+                outputs.append((name, source, spec.transform))
+            else:
+                nested[name] = cls._resolve_nested(name, spec)
+                if nested[name]['parent_key'] not in columns:
+                    columns.append(nested[name]['parent_key'])
+                outputs.append((name, f'__nested_{name}', None))
+
+        if 'id' not in columns:
+            columns.append('id')
+
+        # one generated function per schema: a dict literal over the row, no per-field dispatch
+        lines = ['def convert(row):', '    return {']
+        for name, source, transform in outputs:
+            if transform is not None:
+                transforms[f'_t_{name}'] = transform
+                lines.append(f'        {name!r}: _t_{name}(row[{source!r}]),')
+            else:
+                lines.append(f'        {name!r}: row[{source!r}],')
+        lines.append('    }')
+        namespace = dict(transforms)
+        exec('\n'.join(lines), namespace)
+
+        cls._columns = tuple(dict.fromkeys(columns))
+        cls._nested = nested
+        cls._convert = staticmethod(namespace['convert'])
+
+    @classmethod
+    def _resolve_nested(cls, name, spec):
+        field = cls.model._meta.get_field(spec.source or name)
+        if field.many_to_many:
+            # children filtered by their lookup back to us, for either side of the M2M
+            lookup = field.related_query_name() if field.concrete else field.field.name
+            return {'kind': 'm2m', 'parent_key': 'id', 'lookup': lookup, 'many': True}
+        if field.one_to_many or (field.one_to_one and not field.concrete):
+            # reverse FK: children point at us
+            return {'kind': 'reverse', 'parent_key': 'id', 'lookup': field.field.name,
+                    'child_key': field.field.attname, 'many': spec.many}
+        # forward FK / one-to-one: we point at the child
+        return {'kind': 'forward', 'parent_key': field.attname, 'many': False}
+
+    # ---- loading ----
+    @classmethod
+    def values(cls, queryset):
+        return queryset.values(*cls._columns)
+
+    @classmethod
+    def _attach(cls, rows):
+        for name, spec in cls._nested.items():
+            schema = getattr(cls, name).schema
+            keys = {row[spec['parent_key']] for row in rows if row[spec['parent_key']] is not None}
+            key = f'__nested_{name}'
+            if spec['kind'] == 'forward':
+                children = {}
+                if keys:
+                    for child in schema.load(schema.model.objects.filter(pk__in=keys), extra=('pk',)):
+                        children[child.pop('pk')] = child
+                for row in rows:
+                    row[key] = children.get(row[spec['parent_key']])
+                continue
+
+            grouped = defaultdict(list)
+            if keys:
+                related = schema.model.objects.filter(**{f"{spec['lookup']}__in": keys})
+                if schema.ordering:
+                    related = related.order_by(*schema.ordering)
+                marker = f"{spec['lookup']}__id" if spec['kind'] == 'm2m' else spec['child_key']
+                for child in schema.load(related, extra=(marker,)):
+                    grouped[child.pop(marker)].append(child)
+            for row in rows:
+                found = grouped.get(row[spec['parent_key']], [])
+                row[key] = found if spec['many'] else (found[0] if found else None)
+        return rows
+
+    @classmethod
+    def load(cls, queryset, extra=()):
+        rows = list(queryset.values(*cls._columns, *extra))
+        cls._attach(rows)
+        return [dict(cls._convert(row), **{k: row[k] for k in extra}) for row in rows]
+
+    @classmethod
+    def dump_rows(cls, rows):
+        """Converts rows already fetched with `values()` (e.g. a paginated page)."""
+        rows = list(rows)
+        cls._attach(rows)
+        return [cls._convert(row) for row in rows]
+
+    @classmethod
+    def dump(cls, queryset):
+        return cls.dump_rows(cls.values(queryset))
+
+    @classmethod
+    def dump_one(cls, queryset):
+        """The single matching row, or None."""
+        rows = cls.dump_rows(cls.values(queryset)[:1])
+        return rows[0] if rows else None
+
+
+# ------------------------------------------------
+# 🔹 Drop-in for DRF generic views' read paths
+# ------------------------------------------------
+class SchemaReadMixin:
+    """
+    Replaces list()/retrieve() of a generics view with `read_schema`; writes
+    still go through `serializer_class`. Pagination (KeysetPagination) works
+    on the values() rows.
+    """
+    read_schema = None
+
+    def list(self, request, *args, **kwargs):
+        rows = self.read_schema.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(self.read_schema.dump_rows(page))
+        return Response(self.read_schema.dump_rows(rows))
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+        data = self.read_schema.dump_one(queryset)
+        if data is None:
+            raise Http404
+        return Response(data)
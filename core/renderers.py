@@ -0,0 +1,45 @@
+#core/renderers.py
+import datetime
+import decimal
+
+import orjson
+from django.utils.functional import Promise
+from rest_framework.renderers import BaseRenderer
+
+# UTC datetimes as "...Z" like DRF; non-str dict keys (UUID ids) allowed
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def orjson_default(obj):
+    """Types orjson does not encode itself, handled the way DRF's JSONEncoder does."""
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if isinstance(obj, Promise):  # gettext_lazy messages
+        return str(obj)
+    if isinstance(obj, datetime.timedelta):
+        return str(obj.total_seconds())
+    if isinstance(obj, bytes):
+        return obj.decode()
+    if hasattr(obj, '__iter__'):  # sets, generators, querysets
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    JSON via orjson: UUIDs, datetimes/dates/times and dict/list subclasses
+    (ReturnDict/ReturnList) are encoded natively in C, Decimals and lazy
+    strings through `orjson_default`. Output is compact; an `indent`
+    Accept parameter gives 2-space indentation.
+    """
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        options = ORJSON_OPTIONS
+        if accepted_media_type and 'indent=' in accepted_media_type:
+            options |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=orjson_default, option=options)
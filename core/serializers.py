@@ -0,0 +1,23 @@
+#core/serializers.py
+from django.urls import reverse
+from rest_framework import serializers
+from core.models import ExportJob
+
+
+# ------------------------------------------------
+# ✅ Export Job Serializer
+# ------------------------------------------------
+class ExportJobSerializer(serializers.ModelSerializer):
+    # the file itself has no public URL; admins download it through ExportJobFileView
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = ['id', 'export', 'format', 'params', 'status', 'download_url', 'error',
+                  'started_at', 'finished_at', 'created_at']
+        read_only_fields = fields
+
+    def get_download_url(self, job):
+        if job.status != 'done' or not job.file:
+            return None
+        return reverse('export-job-file', args=[job.pk])
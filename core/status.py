@@ -2,6 +2,7 @@ from rest_framework import status as S
 
 S200 = S.HTTP_200_OK
 S201 = S.HTTP_201_CREATED
+S202 = S.HTTP_202_ACCEPTED
 S304 = S.HTTP_304_NOT_MODIFIED
 S400 = S.HTTP_400_BAD_REQUEST
 S401 = S.HTTP_401_UNAUTHORIZED
@@ -11,4 +12,5 @@ S404 = S.HTTP_404_NOT_FOUND
 S405 = S.HTTP_405_METHOD_NOT_ALLOWED
 S406 = S.HTTP_406_NOT_ACCEPTABLE
 S408 = S.HTTP_408_REQUEST_TIMEOUT
+S409 = S.HTTP_409_CONFLICT
 S500 = S.HTTP_500_INTERNAL_SERVER_ERROR
\ No newline at end of file
@@ -0,0 +1,68 @@
+import hashlib
+import os
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.functional import cached_property
+
+
+def file_sha256(content):
+    """SHA-256 of a Django File, reusing the digest computed at upload time if present."""
+    digest = getattr(content, 'content_sha256', None)
+    if digest:
+        return digest
+    hasher = hashlib.sha256()
+    for chunk in content.chunks():  # File.chunks() rewinds first
+        hasher.update(chunk)
+    content.seek(0)
+    return hasher.hexdigest()
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Stores each file under `<upload_to>/<sha[:2]>/<sha><ext>`.
+    Identical content maps to the same name, so a duplicate upload is
+    never written twice; callers must check for other references before
+    deleting a file.
+    """
+
+    def _save(self, name, content):
+        directory, filename = os.path.split(name)
+        digest = file_sha256(content)
+        ext = os.path.splitext(filename)[1].lower()
+        name = os.path.join(directory, digest[:2], f"{digest}{ext}")
+        if self.exists(name):
+            return name
+        return super()._save(name, content)
+
+    def save_exact(self, name, content):
+        """Writes under the given name (for derived files such as image variants)."""
+        return super()._save(name, content)
+
+
+def content_addressed_storage():
+    return ContentAddressedStorage()
+
+
+class PrivateExportStorage(FileSystemStorage):
+    """
+    EXPORTS_ROOT, outside MEDIA_ROOT and without a URL: export files are
+    only reachable through the admin-only ExportJobFileView.
+    """
+
+    @cached_property
+    def base_location(self):
+        return self._value_or_setting(self._location, settings.EXPORTS_ROOT)
+
+    def _clear_cached_properties(self, setting, **kwargs):
+        super()._clear_cached_properties(setting, **kwargs)
+        if setting == 'EXPORTS_ROOT':
+            self.__dict__.pop('base_location', None)
+            self.__dict__.pop('location', None)
+
+    def url(self, name):
+        raise ValueError("Export files are not served from a public URL.")
+
+
+def export_storage():
+    return PrivateExportStorage()
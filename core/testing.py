@@ -0,0 +1,43 @@
+#core/testing.py
+"""
+Query-count assertions for endpoint tests, so N+1 regressions fail CI.
+
+    class UserEndpointTests(QueryCountMixin, APITestCase):
+        def test_list(self):
+            self.assertMaxQueries(3, 'get', '/users/')
+            self.assertConstantQueries('get', '/users/', grow=lambda n: make_users(n))
+"""
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryCountMixin:
+    """For TestCase/APITestCase; uses `self.client` unless `client=` is passed."""
+
+    def _request(self, method, path, client=None, **kwargs):
+        client = client or self.client
+        with CaptureQueriesContext(connection) as captured:
+            response = getattr(client, method.lower())(path, **kwargs)
+        return response, captured
+
+    def assertMaxQueries(self, maximum, method, path, client=None, **kwargs):
+        """Fails when the request runs more than `maximum` queries; returns the response."""
+        response, captured = self._request(method, path, client, **kwargs)
+        if len(captured) > maximum:
+            queries = '\n'.join(f"{i}. {q['sql']}" for i, q in enumerate(captured.captured_queries, 1))
+            self.fail(f"{method.upper()} {path} ran {len(captured)} queries (max {maximum}):\n{queries}")
+        return response
+
+    def assertConstantQueries(self, method, path, grow, sizes=(1, 10), client=None, **kwargs):
+        """
+        Calls `grow(n)` to add n more rows before each request and fails if the
+        query count changes with the data size: the N+1 signature.
+        """
+        counts = []
+        for size in sizes:
+            grow(size)
+            _, captured = self._request(method, path, client, **kwargs)
+            counts.append(len(captured))
+        if len(set(counts)) != 1:
+            self.fail(f"{method.upper()} {path} query count grows with data: "
+                      f"{dict(zip(sizes, counts))} (likely N+1)")
@@ -1,3 +1,360 @@
-from django.test import TestCase
+import csv
+import datetime as dt
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from core import exports, outbox
+from core.ids import uuid7, uuid7_timestamp
+from core.models import ExportJob, OutboxDelivery, OutboxEvent
+from core.pagination import KeysetPagination
+from core.parsers import ORJSONParser
+from core.renderers import ORJSONRenderer
+from inventory.models import Product
+from users.models import User
+
+
+# ------------------------------------------------
+# 🔹 Base dirty tracking
+# ------------------------------------------------
+class DirtyTrackingTests(TestCase):
+    def setUp(self):
+        created = OutboxEvent.objects.create(topic="test.topic", payload={"x": 0, "items": [1]})
+        self.event = OutboxEvent.objects.get(pk=created.pk)
+
+    def saved_sql(self):
+        with CaptureQueriesContext(connection) as captured:
+            self.event.save()
+        return captured.captured_queries[-1]["sql"]
+
+    def test_loaded_instance_is_clean(self):
+        self.assertTrue(self.event.is_tracked)
+        self.assertEqual(self.event.get_dirty_fields(), {})
+        sql = self.saved_sql()
+        self.assertIn('"updated_at"', sql)
+        self.assertNotIn('"payload"', sql)
+        self.assertNotIn('"topic"', sql)
+
+    def test_assigned_field_saved_alone(self):
+        self.event.status = "done"
+        self.assertEqual(self.event.get_dirty_fields(), {"status": "pending"})
+        sql = self.saved_sql()
+        self.assertIn('"status"', sql)
+        self.assertNotIn('"payload"', sql)
+        self.assertEqual(OutboxEvent.objects.get(pk=self.event.pk).status, "done")
+        self.assertEqual(self.event.get_dirty_fields(), {})
+
+    def test_json_mutated_in_place_is_dirty(self):
+        self.event.payload["x"] = 1
+        self.event.payload["items"].append(2)
+        self.assertEqual(self.event.get_dirty_fields(), {"payload": {"x": 0, "items": [1]}})
+        self.event.save()
+        self.assertEqual(OutboxEvent.objects.get(pk=self.event.pk).payload, {"x": 1, "items": [1, 2]})
+
+        # the snapshot taken by save() is a copy too
+        self.event.payload["x"] = 2
+        self.assertTrue(self.event.has_changed("payload"))
+        self.event.save()
+        self.assertEqual(OutboxEvent.objects.get(pk=self.event.pk).payload["x"], 2)
+
+    def test_explicit_update_fields_respected(self):
+        self.event.status = "done"
+        self.event.topic = "other"
+        self.event.save(update_fields=["status", "updated_at"])
+        row = OutboxEvent.objects.get(pk=self.event.pk)
+        self.assertEqual((row.status, row.topic), ("done", "test.topic"))
+        self.assertEqual(self.event.get_dirty_fields(), {"topic": "test.topic"})
+
+    def test_deferred_field_assigned_is_saved(self):
+        event = OutboxEvent.objects.only("topic").get(pk=self.event.pk)
+        event.status = "dead"
+        event.save()
+        self.assertEqual(OutboxEvent.objects.get(pk=self.event.pk).status, "dead")
+
+    def test_new_instance_saves_every_field(self):
+        event = OutboxEvent(topic="new", payload={"a": 1})
+        self.assertFalse(event.is_tracked)
+        event.save()
+        self.assertEqual(OutboxEvent.objects.get(pk=event.pk).payload, {"a": 1})
+
+
+# ------------------------------------------------
+# 🔹 UUIDv7 primary keys
+# ------------------------------------------------
+class UUID7Tests(TestCase):
+    def test_version_variant_and_timestamp(self):
+        before = time.time_ns() // 1_000_000
+        value = uuid7()
+        self.assertEqual(value.version, 7)
+        self.assertEqual(value.variant, "specified in RFC 4122")
+        self.assertGreaterEqual(uuid7_timestamp(value), before)
+        self.assertEqual(uuid7_timestamp(uuid7(1_700_000_000_000)), 1_700_000_000_000)
+
+    def test_monotonic_within_process(self):
+        values = [uuid7() for _ in range(10_000)]
+        self.assertEqual(values, sorted(values))
+        self.assertEqual(len(set(values)), len(values))
+
+    def test_base_rows_get_uuid7_ids(self):
+        first = OutboxEvent.objects.create(topic="a")
+        second = OutboxEvent.objects.create(topic="b")
+        self.assertEqual(first.id.version, 7)
+        self.assertLess(first.id, second.id)
+
+
+# ------------------------------------------------
+# 🔹 Outbox delivery
+# ------------------------------------------------
+class OutboxTests(TestCase):
+    def setUp(self):
+        self.calls = []
+        self.failing = True
+        patcher = mock.patch.dict(outbox._handlers, {"test.topic": [self.writes_row, self.flaky]}, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def writes_row(self, event):
+        self.calls.append("writes_row")
+        OutboxEvent.objects.create(topic="test.side_effect", payload={"from": str(event.pk)})
+
+    def flaky(self, event):
+        self.calls.append("flaky")
+        OutboxEvent.objects.create(topic="test.rolled_back")
+        if self.failing:
+            raise RuntimeError("boom")
+
+    def make_due(self):
+        OutboxEvent.objects.update(available_at=timezone.now())
+
+    def test_failing_handler_does_not_roll_back_or_repeat_others(self):
+        event = outbox.publish("test.topic", {})
+        with self.assertLogs("core.outbox", "WARNING"):
+            self.assertEqual(outbox.process_batch(), {"done": 0, "retry": 1, "dead": 0})
+        self.assertTrue(OutboxEvent.objects.filter(topic="test.side_effect").exists())
+        self.assertFalse(OutboxEvent.objects.filter(topic="test.rolled_back").exists())
+        event.refresh_from_db()
+        self.assertEqual((event.status, event.attempts), ("pending", 1))
+        self.assertIn("boom", event.last_error)
+        self.assertGreater(event.available_at, timezone.now())
+
+        self.failing = False
+        self.make_due()
+        self.calls.clear()
+        outbox.process_batch()
+        self.assertEqual(self.calls, ["flaky"])
+        self.assertEqual(OutboxEvent.objects.filter(topic="test.side_effect").count(), 1)
+        self.assertEqual(set(OutboxDelivery.objects.values_list("status", flat=True)), {"done"})
+        event.refresh_from_db()
+        self.assertEqual(event.status, "done")
+
+    @override_settings(OUTBOX_MAX_ATTEMPTS=2)
+    def test_dead_letter_and_requeue_only_failed_handler(self):
+        event = outbox.publish("test.topic", {})
+        with self.assertLogs("core.outbox", "WARNING"):
+            outbox.process_batch()
+            self.make_due()
+            self.assertEqual(outbox.process_batch()["dead"], 1)
+        dead = OutboxDelivery.objects.get(status="dead")
+        self.assertTrue(dead.handler.endswith("flaky"))
+
+        self.failing = False
+        self.assertEqual(outbox.requeue_dead(), 1)
+        self.calls.clear()
+        outbox.process_batch()
+        self.assertEqual(self.calls, ["flaky"])
+        event.refresh_from_db()
+        self.assertEqual(event.status, "done")
+
+    def test_event_without_handlers_is_done(self):
+        outbox.publish("test.nobody_listens", {})
+        self.assertEqual(outbox.process_batch(), {"done": 1, "retry": 0, "dead": 0})
+
+
+# ------------------------------------------------
+# 🔹 Streaming exports
+# ------------------------------------------------
+class ExportTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", password="Passw0rd!", email="admin@gmail.com", is_staff=True)
+        User.objects.create_user(username="eve", password="Passw0rd!", email="eve@gmail.com",
+                                 first_name='=HYPERLINK("http://evil.example")', last_name="-2+3")
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def download(self, query=""):
+        response = self.client.get(f"/exports/users?filetype=csv{query}")
+        self.assertEqual(response.status_code, 200)
+        return list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+
+    def test_csv_streamed_with_formulas_neutralised(self):
+        rows = self.download()
+        self.assertEqual(rows[0][:3], ["ID", "Username", "Email"])
+        eve = next(row for row in rows if row[1] == "eve")
+        self.assertEqual(eve[3:5], ['\'=HYPERLINK("http://evil.example")', "'-2+3"])
+        self.assertEqual(exports._xlsx_value("@SUM(A1)"), "'@SUM(A1)")
+        self.assertEqual(exports._xlsx_value(-2), -2)
+
+    def test_filters_applied_and_validated_before_streaming(self):
+        self.assertEqual(len(self.download("&from=2999-01-01T00:00:00Z")), 1)
+        for query in ("&from=yesterday", "&to=2025-13-01", "&from=yesterday&async=1"):
+            response = self.client.get(f"/exports/users?filetype=csv{query}")
+            self.assertEqual(response.status_code, 400, query)
+            self.assertIn("Invalid filter", response.json()["error"])
+        self.assertFalse(ExportJob.objects.exists())
+
+    def test_job_for_unknown_export_fails(self):
+        job = ExportJob.objects.create(export="removed", format="csv")
+        with self.assertLogs("core.exports", "ERROR"):
+            exports.run_job(job.pk)
+        job.refresh_from_db()
+        self.assertEqual(job.status, "failed")
+        self.assertIn("Unknown export", job.error)
+
+    def test_job_written_to_private_storage_and_served_to_admins(self):
+        media_root, exports_root = tempfile.mkdtemp(), tempfile.mkdtemp()
+        for root in (media_root, exports_root):
+            self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        with override_settings(MEDIA_ROOT=media_root, EXPORTS_ROOT=exports_root), \
+                mock.patch.object(exports._executor, "submit") as submit:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.get("/exports/users?filetype=csv.gz&async=1")
+            self.assertEqual(response.status_code, 202)
+            job_url = f"/exports/jobs/{response.json()['data']['id']}"
+            self.assertIsNone(self.client.get(job_url).json()["data"]["download_url"])
+            self.assertEqual(self.client.get(f"{job_url}/file").status_code, 404)
+            exports.run_job(*submit.call_args.args[1:])
+
+            job = ExportJob.objects.get()
+            self.assertEqual(job.status, "done")
+            self.assertTrue(job.file.path.startswith(exports_root))
+            self.assertRegex(job.file.name, r"^[0-9a-f]{32}/users-\d{8}-\d{6}\.csv\.gz$")
+            self.assertEqual(os.listdir(media_root), [])
+
+            download_url = self.client.get(job_url).json()["data"]["download_url"]
+            self.assertEqual(download_url, f"{job_url}/file")
+            response = self.client.get(download_url)
+            self.assertEqual(response.status_code, 200)
+            rows = gzip.decompress(b"".join(response.streaming_content)).decode().splitlines()
+            self.assertEqual(rows[0].split(",")[:2], ["ID", "Username"])
+
+            clerk = APIClient()
+            clerk.force_authenticate(User.objects.create_user(username="clerk", password="Passw0rd!", email="clerk@gmail.com"))
+            self.assertEqual(clerk.get(download_url).status_code, 403)
+
+
+# ------------------------------------------------
+# 🔹 Keyset pagination
+# ------------------------------------------------
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        created_at = timezone.now()
+        # two rows share a created_at, so the id tie-break decides their order
+        self.products = [Product.objects.create(sku=f"P{i}", name=f"P{i}") for i in range(5)]
+        Product.objects.filter(sku__in=["P2", "P3"]).update(created_at=created_at)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username="bob", password="Passw0rd!", email="bob@gmail.com"))
+
+    def page(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_walk_forward_and_back(self):
+        expected = [row["sku"] for row in Product.objects.order_by("-created_at", "-id").values("sku")]
+        seen, url, pages = [], "/inventory/products?page_size=2", []
+        while url:
+            page = self.page(url)
+            pages.append(page)
+            seen += [row["sku"] for row in page["results"]]
+            url = page["next"]
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(pages), 3)
+        self.assertIsNone(pages[0]["previous"])
+        back = self.page(pages[2]["previous"])
+        self.assertEqual([row["sku"] for row in back["results"]], expected[2:4])
+
+    def test_bad_cursor_is_404(self):
+        self.assertEqual(self.client.get("/inventory/products?cursor=garbage").status_code, 404)
+
+    def test_default_skips_querysets_it_cannot_page(self):
+        request = Request(APIRequestFactory().get("/"))
+        paginate = KeysetPagination().paginate_queryset
+        self.assertIsNone(paginate(ContentType.objects.all(), request))
+        self.assertIsNone(paginate(Product.objects.values("sku", "name"), request))
+        self.assertIsNone(paginate(Product.objects.all(), request, view=mock.Mock(keyset_pagination=False)))
+        self.assertEqual(len(paginate(Product.objects.values("id", "sku", "created_at"), request)), 5)
+
+
+# ------------------------------------------------
+# 🔹 orjson renderer and parser
+# ------------------------------------------------
+class ORJSONTests(TestCase):
+    def test_matches_drf_json_renderer(self):
+        data = {
+            "id": uuid.uuid4(), "at": dt.datetime(2025, 1, 2, 3, 4, 5, 600000, tzinfo=dt.timezone.utc),
+            "day": dt.date(2025, 1, 2), "message": gettext_lazy("Not found."),
+            "took": dt.timedelta(seconds=90), "tags": {"a"}, "nested": [{"n": None, "ok": True}],
+        }
+        self.assertEqual(json.loads(ORJSONRenderer().render(data)), json.loads(JSONRenderer().render(data)))
+        # Decimals stay exact strings, as DRF's DecimalField renders them
+        self.assertEqual(json.loads(ORJSONRenderer().render({"price": Decimal("9.90")})), {"price": "9.90"})
+        self.assertEqual(ORJSONRenderer().render(None), b"")
+        self.assertIn(b"\n  ", ORJSONRenderer().render({"a": 1}, "application/json; indent=2"))
+
+    def test_parser_round_trip_and_errors(self):
+        self.assertEqual(ORJSONParser().parse(io.BytesIO('{"name": "Café", "n": 1.5}'.encode())), {"name": "Café", "n": 1.5})
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b"{bad"))
+
+    def test_endpoint_speaks_orjson(self):
+        response = APIClient().post("/users/register", "{bad", content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("JSON parse error", response.json()["detail"])
+        self.assertEqual(response["Content-Type"], "application/json")
+
+
+# ------------------------------------------------
+# 🔹 /metrics access
+# ------------------------------------------------
+@override_settings(INSTRUMENTATION_ENABLED=True, INSTRUMENTATION_METRICS_TOKEN="", INSTRUMENTATION_METRICS_ALLOWED=["127.0.0.1"])
+class MetricsAccessTests(TestCase):
+    def test_direct_loopback_request_allowed(self):
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        self.assertEqual(self.client.get("/metrics", REMOTE_ADDR="10.0.0.9").status_code, 404)
+
+    def test_proxied_request_refused(self):
+        # nginx on the same host: REMOTE_ADDR is loopback, the client is elsewhere
+        self.assertEqual(self.client.get("/metrics", HTTP_X_FORWARDED_FOR="203.0.113.7").status_code, 404)
+        self.assertEqual(self.client.get("/metrics", HTTP_X_REAL_IP="203.0.113.7").status_code, 404)
+
+    @override_settings(INSTRUMENTATION_METRICS_TOKEN="s3cret")
+    def test_token_required_when_configured(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 404)
+        self.assertEqual(self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong").status_code, 404)
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer s3cret", HTTP_X_FORWARDED_FOR="203.0.113.7")
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(INSTRUMENTATION_ENABLED=False)
+    def test_disabled(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 404)
@@ -0,0 +1,11 @@
+# core/urls.py
+from django.urls import path
+from .views import *
+from core.instrumentation import metrics_view
+
+urlpatterns = [
+    path('metrics', metrics_view, name='metrics'),
+    path('exports/jobs/<uuid:pk>', ExportJobView.as_view(), name='export-job'),
+    path('exports/jobs/<uuid:pk>/file', ExportJobFileView.as_view(), name='export-job-file'),
+    path('exports/<str:name>', ExportView.as_view(), name='export'),
+]
@@ -0,0 +1,69 @@
+#core/views.py
+import os
+
+from django.core.exceptions import ValidationError
+from django.http import FileResponse
+from django.shortcuts import get_object_or_404
+from rest_framework import generics
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from core.exports import FORMATS, get_export, start_job, streaming_response
+from core.models import ExportJob
+from core.serializers import ExportJobSerializer
+from core.status import *
+
+
+# ------------------------------------------------
+# ✅ Exports
+# ------------------------------------------------
+class ExportView(generics.GenericAPIView):
+    """
+    GET exports/<name>?filetype=csv|csv.gz|xlsx&from=...&to=...  streams the file
+    (not `format`, which DRF reserves for renderer selection).
+    Add &async=1 to get a job id instead; the file lands in private EXPORTS_ROOT
+    and is downloaded from exports/jobs/<id>/file.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, name, *args, **kwargs):
+        export = get_export(name)
+        if export is None:
+            return Response({"error": f"Unknown export '{name}'."}, status=S404)
+        fmt = request.query_params.get('filetype', 'csv')
+        if fmt not in FORMATS:
+            return Response({"error": f"filetype must be one of {', '.join(FORMATS)}."}, status=S400)
+        params = {key: request.query_params[key] for key in export.filters if request.query_params.get(key)}
+        try:
+            export.lookups(params)
+        except ValidationError as e:
+            return Response({"error": f"Invalid filter: {' '.join(e.messages)}"}, status=S400)
+
+        if request.query_params.get('async') in ('1', 'true'):
+            job = start_job(export, fmt, params, user=request.user)
+            return Response({"message": "Export queued.", "data": ExportJobSerializer(job).data}, status=S202)
+        return streaming_response(export, fmt, params)
+
+
+class ExportJobView(generics.RetrieveAPIView):
+    serializer_class = ExportJobSerializer
+    permission_classes = [IsAdminUser]
+    queryset = ExportJob.objects.all()
+
+    def retrieve(self, request, *args, **kwargs):
+        return Response({
+            "message": "Export job fetched successfully.",
+            "data": self.get_serializer(self.get_object()).data
+        }, status=S200)
+
+
+class ExportJobFileView(generics.GenericAPIView):
+    """The finished file of a background export; admins only, like the export itself."""
+    permission_classes = [IsAdminUser]
+    queryset = ExportJob.objects.all()
+
+    def get(self, request, pk, *args, **kwargs):
+        job = get_object_or_404(self.get_queryset(), pk=pk)
+        if job.status != 'done' or not job.file:
+            return Response({"error": "Export file is not ready."}, status=S404)
+        return FileResponse(job.file.open('rb'), as_attachment=True, filename=os.path.basename(job.file.name),
+                            content_type=FORMATS[job.format][0])
@@ -0,0 +1,31 @@
+#crm/handlers.py
+from datetime import datetime
+from decimal import Decimal
+
+from core.outbox import handles
+from crm.summaries import record_payment, record_purchase, record_ticket
+
+
+# ------------------------------------------------
+# 🔹 Outbox handlers (CustomerSummary)
+# ------------------------------------------------
+@handles('sales_order.fulfilled')
+def order_fulfilled(event):
+    payload = event.payload
+    if payload.get('customer_id'):
+        record_purchase(payload['customer_id'], Decimal(payload['total']), datetime.fromisoformat(payload['at']))
+
+
+@handles('customer_payment.received')
+def payment_received(event):
+    record_payment(event.payload['customer_id'], Decimal(event.payload['amount']))
+
+
+@handles('service_ticket.opened')
+def ticket_opened(event):
+    record_ticket(event.payload['customer_id'], 1)
+
+
+@handles('service_ticket.closed')
+def ticket_closed(event):
+    record_ticket(event.payload['customer_id'], -1)
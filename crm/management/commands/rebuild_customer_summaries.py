@@ -0,0 +1,38 @@
+import os
+from concurrent.futures import as_completed
+
+from django.core.management.base import BaseCommand
+
+from core.processes import django_process_pool
+from crm.models import Customer
+from crm.summaries import rebuild_customers
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes CustomerSummary from orders, payments and service tickets, "
+        "a chunk of customers per process task."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Customers per transaction")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+
+    def handle(self, *args, **options):
+        customer_ids = list(Customer.objects.order_by("id").values_list("id", flat=True))
+        size = options["chunk_size"]
+        chunks = [customer_ids[i:i + size] for i in range(0, len(customer_ids), size)]
+        if not chunks:
+            self.stdout.write(self.style.SUCCESS("No customers"))
+            return
+
+        total = 0
+        if options["workers"] <= 1:
+            for chunk in chunks:
+                total += rebuild_customers(chunk)
+        else:
+            with django_process_pool(min(options["workers"], len(chunks))) as pool:
+                futures = [pool.submit(rebuild_customers, chunk) for chunk in chunks]
+                for future in as_completed(futures):
+                    total += future.result()
+        self.stdout.write(self.style.SUCCESS(f"{len(chunks)} chunks processed, rebuilt {total} summaries"))
@@ -1,3 +1,78 @@
+#crm/models.py
+from django.conf import settings
 from django.db import models
+from core.models import Base
+from accounting.models import MONEY, default_currency
 
-# Create your models here.
+
+class Customer(Base):
+    TYPE_CHOICES = [
+        ('individual', 'Individual'),
+        ('corporate', 'Corporate'),
+    ]
+
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="customer")
+    name = models.CharField(max_length=255)
+    email = models.EmailField(blank=True, null=True)
+    phone = models.CharField(max_length=20, blank=True, null=True)
+    type = models.CharField(max_length=20, choices=TYPE_CHOICES, default='individual')
+    is_active = models.BooleanField(default=True)
+
+    class Meta:
+        db_table = 'customer'
+
+    def __str__(self):
+        return self.name
+
+
+class ServiceTicket(Base):
+    """Service / maintenance request raised for a customer."""
+    KIND_CHOICES = [
+        ('service', 'Service'),
+        ('maintenance', 'Maintenance'),
+        ('support', 'Support'),
+    ]
+    STATUS_CHOICES = [
+        ('open', 'Open'),
+        ('closed', 'Closed'),
+    ]
+
+    customer = models.ForeignKey(Customer, on_delete=models.PROTECT, related_name="tickets")
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default='service')
+    subject = models.CharField(max_length=255)
+    description = models.TextField(blank=True, default='')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='open')
+    closed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'service_ticket'
+        indexes = [
+            models.Index(fields=['customer', 'status'], name='service_ticket_customer_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} ({self.status})"
+
+
+class CustomerSummary(Base):
+    """
+    Denormalized customer 360 read model, one row per customer, in
+    DEFAULT_CURRENCY. Kept current by crm.handlers from outbox events;
+    `manage.py rebuild_customer_summaries` recomputes it from the source tables.
+
+    lifetime_value and last_purchase_at count fulfilled orders (when the
+    receivable is posted); outstanding_balance is lifetime_value minus payments.
+    """
+    customer = models.OneToOneField(Customer, on_delete=models.CASCADE, related_name="summary")
+    currency = models.CharField(max_length=3, default=default_currency)
+    lifetime_value = models.DecimalField(default=0, **MONEY)
+    orders_count = models.PositiveIntegerField(default=0)
+    last_purchase_at = models.DateTimeField(null=True, blank=True)
+    open_tickets = models.PositiveIntegerField(default=0)
+    outstanding_balance = models.DecimalField(default=0, **MONEY)
+
+    class Meta:
+        db_table = 'customer_summary'
+
+    def __str__(self):
+        return f"{self.customer_id}: {self.lifetime_value} / {self.outstanding_balance}"
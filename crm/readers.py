@@ -0,0 +1,26 @@
+from core.readers import Schema, Field
+from crm.models import Customer, CustomerSummary
+
+
+# ------------------------------------------------
+# ✅ Read schemas
+# ------------------------------------------------
+class CustomerRead(Schema):
+    model = Customer
+    fields = ('id', 'user', 'name', 'email', 'phone', 'type', 'is_active', 'created_at', 'updated_at')
+
+
+class Customer360Read(Schema):
+    """The customer page: one row of customer_summary joined to customer and user."""
+    model = CustomerSummary
+    fields = ('currency', 'lifetime_value', 'orders_count', 'last_purchase_at', 'open_tickets',
+              'outstanding_balance', 'updated_at')
+    id = Field('customer_id')
+    name = Field('customer__name')
+    email = Field('customer__email')
+    phone = Field('customer__phone')
+    type = Field('customer__type')
+    is_active = Field('customer__is_active')
+    user = Field('customer__user_id')
+    username = Field('customer__user__username')
+    customer_since = Field('customer__created_at')
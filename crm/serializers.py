@@ -0,0 +1,19 @@
+from rest_framework import serializers
+from crm.models import Customer, ServiceTicket
+
+
+# ------------------------------------------------
+# ✅ CRM Serializers
+# ------------------------------------------------
+class CustomerSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Customer
+        fields = ['id', 'user', 'name', 'email', 'phone', 'type', 'is_active', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'created_at', 'updated_at']
+
+
+class ServiceTicketSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ServiceTicket
+        fields = ['id', 'customer', 'kind', 'subject', 'description', 'status', 'closed_at', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'status', 'closed_at', 'created_at', 'updated_at']
@@ -0,0 +1,34 @@
+#crm/services.py
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from core.outbox import publish
+from crm.models import ServiceTicket
+
+
+# ------------------------------------------------
+# ✅ Service tickets
+# ------------------------------------------------
+def ticket_event(ticket):
+    return {'ticket_id': str(ticket.pk), 'customer_id': str(ticket.customer_id), 'kind': ticket.kind}
+
+
+def open_ticket(customer_id, subject, kind='service', description=''):
+    with transaction.atomic():
+        ticket = ServiceTicket.objects.create(customer_id=customer_id, subject=subject, kind=kind,
+                                              description=description)
+        publish('service_ticket.opened', ticket_event(ticket))
+    return ticket
+
+
+def close_ticket(ticket_id):
+    with transaction.atomic():
+        ticket = ServiceTicket.objects.select_for_update().get(pk=ticket_id)
+        if ticket.status == 'closed':
+            raise ValidationError("Ticket is already closed.")
+        ticket.status = 'closed'
+        ticket.closed_at = timezone.now()
+        ticket.save()
+        publish('service_ticket.closed', ticket_event(ticket))
+    return ticket
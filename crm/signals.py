@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from crm.models import Customer, CustomerSummary
+
+
+# ------------------------------------------------
+# 🔹 Every customer gets its (empty) summary row up front
+# ------------------------------------------------
+@receiver(post_save, sender=Customer)
+def create_summary(sender, instance, created, **kwargs):
+    if created:
+        CustomerSummary.objects.get_or_create(customer=instance)
@@ -0,0 +1,148 @@
+#crm/summaries.py
+from collections import Counter
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Count, DecimalField, Exists, F, Max, OuterRef, Q, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from accounting.models import CustomerPayment
+from core.db import run_with_retries
+from core.models import OutboxDelivery, OutboxEvent
+from core.outbox import handler_name
+from crm.models import CustomerSummary, ServiceTicket
+from operations.models import SalesOrderLine
+
+ZERO = Decimal('0.00')
+
+
+# ------------------------------------------------
+# ✅ Incremental updates (outbox handlers)
+# ------------------------------------------------
+def apply(customer_id, **changes):
+    """
+    Applies F() expressions to one customer's summary row, creating the row
+    first if it is missing. Concurrent handlers serialize on the row lock.
+    """
+    changes['updated_at'] = timezone.now()
+    with transaction.atomic():
+        if not CustomerSummary.objects.filter(customer_id=customer_id).update(**changes):
+            CustomerSummary.objects.get_or_create(customer_id=customer_id)
+            CustomerSummary.objects.filter(customer_id=customer_id).update(**changes)
+
+
+def record_purchase(customer_id, total, at):
+    apply(
+        customer_id,
+        lifetime_value=F('lifetime_value') + total,
+        outstanding_balance=F('outstanding_balance') + total,
+        orders_count=F('orders_count') + 1,
+        # Greatest() is NULL on some backends when either side is
+        last_purchase_at=Coalesce(Greatest(F('last_purchase_at'), Value(at)), Value(at)),
+    )
+
+
+def record_payment(customer_id, amount):
+    apply(customer_id, outstanding_balance=F('outstanding_balance') - amount)
+
+
+def record_ticket(customer_id, delta):
+    apply(customer_id, open_tickets=F('open_tickets') + delta)
+
+
+# ------------------------------------------------
+# ✅ Rebuild from the source tables (rebuild_customer_summaries)
+# ------------------------------------------------
+def _unapplied_events(customer_ids):
+    """
+    (topic, payload) of the events for `customer_ids` whose crm handler has
+    not run yet: their rows are already in the source tables, and the handler
+    will still apply its F() change on top of whatever the rebuild writes.
+    Done events are skipped up front; all their handlers have run.
+    """
+    from crm import handlers
+
+    unapplied = Q()
+    for topic, handler in [('sales_order.fulfilled', handlers.order_fulfilled),
+                           ('customer_payment.received', handlers.payment_received),
+                           ('service_ticket.opened', handlers.ticket_opened),
+                           ('service_ticket.closed', handlers.ticket_closed)]:
+        done = OutboxDelivery.objects.filter(event=OuterRef('pk'), handler=handler_name(handler), status='done')
+        unapplied |= Q(topic=topic) & ~Exists(done)
+    return list(OutboxEvent.objects.exclude(status='done')
+                .filter(unapplied, payload__customer_id__in=[str(pk) for pk in customer_ids])
+                .values_list('topic', 'payload'))
+
+
+def _rebuild(customer_ids):
+    money = DecimalField(max_digits=20, decimal_places=2)
+    outermost = not connection.in_atomic_block
+    with transaction.atomic():
+        if connection.vendor == 'postgresql' and outermost:
+            # one snapshot for the aggregates and the outbox: an event either
+            # committed with its rows before it, or lands entirely after it
+            with connection.cursor() as cursor:
+                cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ')
+        list(CustomerSummary.objects.select_for_update().filter(customer_id__in=customer_ids).values_list('pk'))
+
+        unapplied = _unapplied_events(customer_ids)
+        owed_orders = [p['order_id'] for topic, p in unapplied if topic == 'sales_order.fulfilled']
+        owed_payments = [p['payment_id'] for topic, p in unapplied if topic == 'customer_payment.received']
+        owed_tickets = Counter()
+        for topic, payload in unapplied:
+            if topic.startswith('service_ticket.'):
+                owed_tickets[payload['customer_id']] += 1 if topic == 'service_ticket.opened' else -1
+
+        orders = {
+            row['order__customer_id']: row
+            for row in (SalesOrderLine.objects
+                        .filter(order__customer_id__in=customer_ids, order__status='fulfilled')
+                        .exclude(order_id__in=owed_orders)
+                        .values('order__customer_id')
+                        .annotate(value=Sum(F('quantity') * F('unit_price'), output_field=money),
+                                  count=Count('order_id', distinct=True),
+                                  last=Max('order__fulfilled_at'))
+                        .order_by())
+        }
+        paid = dict(CustomerPayment.objects.filter(customer_id__in=customer_ids)
+                    .exclude(pk__in=owed_payments)
+                    .values('customer_id').annotate(total=Sum('amount'))
+                    .values_list('customer_id', 'total').order_by())
+        tickets = dict(ServiceTicket.objects.filter(customer_id__in=customer_ids, status='open')
+                       .values('customer_id').annotate(n=Count('id'))
+                       .values_list('customer_id', 'n').order_by())
+
+        now = timezone.now()
+        summaries = []
+        for customer_id in customer_ids:
+            row = orders.get(customer_id, {})
+            value = row.get('value') or ZERO
+            summaries.append(CustomerSummary(
+                customer_id=customer_id,
+                lifetime_value=value,
+                orders_count=row.get('count', 0),
+                last_purchase_at=row.get('last'),
+                open_tickets=tickets.get(customer_id, 0) - owed_tickets[str(customer_id)],
+                outstanding_balance=value - (paid.get(customer_id) or ZERO),
+                updated_at=now,
+            ))
+        CustomerSummary.objects.bulk_create(
+            summaries, batch_size=1000, update_conflicts=True, unique_fields=['customer'],
+            update_fields=['lifetime_value', 'orders_count', 'last_purchase_at', 'open_tickets',
+                           'outstanding_balance', 'updated_at'],
+        )
+    return len(summaries)
+
+
+def rebuild_customers(customer_ids):
+    """
+    Recomputes the summaries of `customer_ids` with one GROUP BY per source
+    table. Rows whose outbox event the crm handlers have not applied yet are
+    left out, since the handler adds them when it runs; the whole read is
+    one REPEATABLE READ snapshot on PostgreSQL, so no event falls between the
+    aggregates and that check. A handler committing on a locked row in the
+    meantime is a serialization failure, and the chunk is retried.
+    Returns the number of rows written.
+    """
+    return run_with_retries(lambda: _rebuild(customer_ids))
@@ -1,3 +1,91 @@
+import io
+from decimal import Decimal
+from unittest import mock
+
+from django.core.management import call_command
 from django.test import TestCase
+from django.utils import timezone
+
+from accounting.services import receive_payment
+from core import outbox
+from core.models import OutboxEvent
+from crm import services
+from crm.models import Customer, CustomerSummary
+from inventory import services as inventory
+from inventory.models import Location, Product
+from operations import services as operations
+
+
+def summary(customer):
+    row = CustomerSummary.objects.get(customer=customer)
+    return row.lifetime_value, row.outstanding_balance, row.orders_count, row.open_tickets
+
+
+# ------------------------------------------------
+# 🔹 Customer summaries
+# ------------------------------------------------
+class CustomerSummaryTests(TestCase):
+    def setUp(self):
+        self.customer = Customer.objects.create(name="Acme")
+        self.product = Product.objects.create(sku="A", name="Laptop")
+        self.main = Location.objects.create(code="W1", name="Main")
+        inventory.record_movement(self.product.pk, self.main.pk, 10, "receipt")
+
+    def sell(self, key, quantity, price):
+        order, _ = operations.checkout([{"product_id": self.product.pk, "quantity": quantity, "unit_price": price}],
+                                       key, customer_id=self.customer.pk)
+        operations.fulfil_order(order.pk)
+        return order
+
+    def activity(self):
+        self.sell("k1", 2, "10.00")
+        self.sell("k2", 1, "5.00")
+        receive_payment(self.customer.pk, "7.00")
+        services.open_ticket(self.customer.pk, "Screen flickers")
+        services.close_ticket(services.open_ticket(self.customer.pk, "Battery").pk)
+
+    def rebuild(self):
+        call_command("rebuild_customer_summaries", "--workers", "1", stdout=io.StringIO())
+
+    def test_handlers_keep_summary_current(self):
+        self.activity()
+        outbox.process_batch()
+        self.assertEqual(summary(self.customer), (Decimal("25.00"), Decimal("18.00"), 2, 1))
+
+    def test_rebuild_matches_handlers(self):
+        self.activity()
+        outbox.process_batch()
+        CustomerSummary.objects.update(lifetime_value=0, orders_count=99, open_tickets=7)
+        self.rebuild()
+        self.assertEqual(summary(self.customer), (Decimal("25.00"), Decimal("18.00"), 2, 1))
+
+    def test_rebuild_with_pending_events_not_double_counted(self):
+        self.sell("k0", 2, "10.00")
+        outbox.process_batch()
+        self.activity()
+        self.rebuild()
+        # only what the handlers have already applied
+        self.assertEqual(summary(self.customer), (Decimal("20.00"), Decimal("20.00"), 1, 0))
+        outbox.process_batch()
+        self.assertEqual(summary(self.customer), (Decimal("45.00"), Decimal("38.00"), 3, 1))
+
+    def test_rebuild_counts_event_whose_crm_handler_already_ran(self):
+        order = self.sell("k1", 2, "10.00")
+
+        def post_sale(event):
+            raise RuntimeError("ledger down")
+        post_sale.__module__, post_sale.__qualname__ = "accounting.handlers", "post_sale"
+
+        handlers = [post_sale if outbox.handler_name(h) == "accounting.handlers.post_sale" else h
+                    for h in outbox.handlers_for("sales_order.fulfilled")]
+        with mock.patch.dict(outbox._handlers, {"sales_order.fulfilled": handlers}):
+            with self.assertLogs("core.outbox", "WARNING"):
+                outbox.process_batch()
+        self.assertEqual(OutboxEvent.objects.get(topic="sales_order.fulfilled").status, "pending")
 
-# Create your tests here.
+        self.rebuild()
+        self.assertEqual(summary(self.customer)[:3], (Decimal("20.00"), Decimal("20.00"), 1))
+        OutboxEvent.objects.update(available_at=timezone.now())
+        outbox.process_batch()
+        self.assertEqual(summary(self.customer)[:3], (Decimal("20.00"), Decimal("20.00"), 1))
+        self.assertEqual(OutboxEvent.objects.get(topic="sales_order.fulfilled", payload__order_id=str(order.pk)).status, "done")
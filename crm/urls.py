@@ -0,0 +1,10 @@
+# crm/urls.py
+from django.urls import path
+from .views import *
+
+urlpatterns = [
+    path('customers', CustomerListCreateView.as_view(), name='customer-list'),
+    path('customers/<uuid:pk>/360', Customer360View.as_view(), name='customer-360'),
+    path('tickets', ServiceTicketCreateView.as_view(), name='ticket-create'),
+    path('tickets/<uuid:pk>/close', ServiceTicketCloseView.as_view(), name='ticket-close'),
+]
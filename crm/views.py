@@ -1,3 +1,70 @@
-from django.shortcuts import render
+#crm/views.py
+from django.core.exceptions import ValidationError
+from rest_framework import generics
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from core.readers import SchemaReadMixin
+from core.status import *
+from crm.models import Customer, CustomerSummary, ServiceTicket
+from crm.readers import Customer360Read, CustomerRead
+from crm.serializers import CustomerSerializer, ServiceTicketSerializer
+from crm.services import close_ticket, open_ticket
 
-# Create your views here.
+
+# ------------------------------------------------
+# ✅ Customers
+# ------------------------------------------------
+class CustomerListCreateView(SchemaReadMixin, generics.ListCreateAPIView):
+    queryset = Customer.objects.all()
+    serializer_class = CustomerSerializer
+    read_schema = CustomerRead
+    permission_classes = [IsAdminUser]
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        return Response({"message": "Customer created successfully", "data": serializer.data}, status=S201)
+
+
+class Customer360View(generics.GenericAPIView):
+    """Single-row read of the denormalized CustomerSummary (see crm.summaries)."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, pk, *args, **kwargs):
+        data = Customer360Read.dump_one(CustomerSummary.objects.filter(customer_id=pk))
+        if data is None:
+            return Response({"error": "Customer not found."}, status=S404)
+        return Response({"data": data})
+
+
+# ------------------------------------------------
+# ✅ Service tickets
+# ------------------------------------------------
+class ServiceTicketCreateView(generics.GenericAPIView):
+    serializer_class = ServiceTicketSerializer
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ticket = open_ticket(
+            serializer.validated_data['customer'].pk, serializer.validated_data['subject'],
+            kind=serializer.validated_data.get('kind', 'service'),
+            description=serializer.validated_data.get('description', ''),
+        )
+        return Response({"message": "Ticket opened.", "data": ServiceTicketSerializer(ticket).data}, status=S201)
+
+
+class ServiceTicketCloseView(generics.GenericAPIView):
+    serializer_class = ServiceTicketSerializer
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, pk, *args, **kwargs):
+        try:
+            ticket = close_ticket(pk)
+        except ServiceTicket.DoesNotExist:
+            return Response({"error": "Ticket not found."}, status=S404)
+        except ValidationError as e:
+            return Response({"error": e.messages[0]}, status=S409)
+        return Response({"message": "Ticket closed.", "data": ServiceTicketSerializer(ticket).data})
@@ -0,0 +1,21 @@
+#dashboard/handlers.py
+from core.outbox import handles
+from dashboard.rollups import record_order
+
+
+# ------------------------------------------------
+# 🔹 Outbox handlers
+# ------------------------------------------------
+@handles('sales_order.placed')
+def order_placed(event):
+    record_order('orders_placed', event.payload)
+
+
+@handles('sales_order.fulfilled')
+def order_fulfilled(event):
+    record_order('sales', event.payload)
+
+
+@handles('sales_order.cancelled')
+def order_cancelled(event):
+    record_order('orders_cancelled', event.payload)
@@ -0,0 +1,50 @@
+import os
+from concurrent.futures import as_completed
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.processes import django_process_pool
+from dashboard.rollups import rebuild_range
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the order metric buckets from sales order history, one process per "
+        "date range. Pause outbox_worker meanwhile: events delivered while a range is "
+        "rebuilt can be counted twice."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", required=True, help="First day, YYYY-MM-DD")
+        parser.add_argument("--end", required=True, help="Last day (inclusive), YYYY-MM-DD")
+        parser.add_argument("--range-days", type=int, default=7, help="Days per process task")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+
+    def handle(self, *args, **options):
+        try:
+            first = datetime.strptime(options["start"], "%Y-%m-%d")
+            last = datetime.strptime(options["end"], "%Y-%m-%d")
+        except ValueError:
+            raise CommandError("--start/--end must look like 2025-01-31")
+        if last < first:
+            raise CommandError("--end is before --start")
+
+        tz = timezone.get_current_timezone()
+        ranges = []
+        day = first
+        while day <= last:
+            stop = min(day + timedelta(days=options["range_days"]), last + timedelta(days=1))
+            ranges.append((timezone.make_aware(day, tz), timezone.make_aware(stop, tz)))
+            day = stop
+
+        total = 0
+        with django_process_pool(min(options["workers"], len(ranges))) as pool:
+            futures = {pool.submit(rebuild_range, start, end): (start, end) for start, end in ranges}
+            for future in as_completed(futures):
+                start, end = futures[future]
+                written = future.result()
+                total += written
+                self.stdout.write(f"{start:%Y-%m-%d} .. {end:%Y-%m-%d}: {written} buckets")
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {len(ranges)} ranges, {total} buckets"))
@@ -1,3 +1,35 @@
+#dashboard/models.py
 from django.db import models
+from core.models import Base
 
-# Create your models here.
+
+class MetricBucket(Base):
+    """
+    Pre-aggregated metric for one hour or one day per branch (location id) and
+    sales channel, incremented from outbox events by dashboard.rollups so the
+    dashboard never scans the source tables. '' in branch/channel is the
+    total across all branches/channels.
+    """
+    GRANULARITY_CHOICES = [
+        ('hour', 'Hour'),
+        ('day', 'Day'),
+    ]
+
+    metric = models.CharField(max_length=64)
+    granularity = models.CharField(max_length=4, choices=GRANULARITY_CHOICES)
+    branch = models.CharField(max_length=36, blank=True, default='')
+    channel = models.CharField(max_length=20, blank=True, default='')
+    bucket_start = models.DateTimeField()
+    count = models.BigIntegerField(default=0)
+    value = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+
+    class Meta:
+        db_table = 'metric_bucket'
+        constraints = [
+            # also the read index: dashboard queries filter the leading columns and range on bucket_start
+            models.UniqueConstraint(fields=['metric', 'granularity', 'branch', 'channel', 'bucket_start'],
+                                    name='metric_bucket_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.metric} {self.granularity} {self.bucket_start:%Y-%m-%d %H:00}: {self.count} / {self.value}"
@@ -0,0 +1,106 @@
+#dashboard/rollups.py
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, F, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+from dashboard.models import MetricBucket
+from operations.models import SalesOrderLine
+
+# metric -> SalesOrder timestamp it is bucketed by (also used by the backfill)
+ORDER_METRICS = {
+    'orders_placed': 'created_at',
+    'sales': 'fulfilled_at',
+    'orders_cancelled': 'cancelled_at',
+}
+TRUNC = {'hour': TruncHour, 'day': TruncDay}
+
+
+def bucket_starts(at):
+    at = timezone.localtime(at)
+    hour = at.replace(minute=0, second=0, microsecond=0)
+    return {'hour': hour, 'day': hour.replace(hour=0)}
+
+
+# ------------------------------------------------
+# ✅ Incremental updates (outbox handlers)
+# ------------------------------------------------
+def apply(metric, at, increments):
+    """`increments`: {(branch, channel): (count, value)}, added to the hour and day buckets of `at`."""
+    now = timezone.now()
+    for granularity, start in bucket_starts(at).items():
+        for (branch, channel), (count, value) in sorted(increments.items()):
+            key = {'metric': metric, 'granularity': granularity, 'branch': branch,
+                   'channel': channel, 'bucket_start': start}
+            changes = {'count': F('count') + count, 'value': F('value') + value, 'updated_at': now}
+            with transaction.atomic():
+                if not MetricBucket.objects.filter(**key).update(**changes):
+                    MetricBucket.objects.get_or_create(**key)
+                    MetricBucket.objects.filter(**key).update(**changes)
+
+
+def record_order(metric, payload):
+    """
+    One sales order event: its value is split across the branches its lines
+    ship from, and the order counts once in each branch and once in every total.
+    Events published before orders carried a channel only feed the all-channel
+    buckets, which are the ones their per-channel key would collapse onto.
+    """
+    channel = payload.get('channel', '')
+    by_branch = defaultdict(Decimal)
+    for line in payload['lines']:
+        by_branch[line['location_id']] += Decimal(line['unit_price']) * line['quantity']
+
+    increments = defaultdict(lambda: [0, Decimal('0.00')])
+    for branch, value in by_branch.items():
+        for key in {(branch, channel), (branch, '')}:
+            increments[key][0] += 1
+            increments[key][1] += value
+    for key in {('', channel), ('', '')}:
+        increments[key][0] += 1
+        increments[key][1] += Decimal(payload['total'])
+    apply(metric, datetime.fromisoformat(payload['at']), {k: tuple(v) for k, v in increments.items()})
+
+
+# ------------------------------------------------
+# ✅ Rebuild from history (backfill_rollups)
+# ------------------------------------------------
+def rebuild_range(start, end):
+    """
+    Replaces every order-metric bucket in [start, end) with GROUP BY totals
+    over the sales order tables. `start`/`end` must be day boundaries so no
+    bucket straddles two ranges. Returns the number of buckets written.
+    """
+    buckets = []
+    for metric, field in ORDER_METRICS.items():
+        lines = SalesOrderLine.objects.filter(**{f'order__{field}__gte': start, f'order__{field}__lt': end})
+        for granularity, trunc in TRUNC.items():
+            for by_branch in (True, False):
+                for by_channel in (True, False):
+                    group = ['bucket']
+                    if by_branch:
+                        group.append('location_id')
+                    if by_channel:
+                        group.append('order__channel')
+                    rows = (lines.annotate(bucket=trunc(f'order__{field}'))
+                            .values(*group)
+                            .annotate(count=Count('order_id', distinct=True),
+                                      value=Sum(F('quantity') * F('unit_price'),
+                                                output_field=DecimalField(max_digits=20, decimal_places=2)))
+                            .order_by())
+                    for row in rows:
+                        buckets.append(MetricBucket(
+                            metric=metric, granularity=granularity, bucket_start=row['bucket'],
+                            branch=str(row['location_id']) if by_branch else '',
+                            channel=row['order__channel'] if by_channel else '',
+                            count=row['count'], value=row['value'] or 0,
+                        ))
+
+    with transaction.atomic():
+        MetricBucket.objects.filter(metric__in=ORDER_METRICS, bucket_start__gte=start, bucket_start__lt=end).delete()
+        MetricBucket.objects.bulk_create(buckets, batch_size=2000)
+    return len(buckets)
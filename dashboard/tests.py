@@ -1,3 +1,104 @@
+import datetime as dt
+from decimal import Decimal
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core import outbox
+from dashboard.models import MetricBucket
+from dashboard.rollups import rebuild_range, record_order
+from inventory import services as inventory
+from inventory.models import Location, Product
+from operations import services
+from users.models import User
+
+METRICS_URL = "/dashboard/metrics?metric=orders_placed,sales"
+
+
+def bucket(branch="", channel="", metric="orders_placed"):
+    row = MetricBucket.objects.get(metric=metric, granularity="day", branch=branch, channel=channel)
+    return row.count, row.value
+
+
+def snapshot():
+    return sorted(MetricBucket.objects.values_list("metric", "granularity", "branch", "channel", "bucket_start", "count", "value"))
+
+
+class RollupTestCase(TestCase):
+    def setUp(self):
+        self.product = Product.objects.create(sku="A", name="Laptop")
+        self.main = Location.objects.create(code="W1", name="Main")
+        self.store = Location.objects.create(code="S1", name="Store")
+        inventory.record_movement(self.product.pk, self.main.pk, 1, "receipt")
+        inventory.record_movement(self.product.pk, self.store.pk, 5, "receipt")
+
+    def place(self, key, quantity, price, **options):
+        order, _ = services.checkout([{"product_id": self.product.pk, "quantity": quantity, "unit_price": price}], key, **options)
+        return order
+
+
+# ------------------------------------------------
+# 🔹 Order rollups
+# ------------------------------------------------
+class RollupTests(RollupTestCase):
+    def test_orders_counted_per_branch_and_channel(self):
+        self.place("k1", 3, "2.00", channel="online")
+        self.place("k2", 1, "1.00")
+        outbox.process_batch()
+        self.assertEqual(bucket(), (2, Decimal("7.00")))
+        self.assertEqual(bucket(channel="online"), (1, Decimal("6.00")))
+        self.assertEqual(bucket(branch=str(self.main.pk), channel="online"), (1, Decimal("2.00")))
+        self.assertEqual(bucket(branch=str(self.store.pk)), (2, Decimal("5.00")))
+
+    def test_event_without_channel_counted_once(self):
+        payload = {
+            "at": timezone.now().isoformat(), "total": "4.00",
+            "lines": [{"location_id": str(self.main.pk), "quantity": 2, "unit_price": "2.00"}],
+        }
+        record_order("orders_placed", payload)
+        self.assertEqual(bucket(), (1, Decimal("4.00")))
+        self.assertEqual(bucket(branch=str(self.main.pk)), (1, Decimal("4.00")))
+        self.assertEqual(MetricBucket.objects.filter(granularity="day").count(), 2)
+
+    def test_rebuild_matches_incremental(self):
+        self.place("k1", 3, "2.00", channel="online")
+        self.place("k2", 1, "1.00")
+        outbox.process_batch()
+        expected = snapshot()
+        MetricBucket.objects.update(count=99)
+        today = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+        rebuild_range(today - dt.timedelta(days=1), today + dt.timedelta(days=1))
+        self.assertEqual(snapshot(), expected)
+
+
+# ------------------------------------------------
+# 🔹 Metrics endpoint
+# ------------------------------------------------
+class MetricBucketViewTests(RollupTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(
+            username="admin", password="Passw0rd!", email="admin@gmail.com", is_staff=True))
+
+    def test_etag_revalidation(self):
+        order = self.place("k1", 1, "3.00")
+        outbox.process_batch()
+        response = self.client.get(METRICS_URL)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["data"]["orders_placed"][0]["count"], 1)
+
+        with CaptureQueriesContext(connection) as captured:
+            cached = self.client.get(METRICS_URL, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(len(captured), 1)
+
+        services.fulfil_order(order.pk)
+        outbox.process_batch()
+        self.assertEqual(self.client.get(METRICS_URL, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 200)
 
-# Create your tests here.
+    def test_metric_required(self):
+        self.assertEqual(self.client.get("/dashboard/metrics").status_code, 400)
@@ -0,0 +1,7 @@
+# dashboard/urls.py
+from django.urls import path
+from .views import *
+
+urlpatterns = [
+    path('metrics', MetricBucketView.as_view(), name='dashboard-metrics'),
+]
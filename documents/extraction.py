@@ -0,0 +1,188 @@
+#documents/extraction.py
+"""
+PDF text extraction into DocumentPage rows.
+
+Parsing a PDF is pure-Python CPU work, so it runs on a process pool
+(core.processes.django_process_pool); the parent only writes the results.
+Progress lives in Document.text_status and each document commits on its
+own, so an interrupted run resumes where it stopped and a run only touches
+documents still 'pending' (new uploads, or ones queued again with `requeue`).
+Copies of the same file (per-user Document rows share a sha256) are parsed
+once: pages are copied from a finished copy, or from the copy in flight.
+"""
+import os
+import signal
+import threading
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, wait
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.processes import django_process_pool
+from documents.models import Document, DocumentPage
+
+PDF_FILTER = Q(content_type='application/pdf') | Q(original_name__iendswith='.pdf')
+
+
+def extract_pdf_text(path):
+    """[page text, ...] from the PDF's text layer (no OCR)."""
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    # Postgres text columns cannot hold NUL
+    return [(page.extract_text() or '').replace('\x00', '') for page in reader.pages]
+
+
+class ExtractionTimeout(Exception):
+    pass
+
+
+@contextmanager
+def _time_limit(seconds):
+    """SIGALRM after `seconds` in a pool worker's main thread; no limit elsewhere (or when falsy)."""
+    if not seconds or not hasattr(signal, 'setitimer') or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def expire(signum, frame):
+        raise ExtractionTimeout(f"extraction took longer than {seconds}s")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _extract(document_id, path, timeout=None):
+    """Pool task: (document_id, pages, error); failures and timeouts come back as data, not exceptions."""
+    try:
+        with _time_limit(timeout):
+            return document_id, extract_pdf_text(path), ''
+    except Exception as e:
+        return document_id, None, f"{type(e).__name__}: {e}"
+
+
+def refresh_page_vectors(queryset):
+    """`simple` config: vendor names, invoice numbers and amounts are matched as written, not stemmed."""
+    if connection.vendor == 'postgresql':
+        queryset.update(search_vector=SearchVector('text', config='simple'))
+
+
+def save_pages(document_id, pages, error=''):
+    with transaction.atomic():
+        DocumentPage.objects.filter(document_id=document_id).delete()
+        now = timezone.now()
+        if error:
+            Document.objects.filter(pk=document_id).update(
+                text_status='failed', text_error=error[:2000], page_count=None, extracted_at=now, updated_at=now)
+            return
+        DocumentPage.objects.bulk_create(
+            [DocumentPage(document_id=document_id, number=i, text=text) for i, text in enumerate(pages, 1)],
+            batch_size=500,
+        )
+        refresh_page_vectors(DocumentPage.objects.filter(document_id=document_id))
+        Document.objects.filter(pk=document_id).update(
+            text_status='done', text_error='', page_count=len(pages), extracted_at=now, updated_at=now)
+
+
+# ------------------------------------------------
+# ✅ Indexing runs
+# ------------------------------------------------
+def requeue(failed_only=False, since=None):
+    """Marks documents for re-extraction (e.g. after upgrading the extractor)."""
+    documents = Document.objects.exclude(text_status='pending')
+    if failed_only:
+        documents = documents.filter(text_status='failed')
+    if since is not None:
+        documents = documents.filter(created_at__gte=since)
+    return documents.update(text_status='pending', updated_at=timezone.now())
+
+
+def _finished_pages(digests):
+    """{sha256: [page text, ...]} from already extracted copies of these files."""
+    sources = dict(Document.objects.filter(sha256__in=digests, text_status='done').values_list('sha256', 'id'))
+    pages = defaultdict(list)
+    rows = (DocumentPage.objects.filter(document_id__in=sources.values())
+            .order_by('document_id', 'number').values_list('document_id', 'text'))
+    by_document = {document_id: digest for digest, document_id in sources.items()}
+    for document_id, text in rows.iterator(chunk_size=500):
+        pages[by_document[document_id]].append(text)
+    # a finished document can have no pages (empty text layer)
+    return {digest: pages[digest] for digest in sources}
+
+
+def index_pending(workers=None, limit=None, chunk_size=200, timeout=None):
+    """
+    Extracts every pending PDF; non-PDFs are marked 'skipped'. Keeps about
+    two tasks per worker in flight and walks pending ids in order, so a long
+    document never leaves the other workers idle. A file whose sha256 was
+    already extracted, or is being extracted in this run, is not parsed again.
+    Each parse is cut off after `timeout` seconds (DOCUMENTS_EXTRACT_TIMEOUT)
+    and the document marked 'failed'.
+    Returns {'done': n, 'failed': n, 'skipped': n, 'pages': n}.
+    """
+    counts = {'done': 0, 'failed': 0, 'skipped': 0, 'pages': 0}
+    counts['skipped'] = (Document.objects.filter(text_status='pending').exclude(PDF_FILTER)
+                         .update(text_status='skipped', updated_at=timezone.now()))
+    pending = Document.objects.filter(PDF_FILTER, text_status='pending').order_by('id')
+    if not pending.exists():
+        return counts
+    workers = workers or os.cpu_count() or 2
+    timeout = getattr(settings, 'DOCUMENTS_EXTRACT_TIMEOUT', 300) if timeout is None else timeout
+
+    def save(document_id, pages, error):
+        save_pages(document_id, pages, error)
+        if error:
+            counts['failed'] += 1
+        else:
+            counts['done'] += 1
+            counts['pages'] += len(pages)
+
+    def collect(finished):
+        for future in finished:
+            document_id, pages, error = future.result()
+            digest = digests.pop(future)
+            for copy_id in copies.pop(digest):
+                save(copy_id, pages, error)
+            if not error:
+                extracted[digest] = pages  # later copies in this batch
+
+    storage = Document._meta.get_field('file').storage
+    in_flight, submitted, last_id = set(), 0, None
+    digests, copies = {}, {}  # future -> sha256, sha256 in flight -> its document ids
+    extracted = {}            # sha256 -> pages, for the current batch
+    with django_process_pool(workers) as pool:
+        while limit is None or submitted < limit:
+            # keyset batches: rows are updated as results come back, so no cursor stays open over them
+            batch = pending if last_id is None else pending.filter(id__gt=last_id)
+            size = chunk_size if limit is None else min(chunk_size, limit - submitted)
+            batch = list(batch.values_list('id', 'file', 'sha256')[:size])
+            if not batch:
+                break
+            extracted.clear()
+            extracted.update(_finished_pages({digest for _, _, digest in batch}))
+            for document_id, name, digest in batch:
+                if digest in extracted:
+                    save(document_id, extracted[digest], '')
+                    continue
+                if digest in copies:
+                    copies[digest].append(document_id)
+                    continue
+                if len(in_flight) >= workers * 2:
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(finished)
+                future = pool.submit(_extract, document_id, storage.path(name), timeout)
+                in_flight.add(future)
+                digests[future], copies[digest] = digest, [document_id]
+            submitted += len(batch)
+            last_id = batch[-1][0]
+        collect(wait(in_flight).done)
+    return counts
@@ -0,0 +1,53 @@
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.utils import timezone
+
+from documents.extraction import index_pending, requeue
+
+
+class Command(BaseCommand):
+    help = (
+        "Extracts the text layer of pending PDF documents into the page search index "
+        "on a process pool. Safe to stop and restart: finished documents are not redone."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=None, help="Extraction processes (default: CPU count)")
+        parser.add_argument("--limit", type=int, default=None, help="Documents per run")
+        parser.add_argument("--once", action="store_true", help="Index what is pending and exit")
+        parser.add_argument("--idle-sleep", type=float, default=10.0, help="Seconds to wait when nothing is pending")
+        parser.add_argument("--requeue", action="store_true", help="Queue every document for re-extraction first")
+        parser.add_argument("--requeue-failed", action="store_true", help="Queue failed documents again first")
+        parser.add_argument("--since", default=None, help="With --requeue: only documents uploaded since YYYY-MM-DD")
+
+    def handle(self, *args, **options):
+        if options["requeue"] or options["requeue_failed"]:
+            since = None
+            if options["since"]:
+                try:
+                    since = timezone.make_aware(datetime.strptime(options["since"], "%Y-%m-%d"))
+                except ValueError:
+                    raise CommandError("--since must look like 2025-01-31")
+            self.stdout.write(f"Queued {requeue(failed_only=options['requeue_failed'], since=since)} documents")
+
+        totals = {"done": 0, "failed": 0, "skipped": 0, "pages": 0}
+        started = time.perf_counter()
+        try:
+            while True:
+                close_old_connections()
+                counts = index_pending(workers=options["workers"], limit=options["limit"])
+                for key, value in counts.items():
+                    totals[key] += value
+                if options["once"]:
+                    break
+                if not (counts["done"] or counts["failed"]):
+                    time.sleep(options["idle_sleep"])
+        except KeyboardInterrupt:
+            pass
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{totals['done']} indexed ({totals['pages']} pages), {totals['failed']} failed, "
+            f"{totals['skipped']} skipped in {elapsed:.1f}s"))
@@ -0,0 +1,16 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from documents.services import purge_stale_uploads
+
+
+class Command(BaseCommand):
+    help = "Aborts chunked uploads that have been idle for a while and deletes their part files."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hours", type=int, default=24, help="Idle time before an upload is abandoned")
+
+    def handle(self, *args, **options):
+        count = purge_stale_uploads(timedelta(hours=options["hours"]))
+        self.stdout.write(self.style.SUCCESS(f"Aborted {count} stale uploads"))
@@ -1,3 +1,116 @@
+#documents/models.py
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from core.models import Base
+from core.storage import content_addressed_storage
 
-# Create your models here.
+
+TEXT_STATUS_CHOICES = [
+    ('pending', 'Pending'),
+    ('done', 'Done'),
+    ('failed', 'Failed'),
+    ('skipped', 'Skipped'),
+]
+
+
+class Document(Base):
+    """
+    An uploaded file, stored once per content under
+    `MEDIA_ROOT/documents/<sha[:2]>/<sha><ext>` (core.storage.ContentAddressedStorage).
+    Each uploader gets their own row: uploading bytes they already have returns
+    that document, and bytes someone else stored get a new row on the same file.
+    Only the uploader, and staff with `view_all_documents`, can read a document.
+    """
+    KIND_CHOICES = [
+        ('invoice', 'Invoice'),
+        ('receipt', 'Receipt'),
+        ('contract', 'Contract'),
+        ('other', 'Other'),
+    ]
+
+    sha256 = models.CharField(max_length=64)
+    file = models.FileField(upload_to='documents', storage=content_addressed_storage, max_length=255)
+    size = models.BigIntegerField()
+    content_type = models.CharField(max_length=100, default='application/octet-stream')
+    original_name = models.CharField(max_length=255, blank=True, default='')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default='other')
+    uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+                                    related_name="documents")
+    # text extraction (documents/extraction.py, `manage.py index_documents`)
+    text_status = models.CharField(max_length=10, choices=TEXT_STATUS_CHOICES, default='pending')
+    page_count = models.PositiveIntegerField(null=True, blank=True)
+    text_error = models.TextField(blank=True, default='')
+    extracted_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'document'
+        constraints = [
+            models.UniqueConstraint(fields=['uploaded_by', 'sha256'], name='document_uploader_sha256_key'),
+        ]
+        indexes = [
+            models.Index(fields=['sha256'], name='document_sha256_idx'),
+            models.Index(fields=['text_status', 'id'], name='document_text_status_idx'),
+        ]
+        permissions = [
+            ('view_all_documents', 'Can view and download every document'),
+        ]
+
+    def __str__(self):
+        return f"{self.original_name or self.sha256} ({self.size} bytes)"
+
+
+class DocumentPage(Base):
+    """
+    The text layer of one page, so a search hit can open the document at that
+    page. search_vector is computed in SQL after the pages are written.
+    """
+    document = models.ForeignKey(Document, on_delete=models.CASCADE, related_name="pages")
+    number = models.PositiveIntegerField(help_text="1-based page number")
+    text = models.TextField(blank=True, default='')
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        db_table = 'document_page'
+        constraints = [
+            models.UniqueConstraint(fields=['document', 'number'], name='document_page_key'),
+        ]
+        indexes = [
+            GinIndex(fields=['search_vector'], name='document_page_search_gin'),
+        ]
+
+    def __str__(self):
+        return f"{self.document_id} p{self.number}"
+
+
+class UploadSession(Base):
+    """
+    A resumable upload: the client PATCHes the bytes in order, each chunk at
+    `received`, into a part file under DOCUMENTS_UPLOAD_DIR. On completion the
+    part file is hashed and moved (renamed, not copied) into document storage.
+    """
+    STATUS_CHOICES = [
+        ('open', 'Open'),
+        ('complete', 'Complete'),
+        ('aborted', 'Aborted'),
+    ]
+
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="upload_sessions")
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, default='application/octet-stream')
+    kind = models.CharField(max_length=20, choices=Document.KIND_CHOICES, default='other')
+    size = models.BigIntegerField(help_text="Total bytes the client will send")
+    received = models.BigIntegerField(default=0)
+    sha256 = models.CharField(max_length=64, blank=True, default='', help_text="Expected digest, checked on completion")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='open')
+    document = models.ForeignKey(Document, on_delete=models.SET_NULL, null=True, blank=True, related_name="uploads")
+
+    class Meta:
+        db_table = 'upload_session'
+        indexes = [
+            models.Index(fields=['status', 'updated_at'], name='upload_session_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} {self.received}/{self.size} ({self.status})"
@@ -0,0 +1,67 @@
+#documents/search.py
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F, OuterRef, Subquery
+
+from documents.models import DocumentPage
+from documents.services import visible_documents
+
+
+# ------------------------------------------------
+# ✅ Document search (page-level Postgres full text)
+# ------------------------------------------------
+def search_documents(query, user, limit=20, kind=None):
+    """
+    Documents visible to `user` whose extracted text matches `query`
+    (websearch syntax: quoted phrases, OR, -term), best page first. Each hit
+    carries the matching page numbers so the client can open the PDF at
+    `#page=N`. Pages are grouped per document in SQL, so `limit` documents
+    come back however many pages each one matches.
+    """
+    query = (query or '').strip()
+    if not query:
+        return []
+    pages = DocumentPage.objects.filter(document__in=visible_documents(user))
+    if kind:
+        pages = pages.filter(document__kind=kind)
+
+    if connection.vendor == 'postgresql':
+        ts_query = SearchQuery(query, search_type='websearch', config='simple')
+        matches = pages.filter(search_vector=ts_query)
+        # DISTINCT ON (document_id): the best page of each document
+        best = (matches.annotate(rank=SearchRank(F('search_vector'), ts_query))
+                .order_by('document_id', '-rank', 'number').distinct('document_id'))
+        top = (DocumentPage.objects.filter(pk__in=best.values('pk'))
+               .annotate(rank=SearchRank(F('search_vector'), ts_query))
+               .order_by('-rank', 'document_id'))
+    else:
+        matches = pages.filter(text__icontains=query)
+        first = matches.filter(document_id=OuterRef('document_id')).order_by('number').values('number')[:1]
+        top = matches.filter(number=Subquery(first)).order_by('document_id')
+    rows = list(top.values('id', 'document_id', 'number', 'document__original_name', 'document__kind')[:limit])
+
+    hits = {
+        row['document_id']: {
+            'id': row['document_id'], 'name': row['document__original_name'], 'kind': row['document__kind'],
+            'page': row['number'], 'pages': [], '_page_id': row['id'],
+        }
+        for row in rows
+    }
+    for document_id, number in matches.filter(document_id__in=list(hits)).values_list('document_id', 'number'):
+        hits[document_id]['pages'].append(number)
+
+    # snippets only for the best page of each returned document
+    snippets = {}
+    if hits and connection.vendor == 'postgresql':
+        snippets = dict(
+            DocumentPage.objects.filter(pk__in=[h['_page_id'] for h in hits.values()])
+            .annotate(snippet=SearchHeadline('text', ts_query, config='simple', max_words=25, min_words=10))
+            .values_list('id', 'snippet')
+        )
+    results = []
+    for hit in hits.values():
+        page_id = hit.pop('_page_id')
+        hit['pages'].sort()
+        hit['snippet'] = snippets.get(page_id, '')
+        results.append(hit)
+    return results
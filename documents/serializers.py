@@ -0,0 +1,34 @@
+from rest_framework import serializers
+from documents.models import Document, UploadSession
+
+
+# ------------------------------------------------
+# ✅ Document Serializers
+# ------------------------------------------------
+class DocumentSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Document
+        fields = ['id', 'sha256', 'size', 'content_type', 'original_name', 'kind', 'uploaded_by', 'text_status',
+                  'page_count', 'created_at']
+        read_only_fields = fields
+
+
+class DocumentUploadSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    kind = serializers.ChoiceField(choices=Document.KIND_CHOICES, default='other')
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UploadSession
+        fields = ['id', 'filename', 'content_type', 'kind', 'size', 'received', 'sha256', 'status', 'document',
+                  'created_at', 'updated_at']
+        read_only_fields = fields
+
+
+class UploadStartSerializer(serializers.Serializer):
+    filename = serializers.CharField(max_length=255)
+    size = serializers.IntegerField(min_value=1)
+    content_type = serializers.CharField(max_length=100, required=False, allow_blank=True, default='')
+    kind = serializers.ChoiceField(choices=Document.KIND_CHOICES, default='other')
+    sha256 = serializers.RegexField(r'^[0-9a-fA-F]{64}$', required=False, allow_blank=True, default='')
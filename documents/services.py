@@ -0,0 +1,227 @@
+#documents/services.py
+import hashlib
+import mimetypes
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from core.storage import file_sha256
+from documents.models import Document, UploadSession
+
+BLOCK_SIZE = 1024 * 1024
+
+
+class OffsetMismatch(ValidationError):
+    """The chunk does not start where the server's copy ends; resume from `offset`."""
+
+    def __init__(self, offset):
+        super().__init__(f"Upload is at offset {offset}.")
+        self.offset = offset
+
+
+class PartFile(File):
+    """A finished part file; FileSystemStorage moves it into place instead of copying."""
+
+    def __init__(self, path, sha256):
+        super().__init__(open(path, 'rb'), name=os.path.basename(path))
+        self.path = path
+        self.content_sha256 = sha256
+
+    def temporary_file_path(self):
+        return self.path
+
+
+def upload_dir():
+    return getattr(settings, 'DOCUMENTS_UPLOAD_DIR', None) or os.path.join(settings.MEDIA_ROOT, '.uploads')
+
+
+def part_path(session):
+    return os.path.join(upload_dir(), f"{session.pk}.part")
+
+
+def guess_content_type(filename, content_type=None):
+    return content_type or mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+
+# ------------------------------------------------
+# ✅ Access
+# ------------------------------------------------
+def visible_documents(user):
+    """Documents `user` may read: their own uploads, or all of them for staff with view_all_documents."""
+    if user.is_staff and user.has_perm('documents.view_all_documents'):
+        return Document.objects.all()
+    return Document.objects.filter(uploaded_by=user)
+
+
+# ------------------------------------------------
+# ✅ Single-request uploads (multipart, hashed while streaming to a temp file)
+# ------------------------------------------------
+def store_file(file, user=None, kind='other', filename=None, content_type=None):
+    """
+    Returns (document, created). The bytes are stored once; uploading content
+    the user already has returns their document, and content stored by
+    someone else gets a new document for this user on the same file.
+    """
+    digest = file_sha256(file)
+    existing = Document.objects.filter(sha256=digest, uploaded_by=user).first()
+    if existing is not None:
+        return existing, False
+    filename = filename or os.path.basename(file.name or '')
+    document = Document(
+        sha256=digest, size=file.size, original_name=filename, kind=kind, uploaded_by=user,
+        content_type=guess_content_type(filename, content_type or getattr(file, 'content_type', None)),
+    )
+    return _save_document(document, file, filename)
+
+
+def _save_document(document, content, filename):
+    """Saves the row, writing the bytes only when no document holds this content yet."""
+    stored = Document.objects.filter(sha256=document.sha256).values_list('file', flat=True).first()
+    try:
+        with transaction.atomic():
+            if stored:
+                document.file.name = stored
+            else:
+                document.file.save(filename or document.sha256, content, save=False)
+            document.save()
+        return document, True
+    except IntegrityError:
+        # the same user finished the same content concurrently
+        return Document.objects.get(sha256=document.sha256, uploaded_by=document.uploaded_by), False
+
+
+# ------------------------------------------------
+# ✅ Chunked, resumable uploads
+# ------------------------------------------------
+def start_upload(user, filename, size, content_type=None, kind='other', sha256=''):
+    """
+    Returns (session, document). When the client sends the digest of a file
+    it already uploaded, no bytes need to be sent: that document is returned
+    and session is None. Content only someone else uploaded must still be sent
+    (a digest alone is no proof of having the file); complete_upload then
+    links it to the stored copy.
+    """
+    sha256 = (sha256 or '').lower()
+    if sha256:
+        existing = Document.objects.filter(sha256=sha256, uploaded_by=user).first()
+        if existing is not None:
+            return None, existing
+    max_size = getattr(settings, 'DOCUMENTS_MAX_UPLOAD_BYTES', None)
+    if max_size and size > max_size:
+        raise ValidationError(f"Uploads are limited to {max_size} bytes.")
+    session = UploadSession.objects.create(
+        created_by=user, filename=filename, size=size, kind=kind, sha256=sha256,
+        content_type=guess_content_type(filename, content_type),
+    )
+    os.makedirs(upload_dir(), exist_ok=True)
+    open(part_path(session), 'wb').close()
+    return session, None
+
+
+def append_chunk(session_id, offset, stream, length):
+    """
+    Writes `length` bytes from `stream` at `offset`, which must equal the bytes
+    already received. The session row stays locked while writing, so a
+    concurrent retry of the same chunk waits and then gets OffsetMismatch.
+    A chunk cut short by a dropped connection keeps the bytes that arrived.
+    """
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session_id)
+        if session.status != 'open':
+            raise ValidationError(f"Upload is {session.status}.")
+        if offset != session.received:
+            raise OffsetMismatch(session.received)
+        if session.received + length > session.size:
+            raise ValidationError(f"Chunk ends past the declared size of {session.size} bytes.")
+
+        written = 0
+        with open(part_path(session), 'r+b') as part:
+            # anything past `received` is a chunk whose offset never got committed
+            part.seek(offset)
+            part.truncate()
+            while written < length:
+                block = stream.read(min(BLOCK_SIZE, length - written))
+                if not block:
+                    break
+                part.write(block)
+                written += len(block)
+
+        session.received += written
+        session.save()
+    return session
+
+
+def _hash_part(path):
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as part:
+        for block in iter(lambda: part.read(BLOCK_SIZE), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def complete_upload(session_id):
+    """
+    Hashes the part file in one streaming pass and moves it into document
+    storage, or drops it if that content is already stored (a new document
+    on the stored file, unless the uploader already has one).
+    Returns (session, document, created).
+    """
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session_id)
+        if session.status == 'complete':
+            return session, session.document, False
+        if session.status != 'open':
+            raise ValidationError(f"Upload is {session.status}.")
+        if session.received != session.size:
+            raise ValidationError(f"Upload is incomplete: {session.received} of {session.size} bytes received.")
+
+        path = part_path(session)
+        digest = _hash_part(path)
+        if session.sha256 and digest != session.sha256:
+            raise ValidationError("Uploaded bytes do not match the expected SHA-256; restart the upload.")
+
+        document = Document.objects.filter(sha256=digest, uploaded_by=session.created_by).first()
+        created = False
+        if document is None:
+            document = Document(
+                sha256=digest, size=session.size, original_name=session.filename, kind=session.kind,
+                content_type=session.content_type, uploaded_by=session.created_by,
+            )
+            content = PartFile(path, digest)
+            try:
+                document, created = _save_document(document, content, session.filename)
+            finally:
+                content.close()
+        if os.path.exists(path):
+            os.remove(path)
+
+        session.status = 'complete'
+        session.document = document
+        session.save()
+    return session, document, created
+
+
+def abort_upload(session_id):
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session_id)
+        if session.status == 'open':
+            session.status = 'aborted'
+            session.save()
+        if os.path.exists(part_path(session)):
+            os.remove(part_path(session))
+    return session
+
+
+def purge_stale_uploads(older_than=timedelta(days=1)):
+    """Aborts open uploads untouched for `older_than` and deletes their part files."""
+    stale = UploadSession.objects.filter(status='open', updated_at__lt=timezone.now() - older_than)
+    count = 0
+    for session_id in stale.values_list('id', flat=True).iterator():
+        abort_upload(session_id)
+        count += 1
+    return count
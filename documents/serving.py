@@ -0,0 +1,99 @@
+#documents/serving.py
+"""
+Document downloads without streaming the bytes through Python where possible.
+
+DOCUMENTS_SENDFILE selects how:
+  'x-accel-redirect'  nginx serves the file from an `internal` location mapped
+                      to MEDIA_ROOT at DOCUMENTS_ACCEL_PREFIX (Range handled by nginx);
+  'x-sendfile'        Apache mod_xsendfile / lighttpd, given the absolute path;
+  ''                  Django serves it, honouring single `Range: bytes=` requests.
+"""
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+BLOCK_SIZE = 256 * 1024
+
+
+def parse_range(header, size):
+    """
+    (start, end) inclusive for a single satisfiable byte range, None to send
+    the whole file (no header, or several ranges), or False if unsatisfiable.
+    """
+    if not header:
+        return None
+    match = RANGE_RE.match(header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # suffix range: the last N bytes
+        length = int(last)
+        if not length:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return False
+    return start, end
+
+
+def _read_range(path, start, length):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            block = f.read(min(BLOCK_SIZE, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+
+
+def document_response(request, document, as_attachment=True):
+    etag = f'"{document.sha256}"'
+    mode = getattr(settings, 'DOCUMENTS_SENDFILE', '')
+    filename = document.original_name or os.path.basename(document.file.name)
+
+    if mode == 'x-accel-redirect':
+        response = HttpResponse(content_type=document.content_type)
+        prefix = getattr(settings, 'DOCUMENTS_ACCEL_PREFIX', '/protected-media/')
+        response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + document.file.name
+    elif mode == 'x-sendfile':
+        response = HttpResponse(content_type=document.content_type)
+        response['X-Sendfile'] = document.file.path
+    else:
+        if request.headers.get('If-None-Match') == etag:
+            response = HttpResponse(status=304)
+            response['ETag'] = etag
+            return response
+        # If-Range: only honour the range if the client's copy is this content
+        if_range = request.headers.get('If-Range')
+        byte_range = parse_range(request.headers.get('Range'), document.size)
+        if if_range and if_range != etag:
+            byte_range = None
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f"bytes */{document.size}"
+            return response
+        if byte_range is None:
+            response = FileResponse(open(document.file.path, 'rb'), content_type=document.content_type)
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(_read_range(document.file.path, start, end - start + 1),
+                                             status=206, content_type=document.content_type)
+            response['Content-Range'] = f"bytes {start}-{end}/{document.size}"
+            response['Content-Length'] = str(end - start + 1)
+        response['Accept-Ranges'] = 'bytes'
+
+    response['ETag'] = etag
+    # content-addressed: the bytes behind this URL never change
+    response['Cache-Control'] = 'private, max-age=31536000, immutable'
+    response['Content-Disposition'] = content_disposition_header(as_attachment, filename)
+    return response
@@ -1,3 +1,172 @@
-from django.test import TestCase
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import Permission
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from documents import extraction
+from documents.models import Document, DocumentPage
+from documents.search import search_documents
+from users.models import User
+
+CONTENT = b"%PDF-1.4 quarterly numbers"
+
+
+def make_client(username, **fields):
+    user = User.objects.create_user(username=username, password="Passw0rd!", email=f"{username}@gmail.com", **fields)
+    client = APIClient()
+    client.force_authenticate(user)
+    return user, client
+
+
+class DocumentTestCase(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root, DOCUMENTS_UPLOAD_DIR=os.path.join(media_root, ".uploads"),
+                                  DOCUMENTS_SENDFILE='')
+        media.enable()
+        self.addCleanup(media.disable)
+        self.alice, self.alice_client = make_client("alice")
+        self.bob, self.bob_client = make_client("bob")
+
+    def upload(self, client, content=CONTENT, name="q1.pdf"):
+        return client.post("/documents/", {"file": SimpleUploadedFile(name, content)}, format="multipart")
+
+
+# ------------------------------------------------
+# 🔹 Access to documents
+# ------------------------------------------------
+class DocumentAccessTests(DocumentTestCase):
+    def setUp(self):
+        super().setUp()
+        response = self.upload(self.alice_client)
+        self.assertEqual(response.status_code, 201, response.content)
+        self.document_id = response.json()["data"]["id"]
+
+    def test_only_uploader_reads_and_downloads(self):
+        self.assertEqual(self.alice_client.get(f"/documents/{self.document_id}").status_code, 200)
+        download = self.alice_client.get(f"/documents/{self.document_id}/download")
+        self.assertEqual(b"".join(download.streaming_content), CONTENT)
+        self.assertEqual(self.bob_client.get(f"/documents/{self.document_id}").status_code, 404)
+        self.assertEqual(self.bob_client.get(f"/documents/{self.document_id}/download").status_code, 404)
+
+    def test_staff_need_explicit_permission(self):
+        _, clerk = make_client("clerk", is_staff=True)
+        self.assertEqual(clerk.get(f"/documents/{self.document_id}").status_code, 404)
+        auditor, client = make_client("auditor", is_staff=True)
+        auditor.user_permissions.add(Permission.objects.get(codename="view_all_documents"))
+        self.assertEqual(client.get(f"/documents/{self.document_id}/download").status_code, 200)
+
+
+# ------------------------------------------------
+# 🔹 Content de-duplication
+# ------------------------------------------------
+class DocumentDedupTests(DocumentTestCase):
+    def test_same_user_gets_existing_document(self):
+        first = self.upload(self.alice_client).json()["data"]["id"]
+        again = self.upload(self.alice_client, name="copy.pdf")
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual(again.json()["data"]["id"], first)
+
+    def test_other_user_gets_own_document_on_stored_file(self):
+        alice_doc = self.upload(self.alice_client).json()["data"]["id"]
+        response = self.upload(self.bob_client, name="mine.pdf")
+        self.assertEqual(response.status_code, 201, response.content)
+        bob_doc = Document.objects.get(pk=response.json()["data"]["id"])
+        self.assertEqual(bob_doc.uploaded_by, self.bob)
+        self.assertEqual(bob_doc.original_name, "mine.pdf")
+        self.assertEqual(bob_doc.file.name, Document.objects.get(pk=alice_doc).file.name)
+        self.assertEqual(self.bob_client.get(f"/documents/{alice_doc}").status_code, 404)
+
+    def test_digest_alone_does_not_hand_out_another_users_document(self):
+        self.upload(self.alice_client)
+        body = {"filename": "q1.pdf", "size": len(CONTENT), "sha256": hashlib.sha256(CONTENT).hexdigest()}
+        self.assertEqual(self.alice_client.post("/documents/uploads", body, format="json").status_code, 200)
+
+        start = self.bob_client.post("/documents/uploads", body, format="json")
+        self.assertEqual(start.status_code, 201, start.content)
+        self.assertIsNone(start.json()["data"]["document"])
+        session = start.json()["data"]["session"]["id"]
+
+        chunk = self.bob_client.patch(f"/documents/uploads/{session}", CONTENT, content_type="application/offset+octet-stream",
+                                      HTTP_UPLOAD_OFFSET="0")
+        self.assertEqual(chunk.status_code, 200, chunk.content)
+        done = self.bob_client.post(f"/documents/uploads/{session}/complete")
+        self.assertEqual(done.status_code, 201, done.content)
+        self.assertEqual(Document.objects.get(pk=done.json()["data"]["id"]).uploaded_by, self.bob)
+        self.assertEqual(len(set(Document.objects.values_list("file", flat=True))), 1)
+
+
+# ------------------------------------------------
+# 🔹 Search
+# ------------------------------------------------
+class DocumentSearchTests(DocumentTestCase):
+    def document(self, user, name, pages, kind="invoice"):
+        document = Document.objects.create(sha256=hashlib.sha256(name.encode()).hexdigest(), size=1, file=f"documents/{name}",
+                                           original_name=name, kind=kind, uploaded_by=user)
+        DocumentPage.objects.bulk_create(DocumentPage(document=document, number=n, text=text)
+                                         for n, text in enumerate(pages, 1))
+        return document
+
+    def test_results_limited_to_visible_documents(self):
+        self.document(self.alice, "alice.pdf", ["Acme invoice"])
+        mine = self.document(self.bob, "bob.pdf", ["cover", "Acme invoice"])
+        response = self.bob_client.get("/documents/search?q=acme")
+        self.assertEqual(response.status_code, 200)
+        hits = response.json()["data"]
+        self.assertEqual([hit["id"] for hit in hits], [str(mine.pk)])
+        self.assertEqual((hits[0]["page"], hits[0]["pages"]), (2, [2]))
+        self.assertTrue(hits[0]["url"].endswith("?inline=1#page=2"))
+
+    def test_many_matching_pages_do_not_crowd_out_documents(self):
+        long = self.document(self.alice, "long.pdf", ["acme"] * 12)
+        short = self.document(self.alice, "short.pdf", ["acme"])
+        hits = search_documents("acme", self.alice, limit=2)
+        self.assertEqual({hit["id"] for hit in hits}, {long.pk, short.pk})
+        self.assertEqual(next(hit for hit in hits if hit["id"] == long.pk)["pages"], list(range(1, 13)))
+        self.assertEqual(search_documents("acme", self.alice, limit=2, kind="receipt"), [])
+
+
+# ------------------------------------------------
+# 🔹 Text extraction
+# ------------------------------------------------
+class ExtractionTests(DocumentTestCase):
+    def document(self, user, content, text_status="pending"):
+        digest = hashlib.sha256(content).hexdigest()
+        return Document.objects.create(sha256=digest, size=len(content), file=f"documents/{digest}.pdf",
+                                       content_type="application/pdf", uploaded_by=user, text_status=text_status)
+
+    def pages(self, document):
+        return list(document.pages.order_by("number").values_list("text", flat=True))
+
+    def test_each_file_parsed_once(self):
+        indexed = self.document(self.alice, b"old")
+        DocumentPage.objects.create(document=indexed, number=1, text="old text")
+        Document.objects.filter(pk=indexed.pk).update(text_status="done")
+        copy_of_indexed = self.document(self.bob, b"old")
+        shared = [self.document(self.alice, b"new"), self.document(self.bob, b"new")]
+
+        with mock.patch.object(extraction, "django_process_pool", lambda workers: ThreadPoolExecutor(workers)), \
+                mock.patch.object(extraction, "extract_pdf_text", return_value=["p1", "p2"]) as extract:
+            counts = extraction.index_pending(workers=2)
+        extract.assert_called_once()
+        self.assertEqual(counts, {"done": 3, "failed": 0, "skipped": 0, "pages": 5})
+        self.assertEqual(self.pages(copy_of_indexed), ["old text"])
+        for document in shared:
+            self.assertEqual(self.pages(document), ["p1", "p2"])
+
+    def test_slow_extraction_times_out(self):
+        with mock.patch.object(extraction, "extract_pdf_text", side_effect=lambda path: time.sleep(5)):
+            started = time.monotonic()
+            document_id, pages, error = extraction._extract("d1", "x.pdf", timeout=0.2)
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertIsNone(pages)
+        self.assertTrue(error.startswith("ExtractionTimeout"), error)
@@ -0,0 +1,13 @@
+# documents/urls.py
+from django.urls import path
+from .views import *
+
+urlpatterns = [
+    path('', DocumentUploadView.as_view(), name='document-upload'),
+    path('search', DocumentSearchView.as_view(), name='document-search'),
+    path('uploads', UploadSessionCreateView.as_view(), name='upload-create'),
+    path('uploads/<uuid:pk>', UploadSessionView.as_view(), name='upload-session'),
+    path('uploads/<uuid:pk>/complete', UploadCompleteView.as_view(), name='upload-complete'),
+    path('<uuid:pk>', DocumentDetailView.as_view(), name='document-detail'),
+    path('<uuid:pk>/download', DocumentDownloadView.as_view(), name='document-download'),
+]
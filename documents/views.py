@@ -1,3 +1,177 @@
-from django.shortcuts import render
+#documents/views.py
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from rest_framework import generics
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from core.status import *
+from documents.models import UploadSession
+from documents.serializers import (
+    DocumentSerializer, DocumentUploadSerializer, UploadSessionSerializer, UploadStartSerializer,
+)
+from documents.search import search_documents
+from documents.serving import document_response
+from documents.services import (
+    OffsetMismatch, abort_upload, append_chunk, complete_upload, start_upload, store_file, visible_documents,
+)
 
-# Create your views here.
+
+# ------------------------------------------------
+# ✅ Single-request upload (small files)
+# ------------------------------------------------
+class DocumentUploadView(generics.GenericAPIView):
+    serializer_class = DocumentUploadSerializer
+    parser_classes = [MultiPartParser]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        document, created = store_file(serializer.validated_data['file'], user=request.user,
+                                       kind=serializer.validated_data['kind'])
+        return Response({
+            "message": "Document uploaded." if created else "Document already stored.",
+            "data": DocumentSerializer(document).data
+        }, status=S201 if created else S200)
+
+
+# ------------------------------------------------
+# ✅ Chunked, resumable upload
+# ------------------------------------------------
+class UploadSessionCreateView(generics.GenericAPIView):
+    """
+    POST {filename, size, content_type?, kind?, sha256?} -> upload session.
+    If `sha256` names content this user already uploaded, their document is
+    returned straight away and nothing needs to be sent.
+    """
+    serializer_class = UploadStartSerializer
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            session, document = start_upload(request.user, **serializer.validated_data)
+        except ValidationError as e:
+            return Response({"error": e.messages[0]}, status=S400)
+        if document is not None:
+            return Response({"message": "Document already stored.", "data": {
+                "session": None, "document": DocumentSerializer(document).data}}, status=S200)
+        response = Response({"message": "Upload started.", "data": {
+            "session": UploadSessionSerializer(session).data, "document": None}}, status=S201)
+        response['Upload-Offset'] = '0'
+        return response
+
+
+class UploadSessionView(generics.GenericAPIView):
+    """
+    HEAD/GET: the current `Upload-Offset` to resume from.
+    PATCH: raw bytes (Content-Length) written at the `Upload-Offset` header;
+           409 with the server's offset if it does not match.
+    DELETE: abort and drop the bytes received so far.
+    """
+    serializer_class = UploadSessionSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return UploadSession.objects.filter(created_by=self.request.user)
+
+    def _response(self, session, status=S200, message=None):
+        data = {"data": UploadSessionSerializer(session).data}
+        if message:
+            data = {"message": message, **data}
+        response = Response(data, status=status)
+        response['Upload-Offset'] = str(session.received)
+        response['Cache-Control'] = 'no-store'
+        return response
+
+    def get(self, request, *args, **kwargs):
+        return self._response(self.get_object())
+
+    def head(self, request, *args, **kwargs):
+        return self.get(request, *args, **kwargs)
+
+    def patch(self, request, *args, **kwargs):
+        session = self.get_object()
+        try:
+            offset = int(request.headers['Upload-Offset'])
+            length = int(request.headers['Content-Length'])
+        except (KeyError, ValueError):
+            return Response({"error": "Upload-Offset and Content-Length headers are required."}, status=S400)
+        max_chunk = getattr(settings, 'DOCUMENTS_MAX_CHUNK_BYTES', None)
+        if max_chunk and length > max_chunk:
+            return Response({"error": f"Chunks are limited to {max_chunk} bytes."}, status=S400)
+
+        try:
+            session = append_chunk(session.pk, offset, request.stream, length)
+        except OffsetMismatch as e:
+            response = Response({"error": e.messages[0], "offset": e.offset}, status=S409)
+            response['Upload-Offset'] = str(e.offset)
+            return response
+        except ValidationError as e:
+            return Response({"error": e.messages[0]}, status=S400)
+        return self._response(session)
+
+    def delete(self, request, *args, **kwargs):
+        session = abort_upload(self.get_object().pk)
+        return self._response(session, message="Upload aborted.")
+
+
+class UploadCompleteView(generics.GenericAPIView):
+    serializer_class = UploadSessionSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return UploadSession.objects.filter(created_by=self.request.user)
+
+    def post(self, request, *args, **kwargs):
+        try:
+            session, document, created = complete_upload(self.get_object().pk)
+        except ValidationError as e:
+            return Response({"error": e.messages[0]}, status=S400)
+        return Response({
+            "message": "Document uploaded." if created else "Document already stored.",
+            "data": DocumentSerializer(document).data
+        }, status=S201 if created else S200)
+
+
+# ------------------------------------------------
+# ✅ Documents
+# ------------------------------------------------
+class DocumentDetailView(generics.RetrieveAPIView):
+    serializer_class = DocumentSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return visible_documents(self.request.user)
+
+
+class DocumentDownloadView(generics.GenericAPIView):
+    """Range requests, or X-Accel-Redirect / X-Sendfile per DOCUMENTS_SENDFILE (documents/serving.py)."""
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return visible_documents(self.request.user)
+
+    def get(self, request, pk, *args, **kwargs):
+        document = get_object_or_404(self.get_queryset(), pk=pk)
+        return document_response(request, document, as_attachment=request.query_params.get('inline') != '1')
+
+
+class DocumentSearchView(generics.GenericAPIView):
+    """GET ?q=acme "INV-2024-0012"&kind=invoice&limit=20 -> documents with the pages that match."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+        except ValueError:
+            return Response({"error": "limit must be an integer."}, status=S400)
+        hits = search_documents(request.query_params.get('q', ''), request.user, limit=limit,
+                                kind=request.query_params.get('kind') or None)
+        for hit in hits:
+            hit['url'] = f"{reverse('document-download', args=[hit['id']])}?inline=1#page={hit['page']}"
+        return Response({"data": hits})
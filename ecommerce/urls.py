@@ -0,0 +1,8 @@
+# ecommerce/urls.py
+from django.urls import path
+from .views import *
+
+urlpatterns = [
+    path('search', StorefrontSearchView.as_view(), name='store-search'),
+    path('autocomplete', StorefrontAutocompleteView.as_view(), name='store-autocomplete'),
+]
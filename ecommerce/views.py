@@ -1,3 +1,15 @@
-from django.shortcuts import render
+#ecommerce/views.py
+from rest_framework.permissions import AllowAny
+from inventory.views import ProductSearchView, ProductAutocompleteView
 
-# Create your views here.
+
+# ------------------------------------------------
+# ✅ Storefront search (public, active products only)
+# ------------------------------------------------
+class StorefrontSearchView(ProductSearchView):
+    permission_classes = [AllowAny]
+    active_only = True
+
+
+class StorefrontAutocompleteView(ProductAutocompleteView):
+    permission_classes = [AllowAny]
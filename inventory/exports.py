@@ -0,0 +1,15 @@
+#inventory/exports.py
+from core.exports import Export, register
+from inventory.models import StockMovement
+
+register(Export('stock_movements', StockMovement.objects.order_by('created_at', 'id'), [
+    ('ID', 'id'),
+    ('At', 'created_at'),
+    ('SKU', 'product__sku'),
+    ('Location', 'location__code'),
+    ('Condition', 'condition'),
+    ('Type', 'type'),
+    ('Quantity', 'quantity'),
+    ('Reference', 'reference'),
+    ('Note', 'note'),
+], filters={'from': 'created_at__gte', 'to': 'created_at__lt', 'type': 'type'}))
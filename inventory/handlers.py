@@ -0,0 +1,17 @@
+#inventory/handlers.py
+from core.outbox import handles
+from inventory.models import StockMovement
+from inventory.services import fulfil
+
+
+# ------------------------------------------------
+# 🔹 Outbox handlers
+# ------------------------------------------------
+@handles('sales_order.fulfilled')
+def consume_reserved_stock(event):
+    """Turns the order's reservations into sale movements (once per order)."""
+    order_id = event.payload['order_id']
+    if StockMovement.objects.filter(reference=order_id, type='sale').exists():
+        return
+    for line in sorted(event.payload['lines'], key=lambda l: (l['product_id'], l['location_id'], l['condition'])):
+        fulfil(line['product_id'], line['location_id'], line['quantity'], line['condition'], reference=order_id)
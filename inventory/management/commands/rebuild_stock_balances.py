@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from inventory.models import Product, StockBalance, StockMovement
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes StockBalance.on_hand from the StockMovement ledger, a chunk of "
+        "products at a time. Reservations are left as they are."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=500, help="Products per transaction")
+        parser.add_argument("--dry-run", action="store_true", help="Report drift without writing")
+
+    def handle(self, *args, **options):
+        product_ids = (Product.objects.order_by("id")
+                       .values_list("id", flat=True)
+                       .iterator(chunk_size=options["chunk_size"]))
+        chunk, fixed, chunks = [], 0, 0
+        for product_id in product_ids:
+            chunk.append(product_id)
+            if len(chunk) == options["chunk_size"]:
+                fixed += self.rebuild_chunk(chunk, options["dry_run"])
+                chunks += 1
+                chunk = []
+        if chunk:
+            fixed += self.rebuild_chunk(chunk, options["dry_run"])
+            chunks += 1
+
+        verb = "would fix" if options["dry_run"] else "fixed"
+        self.stdout.write(self.style.SUCCESS(f"{chunks} chunks processed, {verb} {fixed} balances"))
+
+    def rebuild_chunk(self, product_ids, dry_run):
+        with transaction.atomic():
+            # Lock the existing rows first: movements committed before the lock are
+            # in the SUM below, later ones block on the lock and apply their F()
+            # increment on top of the rebuilt value.
+            balances = {
+                (b.product_id, b.location_id, b.condition): b
+                for b in StockBalance.objects.select_for_update().filter(product_id__in=product_ids)
+            }
+            totals = (StockMovement.objects.filter(product_id__in=product_ids)
+                      .values("product_id", "location_id", "condition")
+                      .annotate(total=Sum("quantity")))
+
+            now = timezone.now()
+            to_update, to_create = [], []
+            for row in totals:
+                key = (row["product_id"], row["location_id"], row["condition"])
+                balance = balances.pop(key, None)
+                if balance is None:
+                    to_create.append(StockBalance(product_id=key[0], location_id=key[1],
+                                                  condition=key[2], on_hand=row["total"]))
+                elif balance.on_hand != row["total"]:
+                    balance.on_hand, balance.updated_at = row["total"], now
+                    to_update.append(balance)
+            # balances with no ledger rows at all
+            for balance in balances.values():
+                if balance.on_hand:
+                    balance.on_hand, balance.updated_at = 0, now
+                    to_update.append(balance)
+
+            if not dry_run:
+                StockBalance.objects.bulk_update(to_update, ["on_hand", "updated_at"])
+                StockBalance.objects.bulk_create(to_create, ignore_conflicts=True)
+        return len(to_update) + len(to_create)
@@ -0,0 +1,17 @@
+# pg_trgm must exist before the product_name_trgm / product_sku_trgm indexes
+# (gin_trgm_ops) are created; makemigrations never emits extension operations,
+# so it lives in its own migration that everything after it depends on.
+# A no-op on databases other than PostgreSQL.
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        TrigramExtension(),
+    ]
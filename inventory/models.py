@@ -1,3 +1,156 @@
-from django.db import models
+#inventory/models.py
+from django.db import models, connection
+from django.core.exceptions import ValidationError
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from core.models import Base
 
-# Create your models here.
+SEARCH_FIELDS = ('sku', 'barcode', 'name', 'description')
+
+
+def product_search_vector():
+    """tsvector expression: codes and name rank above the description."""
+    return (
+        SearchVector('sku', weight='A', config='simple')
+        + SearchVector('barcode', weight='A', config='simple')
+        + SearchVector('name', weight='B', config='english')
+        + SearchVector('description', weight='C', config='english')
+    )
+
+
+class Product(Base):
+    sku = models.CharField(max_length=64, unique=True)
+    barcode = models.CharField(max_length=64, blank=True, null=True, unique=True)
+    name = models.CharField(max_length=255)
+    description = models.TextField(blank=True, null=True)
+    price = models.DecimalField(max_digits=12, decimal_places=2, default=0)  # unit selling price at checkout
+    is_active = models.BooleanField(default=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        db_table = 'product'
+        # trigram indexes need pg_trgm: migrations/0001_pg_trgm.py creates it, so generated
+        # migrations that add these indexes depend on it
+        indexes = [
+            GinIndex(fields=['search_vector'], name='product_search_gin'),
+            GinIndex(fields=['name'], opclasses=['gin_trgm_ops'], name='product_name_trgm'),
+            GinIndex(fields=['sku'], opclasses=['gin_trgm_ops'], name='product_sku_trgm'),
+        ]
+
+    def __str__(self):
+        return f"{self.sku} - {self.name}"
+
+    def save(self, *args, **kwargs):
+        reindex = self._state.adding or any(
+            field in self.get_dirty_fields() for field in SEARCH_FIELDS
+        )
+        super().save(*args, **kwargs)
+        if reindex:
+            refresh_search_vectors(Product.objects.filter(pk=self.pk))
+
+
+def refresh_search_vectors(queryset):
+    """Recomputes search_vector in SQL for the given products (after bulk writes too)."""
+    if connection.vendor == 'postgresql':
+        queryset.update(search_vector=product_search_vector())
+
+
+class Location(Base):
+    """A warehouse, branch store or van holding stock."""
+    TYPE_CHOICES = [
+        ('warehouse', 'Warehouse'),
+        ('store', 'Store'),
+        ('van', 'Van'),
+    ]
+
+    code = models.CharField(max_length=32, unique=True)
+    name = models.CharField(max_length=255)
+    type = models.CharField(max_length=20, choices=TYPE_CHOICES, default='warehouse')
+
+    class Meta:
+        db_table = 'location'
+
+    def __str__(self):
+        return f"{self.code} - {self.name}"
+
+
+CONDITION_CHOICES = [
+    ('new', 'New'),
+    ('used', 'Used'),
+    ('refurbished', 'Refurbished'),
+    ('damaged', 'Damaged'),
+]
+
+
+class StockMovement(Base):
+    """
+    Append-only stock ledger: one signed quantity per movement.
+    Rows are never updated or deleted; corrections are new 'adjustment' rows.
+    """
+    TYPE_CHOICES = [
+        ('receipt', 'Receipt'),
+        ('sale', 'Sale'),
+        ('return', 'Return'),
+        ('adjustment', 'Adjustment'),
+        ('transfer_in', 'Transfer In'),
+        ('transfer_out', 'Transfer Out'),
+    ]
+
+    product = models.ForeignKey(Product, on_delete=models.PROTECT, related_name="movements")
+    location = models.ForeignKey(Location, on_delete=models.PROTECT, related_name="movements")
+    condition = models.CharField(max_length=20, choices=CONDITION_CHOICES, default='new')
+    quantity = models.IntegerField(help_text="Positive adds stock, negative removes it")
+    type = models.CharField(max_length=20, choices=TYPE_CHOICES)
+    reference = models.CharField(max_length=64, blank=True, default='', help_text="Order / document id")
+    note = models.CharField(max_length=255, blank=True, default='')
+
+    class Meta:
+        db_table = 'stock_movement'
+        indexes = [
+            models.Index(fields=['product', 'location', 'condition'], name='stock_mv_key_idx'),
+            models.Index(fields=['reference'], name='stock_mv_reference_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.type} {self.quantity:+d} {self.product_id} @ {self.location_id}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValidationError("Stock movements are append-only.")
+        if not self.quantity:
+            raise ValidationError("Stock movement quantity cannot be zero.")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValidationError("Stock movements are append-only.")
+
+
+class StockBalance(Base):
+    """
+    Materialized on-hand / reserved per (product, location, condition),
+    kept in step with the ledger by inventory.services using F() updates.
+    Reading stock is a single lookup on the unique key.
+    """
+    product = models.ForeignKey(Product, on_delete=models.PROTECT, related_name="balances")
+    location = models.ForeignKey(Location, on_delete=models.PROTECT, related_name="balances")
+    condition = models.CharField(max_length=20, choices=CONDITION_CHOICES, default='new')
+    on_hand = models.IntegerField(default=0)
+    reserved = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'stock_balance'
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'location', 'condition'], name='stock_balance_key'),
+            models.CheckConstraint(condition=models.Q(on_hand__gte=0), name='stock_balance_on_hand_gte_0'),
+            models.CheckConstraint(
+                condition=models.Q(reserved__gte=0, reserved__lte=models.F('on_hand')),
+                name='stock_balance_reserved_within_on_hand',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id} @ {self.location_id} ({self.condition}): {self.on_hand}/{self.reserved}"
+
+    @property
+    def available(self):
+        return self.on_hand - self.reserved
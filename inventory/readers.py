@@ -0,0 +1,11 @@
+#inventory/readers.py
+from core.readers import Schema
+from inventory.models import Product
+
+
+# ------------------------------------------------
+# ✅ Read schemas (same output as the serializers, over .values())
+# ------------------------------------------------
+class ProductRead(Schema):
+    model = Product
+    fields = ('id', 'sku', 'barcode', 'name', 'description', 'is_active', 'created_at', 'updated_at')
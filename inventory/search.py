@@ -0,0 +1,236 @@
+#inventory/search.py
+import bisect
+import logging
+import re
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db import close_old_connections, connection
+from django.db.models import F, Q
+from django.utils import timezone
+
+from inventory.models import Product
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+TRIE_FIELDS = ('id', 'sku', 'barcode', 'name', 'is_active', 'updated_at')
+
+
+def normalize(text):
+    return (text or '').strip().lower()
+
+
+# ------------------------------------------------
+# ✅ Catalog search (Postgres tsvector + trigram)
+# ------------------------------------------------
+def search_products(query, limit=20, active_only=False):
+    """
+    1. exact SKU / barcode hit (unique btree lookup) for scanners and in-store lookup;
+    2. full-text match on search_vector (GIN), ranked;
+    3. trigram similarity on name/sku (GIN gin_trgm_ops) to absorb typos.
+    """
+    query = (query or '').strip()
+    if not query:
+        return []
+    products = Product.objects.filter(is_active=True) if active_only else Product.objects.all()
+    products = products.defer('search_vector')
+
+    exact = list(products.filter(Q(sku=query) | Q(barcode=query))[:1])
+    if exact:
+        return exact
+
+    if connection.vendor != 'postgresql':
+        return list(products.filter(name__icontains=query)[:limit])
+
+    ts_query = SearchQuery(query, search_type='websearch', config='english')
+    hits = list(
+        products.filter(search_vector=ts_query)
+        .annotate(rank=SearchRank(F('search_vector'), ts_query))
+        .order_by('-rank')[:limit]
+    )
+    if hits:
+        return hits
+
+    return list(
+        products.annotate(similarity=TrigramSimilarity('name', query))
+        .filter(Q(name__trigram_similar=query) | Q(sku__trigram_similar=query))
+        .order_by('-similarity')[:limit]
+    )
+
+
+# ------------------------------------------------
+# ✅ Prefix autocomplete
+# ------------------------------------------------
+class CatalogTrie:
+    """
+    In-memory prefix index over product name tokens and SKUs.
+
+    Stored as sorted vocabularies bucketed by term length plus postings
+    (term -> product ids): a prefix's subtree is a contiguous range in each
+    bucket, found with two bisects, and walking the buckets shortest first
+    stops as soon as `limit` products are found, so a one-letter prefix does
+    not sort the whole vocabulary. A node-per-character trie does not fit a
+    million SKUs in a Python process; this keeps one entry per distinct term.
+
+    Loaded and refreshed off the request path: `schedule_refresh()` starts at
+    most one background `refresh()` per process. post_save/post_delete in this
+    process update it directly; rows changed in other processes are pulled by
+    `updated_at`, re-reading CATALOG_TRIE_SYNC_OVERLAP seconds before the
+    watermark, because updated_at is stamped before commit and a slow
+    transaction can commit a row older than rows already seen. Deletes and
+    deactivations made elsewhere leave no newer row to pull, so every
+    CATALOG_TRIE_REBUILD_SECONDS the refresh is a full rebuild instead.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._buckets = {}        # term length -> sorted distinct terms
+        self._postings = {}       # term -> set(product_id)
+        self._product_terms = {}  # product_id -> frozenset(terms)
+        self._watermark = None
+        self._last_sync = 0.0
+        self._last_rebuild = 0.0
+        self._refreshing = False
+
+    @property
+    def is_loaded(self):
+        return self._watermark is not None
+
+    @staticmethod
+    def terms_for(product):
+        terms = set(TOKEN_RE.findall(normalize(product.name)))
+        terms.add(normalize(product.sku))
+        if product.barcode:
+            terms.add(normalize(product.barcode))
+        return frozenset(t for t in terms if t)
+
+    def _remove(self, product_id):
+        for term in self._product_terms.pop(product_id, ()):
+            ids = self._postings.get(term)
+            if ids is None:
+                continue
+            ids.discard(product_id)
+            if not ids:
+                del self._postings[term]
+                bucket = self._buckets[len(term)]
+                i = bisect.bisect_left(bucket, term)
+                if i < len(bucket) and bucket[i] == term:
+                    bucket.pop(i)
+                if not bucket:
+                    del self._buckets[len(term)]
+
+    def update(self, product):
+        with self._lock:
+            self._remove(product.pk)
+            if not product.is_active:
+                return
+            terms = self.terms_for(product)
+            self._product_terms[product.pk] = terms
+            for term in terms:
+                ids = self._postings.get(term)
+                if ids is None:
+                    self._postings[term] = ids = set()
+                    bisect.insort(self._buckets.setdefault(len(term), []), term)
+                ids.add(product.pk)
+
+    def remove(self, product_id):
+        with self._lock:
+            self._remove(product_id)
+
+    def complete(self, prefix, limit=10):
+        """Product ids whose name token or SKU starts with `prefix`, shortest terms first."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        seen = []
+        with self._lock:
+            for length in sorted(n for n in self._buckets if n >= len(prefix)):
+                bucket = self._buckets[length]
+                i = bisect.bisect_left(bucket, prefix)
+                while i < len(bucket) and bucket[i].startswith(prefix):
+                    for product_id in self._postings[bucket[i]]:
+                        if product_id not in seen:
+                            seen.append(product_id)
+                            if len(seen) >= limit:
+                                return seen
+                    i += 1
+        return seen
+
+    # ---- loading ----
+    def rebuild(self, chunk_size=5000):
+        fresh = CatalogTrie()
+        started = time.time()
+        watermark = timezone.now()  # taken before the read; later commits are pulled by the next refresh
+        rows = Product.objects.filter(is_active=True).only(*TRIE_FIELDS)
+        for product in rows.iterator(chunk_size=chunk_size):
+            fresh.update(product)
+        with self._lock:
+            self._buckets, self._postings, self._product_terms = fresh._buckets, fresh._postings, fresh._product_terms
+            self._watermark, self._last_sync, self._last_rebuild = watermark, started, started
+
+    def _apply_changes(self):
+        overlap = timedelta(seconds=getattr(settings, 'CATALOG_TRIE_SYNC_OVERLAP', 120))
+        self._last_sync = time.time()
+        changed = (Product.objects.filter(updated_at__gt=self._watermark - overlap)
+                   .only(*TRIE_FIELDS).order_by('updated_at'))
+        for product in changed.iterator(chunk_size=2000):
+            self.update(product)  # idempotent, so rows re-read in the overlap are harmless
+            self._watermark = max(self._watermark, product.updated_at)
+
+    def refresh(self):
+        """
+        Full load on first use and every CATALOG_TRIE_REBUILD_SECONDS, otherwise
+        rows changed since the watermark (minus the overlap).
+        """
+        rebuild_every = getattr(settings, 'CATALOG_TRIE_REBUILD_SECONDS', 3600)
+        with self._refresh_lock:
+            if self._watermark is None or time.time() - self._last_rebuild >= rebuild_every:
+                self.rebuild()
+            else:
+                self._apply_changes()
+
+    def _refresh_in_background(self):
+        try:
+            self.refresh()
+        except Exception:
+            logger.exception("Catalog autocomplete refresh failed")
+        finally:
+            with self._lock:
+                self._refreshing = False
+                self._last_sync = max(self._last_sync, time.time())
+            close_old_connections()
+
+    def schedule_refresh(self, max_age=None):
+        """Starts refresh() on a daemon thread when due, unless one is already running."""
+        max_age = getattr(settings, 'CATALOG_TRIE_SYNC_SECONDS', 30) if max_age is None else max_age
+        with self._lock:
+            if self._refreshing or time.time() - self._last_sync < max_age:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh_in_background, name='catalog-trie', daemon=True).start()
+
+
+catalog_trie = CatalogTrie()
+
+
+def autocomplete(prefix, limit=10):
+    """Served from the trie once this process has loaded it; a prefix query until then."""
+    catalog_trie.schedule_refresh()
+    if not catalog_trie.is_loaded:
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        return list(
+            Product.objects.filter(is_active=True)
+            .filter(Q(name__istartswith=prefix) | Q(sku__istartswith=prefix) | Q(barcode=prefix))
+            .only('id', 'sku', 'name').order_by('name')[:limit]
+        )
+    ids = catalog_trie.complete(prefix, limit)
+    products = Product.objects.filter(pk__in=ids).only('id', 'sku', 'name')
+    by_id = {p.pk: p for p in products}
+    return [by_id[i] for i in ids if i in by_id]
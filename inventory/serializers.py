@@ -0,0 +1,19 @@
+#inventory/serializers.py
+from rest_framework import serializers
+from inventory.models import Product
+
+
+# ------------------------------------------------
+# ✅ Product Serializers
+# ------------------------------------------------
+class ProductSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Product
+        fields = ['id', 'sku', 'barcode', 'name', 'description', 'price', 'is_active', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'created_at', 'updated_at']
+
+
+class ProductSuggestionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Product
+        fields = ['id', 'sku', 'name']
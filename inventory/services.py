@@ -0,0 +1,135 @@
+#inventory/services.py
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from inventory.models import StockBalance, StockMovement
+
+
+class InsufficientStock(Exception):
+    pass
+
+
+def _key(product_id, location_id, condition):
+    return {'product_id': product_id, 'location_id': location_id, 'condition': condition}
+
+
+def _apply_delta(product_id, location_id, condition, on_hand=0, reserved=0):
+    """Atomic F() increment of one balance row, creating the row on first use."""
+    changes = {'on_hand': F('on_hand') + on_hand, 'reserved': F('reserved') + reserved,
+               'updated_at': timezone.now()}
+    key = _key(product_id, location_id, condition)
+    try:
+        with transaction.atomic():
+            if not StockBalance.objects.filter(**key).update(**changes):
+                StockBalance.objects.get_or_create(**key)
+                StockBalance.objects.filter(**key).update(**changes)
+    except IntegrityError as e:
+        # check constraints: on_hand >= 0 and 0 <= reserved <= on_hand
+        raise InsufficientStock(f"Not enough stock for {product_id} at {location_id} ({condition})") from e
+
+
+# ------------------------------------------------
+# ✅ Ledger writes
+# ------------------------------------------------
+def record_movement(product_id, location_id, quantity, movement_type, condition='new', reference='', note=''):
+    """Appends one movement and applies it to the balance in the same transaction."""
+    with transaction.atomic():
+        movement = StockMovement.objects.create(
+            product_id=product_id, location_id=location_id, condition=condition,
+            quantity=quantity, type=movement_type, reference=reference, note=note,
+        )
+        _apply_delta(product_id, location_id, condition, on_hand=quantity)
+    return movement
+
+
+def record_movements(movements):
+    """
+    Bulk variant for high-volume feeds: one bulk_create for the ledger rows,
+    then one F() update per distinct key, applied in sorted key order so
+    concurrent batches lock balance rows in the same order.
+    `movements` are unsaved StockMovement instances.
+    """
+    deltas = defaultdict(int)
+    for movement in movements:
+        if not movement.quantity:
+            raise ValueError("Stock movement quantity cannot be zero.")
+        deltas[(str(movement.product_id), str(movement.location_id), movement.condition)] += movement.quantity
+
+    with transaction.atomic():
+        created = StockMovement.objects.bulk_create(movements)
+        for (product_id, location_id, condition), delta in sorted(deltas.items()):
+            if delta:
+                _apply_delta(product_id, location_id, condition, on_hand=delta)
+    return created
+
+
+def transfer(product_id, from_location_id, to_location_id, quantity, condition='new', reference=''):
+    with transaction.atomic():
+        record_movements([
+            StockMovement(product_id=product_id, location_id=from_location_id, condition=condition,
+                          quantity=-quantity, type='transfer_out', reference=reference),
+            StockMovement(product_id=product_id, location_id=to_location_id, condition=condition,
+                          quantity=quantity, type='transfer_in', reference=reference),
+        ])
+
+
+# ------------------------------------------------
+# ✅ Reads (single indexed lookup, never a SUM over history)
+# ------------------------------------------------
+def get_balance(product_id, location_id, condition='new'):
+    """Returns (on_hand, reserved); (0, 0) when the key has never moved."""
+    row = (StockBalance.objects.filter(**_key(product_id, location_id, condition))
+           .values_list('on_hand', 'reserved').first())
+    return tuple(row) if row else (0, 0)
+
+
+def on_hand(product_id, location_id, condition='new'):
+    return get_balance(product_id, location_id, condition)[0]
+
+
+# ------------------------------------------------
+# ✅ Reservations
+# ------------------------------------------------
+def reserve(product_id, quantity, condition='new', location_ids=None):
+    """
+    Reserves `quantity` from the first balance row (optionally limited to
+    `location_ids`, tried in that order) that has enough available stock.
+    Rows locked by concurrent reservations are skipped (SKIP LOCKED) instead
+    of waited on, so parallel checkouts fan out across locations.
+    Returns the location id the stock was reserved at.
+    """
+    with transaction.atomic():
+        candidates = (StockBalance.objects
+                      .select_for_update(skip_locked=True)
+                      .filter(product_id=product_id, condition=condition,
+                              on_hand__gte=F('reserved') + quantity))
+        if location_ids is not None:
+            candidates = candidates.filter(location_id__in=location_ids)
+        rows = {str(row.location_id): row for row in candidates.only('id', 'location_id')}
+        order = [str(l) for l in location_ids] if location_ids is not None else sorted(rows)
+        for location_id in order:
+            row = rows.get(location_id)
+            if row is not None:
+                StockBalance.objects.filter(pk=row.pk).update(
+                    reserved=F('reserved') + quantity, updated_at=timezone.now())
+                return row.location_id
+    raise InsufficientStock(f"Cannot reserve {quantity} of {product_id} ({condition})")
+
+
+def release(product_id, location_id, quantity, condition='new'):
+    """Gives back a reservation that will not be fulfilled."""
+    _apply_delta(product_id, location_id, condition, reserved=-quantity)
+
+
+def fulfil(product_id, location_id, quantity, condition='new', reference=''):
+    """Turns a reservation into a sale: ledger row plus on_hand and reserved decrement."""
+    with transaction.atomic():
+        movement = StockMovement.objects.create(
+            product_id=product_id, location_id=location_id, condition=condition,
+            quantity=-quantity, type='sale', reference=reference,
+        )
+        _apply_delta(product_id, location_id, condition, on_hand=-quantity, reserved=-quantity)
+    return movement
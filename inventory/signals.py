@@ -0,0 +1,20 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from inventory.models import Product
+from inventory.search import catalog_trie
+
+
+# ------------------------------------------------
+# 🔹 Keep this process's autocomplete index in step with product writes
+# ------------------------------------------------
+@receiver(post_save, sender=Product)
+def index_product(sender, instance, **kwargs):
+    if catalog_trie.is_loaded:
+        catalog_trie.update(instance)
+
+
+@receiver(post_delete, sender=Product)
+def unindex_product(sender, instance, **kwargs):
+    if catalog_trie.is_loaded:
+        catalog_trie.remove(instance.pk)
@@ -1,3 +1,153 @@
-from django.test import TestCase
+import io
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core.testing import QueryCountMixin
+from inventory import search, services, signals
+from inventory.models import Location, Product, StockBalance, StockMovement
+from users.models import User
+
+
+def make_catalog():
+    product = Product.objects.create(sku="LAP-1", name="Laptop")
+    main = Location.objects.create(code="W1", name="Main")
+    store = Location.objects.create(code="S1", name="Store", type="store")
+    return product, main, store
+
+
+# ------------------------------------------------
+# 🔹 Stock ledger and balances
+# ------------------------------------------------
+class StockLedgerTests(TestCase):
+    def setUp(self):
+        self.product, self.main, self.store = make_catalog()
+        services.record_movement(self.product.pk, self.main.pk, 10, "receipt")
+
+    def test_movements_update_balances(self):
+        services.transfer(self.product.pk, self.main.pk, self.store.pk, 3)
+        self.assertEqual(services.on_hand(self.product.pk, self.main.pk), 7)
+        self.assertEqual(services.on_hand(self.product.pk, self.store.pk), 3)
+        self.assertEqual(StockMovement.objects.count(), 3)
+
+    def test_overdraw_rolls_back_movement(self):
+        with self.assertRaises(services.InsufficientStock):
+            services.record_movement(self.product.pk, self.store.pk, -5, "sale")
+        self.assertEqual(StockMovement.objects.count(), 1)
+        self.assertEqual(services.get_balance(self.product.pk, self.store.pk), (0, 0))
+
+    def test_ledger_is_append_only(self):
+        movement = StockMovement.objects.get()
+        with self.assertRaises(ValidationError):
+            movement.save()
+        with self.assertRaises(ValidationError):
+            movement.delete()
+
+    def test_reserve_fulfil_release(self):
+        self.assertEqual(services.reserve(self.product.pk, 6), self.main.pk)
+        with self.assertRaises(services.InsufficientStock):
+            services.reserve(self.product.pk, 5)
+        services.fulfil(self.product.pk, self.main.pk, 4)
+        self.assertEqual(services.get_balance(self.product.pk, self.main.pk), (6, 2))
+        services.release(self.product.pk, self.main.pk, 2)
+        self.assertEqual(services.get_balance(self.product.pk, self.main.pk), (6, 0))
+
+    def test_reserve_follows_location_preference(self):
+        services.transfer(self.product.pk, self.main.pk, self.store.pk, 3)
+        location = services.reserve(self.product.pk, 2, location_ids=[self.store.pk, self.main.pk])
+        self.assertEqual(location, self.store.pk)
+
+    def test_rebuild_recomputes_from_ledger(self):
+        services.reserve(self.product.pk, 2)
+        StockBalance.objects.update(on_hand=99)
+        call_command("rebuild_stock_balances", "--chunk-size", "1", stdout=io.StringIO())
+        self.assertEqual(services.get_balance(self.product.pk, self.main.pk), (10, 2))
+
+
+# ------------------------------------------------
+# 🔹 Catalog search and autocomplete
+# ------------------------------------------------
+class CatalogSearchTests(TestCase):
+    def setUp(self):
+        self.laptop = Product.objects.create(sku="LAP-001", name="Gaming Laptop Pro", barcode="123")
+        self.lamp = Product.objects.create(sku="LAM-002", name="Desk Lamp")
+        Product.objects.create(sku="OLD-1", name="Laptop bag", is_active=False)
+        self.trie = search.CatalogTrie()
+        for module in (search, signals):
+            patcher = mock.patch.object(module, "catalog_trie", self.trie)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def skus(self, response):
+        self.assertEqual(response.status_code, 200, response.content)
+        return [row["sku"] for row in response.json()["data"]]
+
+    def test_exact_code_hit(self):
+        self.assertEqual([p.sku for p in search.search_products("123")], ["LAP-001"])
+        self.assertEqual(len(search.search_products("Laptop")), 2)
+        self.assertEqual(len(search.search_products("Laptop", active_only=True)), 1)
+
+    def test_autocomplete_before_load_queries_database_and_schedules_one_refresh(self):
+        with mock.patch.object(search.threading, "Thread") as thread:
+            self.assertEqual(self.skus(APIClient().get("/store/autocomplete?q=desk")), ["LAM-002"])
+            APIClient().get("/store/autocomplete?q=desk")
+        thread.assert_called_once()
+        self.assertFalse(self.trie.is_loaded)
+
+    def test_autocomplete_from_trie_follows_local_writes(self):
+        self.trie.refresh()
+        client = APIClient()
+        self.assertEqual(set(self.skus(client.get("/store/autocomplete?q=la"))), {"LAP-001", "LAM-002"})
+        self.lamp.name = "Floor light"
+        self.lamp.save()
+        self.assertEqual(self.skus(client.get("/store/autocomplete?q=flo")), ["LAM-002"])
+        self.lamp.delete()
+        self.assertEqual(self.skus(client.get("/store/autocomplete?q=flo")), [])
+
+    def test_refresh_rereads_late_commits_inside_overlap(self):
+        self.trie.refresh()
+        # written by another process: no signal here, and stamped before the watermark
+        Product.objects.filter(pk=self.lamp.pk).update(
+            name="Floor light", updated_at=self.trie._watermark - timedelta(seconds=10))
+        self.trie.refresh()
+        self.assertEqual(self.trie.complete("flo"), [self.lamp.pk])
+        self.assertEqual(self.trie.complete("desk"), [])
+
+    def test_complete_returns_shortest_terms_first(self):
+        bulk = Product.objects.bulk_create(Product(sku=f"LX-{i:04d}", name=f"Lantern{'s' * (i % 5)}") for i in range(50))
+        self.trie.refresh()
+        self.assertEqual(self.trie.complete("la", limit=2), [self.lamp.pk, self.laptop.pk])
+        self.assertEqual(len(self.trie.complete("l", limit=30)), 30)
+        self.assertEqual(set(self.trie.complete("lanterns", limit=100)), {p.pk for i, p in enumerate(bulk) if i % 5})
+
+    @override_settings(CATALOG_TRIE_REBUILD_SECONDS=0)
+    def test_refresh_drops_products_deleted_elsewhere(self):
+        self.trie.refresh()
+        # deleted by another process: its signal updates that process's trie, and no newer row is left to pull
+        with mock.patch.object(signals, "catalog_trie", search.CatalogTrie()):
+            Product.objects.filter(pk=self.lamp.pk).delete()
+        self.assertEqual(self.trie.complete("desk"), [self.lamp.pk])
+        self.trie.refresh()
+        self.assertEqual(self.trie.complete("desk"), [])
+
+
+# ------------------------------------------------
+# 🔹 Product list (query counts)
+# ------------------------------------------------
+class ProductListTests(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username="bob", password="Passw0rd!", email="bob@gmail.com"))
+
+    def add_products(self, n):
+        start = Product.objects.count()
+        Product.objects.bulk_create(Product(sku=f"P{start + i}", name=f"Product {start + i}") for i in range(n))
+
+    def test_list_queries_constant(self):
+        self.assertConstantQueries("get", "/inventory/products", grow=self.add_products)
+        response = self.assertMaxQueries(1, "get", "/inventory/products")
+        self.assertEqual(len(response.json()["results"]), 11)
@@ -0,0 +1,9 @@
+# inventory/urls.py
+from django.urls import path
+from .views import *
+
+urlpatterns = [
+    path('products', ProductListView.as_view(), name='product-list'),
+    path('products/search', ProductSearchView.as_view(), name='product-search'),
+    path('products/autocomplete', ProductAutocompleteView.as_view(), name='product-autocomplete'),
+]
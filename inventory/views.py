@@ -1,3 +1,57 @@
-from django.shortcuts import render
+#inventory/views.py
+from rest_framework import generics, status
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from core.readers import SchemaReadMixin
+from inventory.models import Product
+from inventory.readers import ProductRead
+from inventory.serializers import ProductSerializer, ProductSuggestionSerializer
+from inventory.search import search_products, autocomplete
 
-# Create your views here.
+
+def _limit(request, default, maximum=100):
+    try:
+        return max(1, min(int(request.query_params.get('limit', default)), maximum))
+    except ValueError:
+        return default
+
+
+# ------------------------------------------------
+# ✅ Product list (keyset paginated, newest first)
+# ------------------------------------------------
+class ProductListView(SchemaReadMixin, generics.ListAPIView):
+    serializer_class = ProductSerializer
+    read_schema = ProductRead
+    permission_classes = [IsAuthenticated]
+    queryset = Product.objects.all()
+
+
+# ------------------------------------------------
+# ✅ Catalog search
+# ------------------------------------------------
+class ProductSearchView(generics.GenericAPIView):
+    serializer_class = ProductSerializer
+    permission_classes = [IsAuthenticated]
+    active_only = False
+
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"error": "Query parameter 'q' is required."}, status=status.HTTP_400_BAD_REQUEST)
+        products = search_products(query, limit=_limit(request, 20), active_only=self.active_only)
+        return Response({
+            "message": "Products fetched successfully.",
+            "data": self.get_serializer(products, many=True).data
+        }, status=status.HTTP_200_OK)
+
+
+class ProductAutocompleteView(generics.GenericAPIView):
+    serializer_class = ProductSuggestionSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        products = autocomplete(request.query_params.get('q', ''), limit=_limit(request, 10, 25))
+        return Response({
+            "message": "Suggestions fetched successfully.",
+            "data": self.get_serializer(products, many=True).data
+        }, status=status.HTTP_200_OK)
@@ -0,0 +1,16 @@
+#operations/exports.py
+from core.exports import Export, register
+from operations.models import SalesOrderLine
+
+register(Export('orders', SalesOrderLine.objects.order_by('order__created_at', 'order_id', 'id'), [
+    ('Order', 'order_id'),
+    ('Placed at', 'order__created_at'),
+    ('Status', 'order__status'),
+    ('Channel', 'order__channel'),
+    ('Reference', 'order__reference'),
+    ('SKU', 'product__sku'),
+    ('Location', 'location__code'),
+    ('Condition', 'condition'),
+    ('Quantity', 'quantity'),
+    ('Unit price', 'unit_price'),
+], filters={'from': 'order__created_at__gte', 'to': 'order__created_at__lt', 'status': 'order__status'}))
@@ -1,3 +1,65 @@
+#operations/models.py
+from django.conf import settings
 from django.db import models
+from core.models import Base
+from inventory.models import Product, Location, CONDITION_CHOICES
 
-# Create your models here.
+
+class SalesOrder(Base):
+    """
+    A customer sale. Stock for every line is reserved when the order is placed
+    (operations.services.checkout) and consumed on fulfilment.
+    """
+    STATUS_CHOICES = [
+        ('reserved', 'Reserved'),
+        ('fulfilled', 'Fulfilled'),
+        ('cancelled', 'Cancelled'),
+    ]
+    CHANNEL_CHOICES = [
+        ('store', 'In-store'),
+        ('online', 'Online'),
+        ('corporate', 'Corporate'),
+    ]
+
+    idempotency_key = models.CharField(max_length=64, help_text="Client supplied, unique per user; a retried checkout returns the same order")
+    request_hash = models.CharField(max_length=64, editable=False)
+    customer = models.ForeignKey('crm.Customer', on_delete=models.PROTECT, null=True, blank=True, related_name="sales_orders")
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="sales_orders")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='reserved')
+    channel = models.CharField(max_length=20, choices=CHANNEL_CHOICES, default='store')
+    reference = models.CharField(max_length=64, blank=True, default='')
+    fulfilled_at = models.DateTimeField(null=True, blank=True)
+    cancelled_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'sales_order'
+        # keys are scoped to the user placing the order; orders placed without one share a namespace
+        constraints = [
+            models.UniqueConstraint(fields=['created_by', 'idempotency_key'], name='sales_order_user_idem_key'),
+            models.UniqueConstraint(fields=['idempotency_key'], condition=models.Q(created_by__isnull=True),
+                                    name='sales_order_system_idem_key'),
+        ]
+        indexes = [
+            models.Index(fields=['created_at'], name='sales_order_created_idx'),
+            models.Index(fields=['fulfilled_at'], name='sales_order_fulfilled_idx'),
+            models.Index(fields=['cancelled_at'], name='sales_order_cancelled_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.idempotency_key} ({self.status})"
+
+
+class SalesOrderLine(Base):
+    """One (product, location, condition) allocation; a requested line may be split across locations."""
+    order = models.ForeignKey(SalesOrder, on_delete=models.CASCADE, related_name="lines")
+    product = models.ForeignKey(Product, on_delete=models.PROTECT, related_name="sales_lines")
+    location = models.ForeignKey(Location, on_delete=models.PROTECT, related_name="sales_lines")
+    condition = models.CharField(max_length=20, choices=CONDITION_CHOICES, default='new')
+    quantity = models.PositiveIntegerField()
+    unit_price = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        db_table = 'sales_order_line'
+
+    def __str__(self):
+        return f"{self.quantity} x {self.product_id} @ {self.location_id}"
@@ -0,0 +1,58 @@
+#operations/serializers.py
+from rest_framework import serializers
+from crm.models import Customer
+from inventory.models import CONDITION_CHOICES
+from operations.models import SalesOrder, SalesOrderLine
+
+
+# ------------------------------------------------
+# ✅ Checkout input
+# ------------------------------------------------
+class CheckoutLineSerializer(serializers.Serializer):
+    product_id = serializers.UUIDField()
+    quantity = serializers.IntegerField(min_value=1)
+    condition = serializers.ChoiceField(choices=CONDITION_CHOICES, default='new')
+    # staff-only override of Product.price (CheckoutSerializer.validate_lines)
+    unit_price = serializers.DecimalField(max_digits=12, decimal_places=2, min_value=0, required=False)
+    location_ids = serializers.ListField(child=serializers.UUIDField(), required=False, allow_empty=False)
+
+
+class CheckoutSerializer(serializers.Serializer):
+    lines = CheckoutLineSerializer(many=True, allow_empty=False)
+    reference = serializers.CharField(max_length=64, required=False, default='')
+    channel = serializers.ChoiceField(choices=SalesOrder.CHANNEL_CHOICES, default='store')
+    customer_id = serializers.PrimaryKeyRelatedField(
+        queryset=Customer.objects.filter(is_active=True), required=False, allow_null=True, default=None
+    )
+
+    def validate_lines(self, lines):
+        if not self.context['request'].user.is_staff and any('unit_price' in line for line in lines):
+            raise serializers.ValidationError("Only staff can set unit_price.")
+        return lines
+
+    def validate_customer_id(self, customer):
+        # staff may order for any customer; everyone else only for their own customer record
+        user = self.context['request'].user
+        if customer is not None and not user.is_staff and customer.user_id != user.pk:
+            raise serializers.ValidationError("You cannot place orders for this customer.")
+        return customer
+
+
+# ------------------------------------------------
+# ✅ Sales Order Serializers
+# ------------------------------------------------
+class SalesOrderLineSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SalesOrderLine
+        fields = ['id', 'product', 'location', 'condition', 'quantity', 'unit_price']
+
+
+class SalesOrderSerializer(serializers.ModelSerializer):
+    lines = SalesOrderLineSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = SalesOrder
+        fields = [
+            'id', 'idempotency_key', 'customer', 'status', 'channel', 'reference', 'lines',
+            'fulfilled_at', 'cancelled_at', 'created_at', 'updated_at'
+        ]
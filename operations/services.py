@@ -0,0 +1,205 @@
+#operations/services.py
+import hashlib
+import json
+from collections import defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from core.db import run_with_retries
+from core.outbox import publish
+from inventory.models import Product, StockBalance
+from inventory.services import InsufficientStock, release
+from operations.models import SalesOrder, SalesOrderLine
+
+
+class IdempotencyConflict(Exception):
+    """The idempotency key was already used for a different order."""
+
+
+def _normalize(lines):
+    normalized = []
+    for line in lines:
+        quantity = int(line['quantity'])
+        if quantity <= 0:
+            raise ValueError("Line quantity must be positive.")
+        location_ids = line.get('location_ids')
+        unit_price = line.get('unit_price')
+        normalized.append({
+            'product_id': str(line['product_id']),
+            'quantity': quantity,
+            'condition': line.get('condition', 'new'),
+            'unit_price': str(Decimal(str(unit_price))) if unit_price is not None else None,
+            'location_ids': [str(l) for l in location_ids] if location_ids else None,
+        })
+    return normalized
+
+
+def _request_hash(lines):
+    return hashlib.sha256(json.dumps(lines, sort_keys=True).encode()).hexdigest()
+
+
+def _existing_order(idempotency_key, request_hash, user):
+    owner = {'created_by': user} if user is not None else {'created_by__isnull': True}
+    order = SalesOrder.objects.filter(idempotency_key=idempotency_key, **owner).first()
+    if order is not None and order.request_hash != request_hash:
+        raise IdempotencyConflict(f"Idempotency key {idempotency_key} was used for a different order")
+    return order
+
+
+def _allocate(lines, balances):
+    """
+    Splits each line across the locked balance rows: the line's own
+    `location_ids` in that order, otherwise locations by id. Returns
+    {balance row: quantity} and the order line instances.
+    """
+    by_key = defaultdict(list)
+    available = {}
+    for row in balances:
+        by_key[(str(row.product_id), row.condition)].append(row)
+        available[row.pk] = row.on_hand - row.reserved
+
+    taken = defaultdict(int)
+    allocations = []
+    for line in lines:
+        rows = by_key[(line['product_id'], line['condition'])]
+        if line['location_ids'] is not None:
+            position = {l: i for i, l in enumerate(line['location_ids'])}
+            rows = sorted((r for r in rows if str(r.location_id) in position),
+                          key=lambda r: position[str(r.location_id)])
+        remaining = line['quantity']
+        for row in rows:
+            quantity = min(remaining, available[row.pk])
+            if quantity <= 0:
+                continue
+            available[row.pk] -= quantity
+            taken[row] += quantity
+            allocations.append((line, row, quantity))
+            remaining -= quantity
+            if not remaining:
+                break
+        if remaining:
+            raise InsufficientStock(f"Cannot reserve {line['quantity']} of {line['product_id']} ({line['condition']})")
+    return taken, allocations
+
+
+def order_event(order, lines, at=None):
+    """Outbox payload for a sales order; amounts as strings so they stay exact in JSON."""
+    total = sum((line.unit_price * line.quantity for line in lines), Decimal('0.00'))
+    return {
+        'order_id': str(order.pk),
+        'customer_id': str(order.customer_id) if order.customer_id else None,
+        'reference': order.reference,
+        'channel': order.channel,
+        'at': (at or timezone.now()).isoformat(),
+        'currency': getattr(settings, 'DEFAULT_CURRENCY', 'USD'),
+        'total': str(total),
+        'lines': [
+            {'product_id': str(line.product_id), 'location_id': str(line.location_id),
+             'condition': line.condition, 'quantity': line.quantity, 'unit_price': str(line.unit_price)}
+            for line in lines
+        ],
+    }
+
+
+def _place_order(lines, idempotency_key, request_hash, user, reference, channel, customer_id):
+    with transaction.atomic():
+        # the unique (created_by, key) makes a concurrent duplicate wait here, then fail, before touching stock
+        order = SalesOrder.objects.create(
+            idempotency_key=idempotency_key, request_hash=request_hash,
+            created_by=user, reference=reference, channel=channel, customer_id=customer_id,
+        )
+
+        # one SELECT ... FOR UPDATE for every row the order can touch, locked in
+        # the same (product, location, condition) order inventory.services uses
+        balances = list(
+            StockBalance.objects.select_for_update()
+            .filter(product_id__in={l['product_id'] for l in lines},
+                    condition__in={l['condition'] for l in lines})
+            .order_by('product_id', 'location_id', 'condition')
+        )
+        taken, allocations = _allocate(lines, balances)
+        # priced here, inside the transaction: a line's own unit_price is a staff override
+        prices = dict(Product.objects.filter(pk__in={l['product_id'] for l in lines}).values_list('pk', 'price'))
+
+        now = timezone.now()
+        for row, quantity in taken.items():
+            row.reserved += quantity
+            row.updated_at = now
+        StockBalance.objects.bulk_update(list(taken), ['reserved', 'updated_at'])
+
+        order_lines = SalesOrderLine.objects.bulk_create([
+            SalesOrderLine(order=order, product_id=line['product_id'], location_id=row.location_id,
+                           condition=line['condition'], quantity=quantity,
+                           unit_price=(Decimal(line['unit_price']) if line['unit_price'] is not None
+                                       else prices[row.product_id]))
+            for line, row, quantity in allocations
+        ])
+        publish('sales_order.placed', order_event(order, order_lines, at=order.created_at))
+    return order
+
+
+# ------------------------------------------------
+# ✅ Checkout
+# ------------------------------------------------
+def checkout(lines, idempotency_key, user=None, reference='', channel='store', customer_id=None):
+    """
+    Places a sales order and reserves stock for all of its lines in one
+    transaction. Retried on serialization failures / deadlocks.
+
+    `lines`: [{'product_id', 'quantity', 'condition'?, 'unit_price'?, 'location_ids'?}]
+    Lines are priced from Product.price; a line's `unit_price` overrides it,
+    so callers must only pass one on a staff user's behalf.
+    Returns (order, created); a repeated call by the same user with the same
+    key and lines returns the original order without reserving again. Keys
+    are per user, so another user's key never reveals their order.
+    """
+    lines = _normalize(lines)
+    request_hash = _request_hash(lines)
+
+    order = _existing_order(idempotency_key, request_hash, user)
+    if order is not None:
+        return order, False
+    try:
+        order = run_with_retries(lambda: _place_order(lines, idempotency_key, request_hash, user, reference, channel, customer_id))
+    except IntegrityError:
+        order = _existing_order(idempotency_key, request_hash, user)
+        if order is None:
+            raise
+        return order, False
+    return order, True
+
+
+def cancel_order(order_id):
+    with transaction.atomic():
+        order = SalesOrder.objects.select_for_update().get(pk=order_id)
+        if order.status != 'reserved':
+            raise ValueError(f"Order is {order.status}, only reserved orders can be cancelled")
+        lines = list(order.lines.order_by('product_id', 'location_id', 'condition'))
+        for line in lines:
+            release(line.product_id, line.location_id, line.quantity, line.condition)
+        order.status = 'cancelled'
+        order.cancelled_at = timezone.now()
+        order.save()
+        publish('sales_order.cancelled', order_event(order, lines, at=order.cancelled_at))
+    return order
+
+
+def fulfil_order(order_id):
+    """
+    Marks the order fulfilled and queues 'sales_order.fulfilled'; the stock
+    ledger (inventory.handlers) and the revenue entry (accounting.handlers)
+    are written by the outbox worker. The reservation keeps the stock
+    spoken for until then.
+    """
+    with transaction.atomic():
+        order = SalesOrder.objects.select_for_update().get(pk=order_id)
+        if order.status != 'reserved':
+            raise ValueError(f"Order is {order.status}, only reserved orders can be fulfilled")
+        order.status = 'fulfilled'
+        order.fulfilled_at = timezone.now()
+        order.save()
+        publish('sales_order.fulfilled', order_event(order, list(order.lines.all()), at=order.fulfilled_at))
+    return order
@@ -1,3 +1,188 @@
+from decimal import Decimal
+from unittest import mock
+
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from accounting.models import Account, Invoice, JournalEntry
+from core import outbox
+from core.models import OutboxDelivery, OutboxEvent
+from crm.models import Customer
+from inventory import services as inventory
+from inventory.models import Location, Product
+from operations import services
+from operations.models import SalesOrder
+from users.models import User
+
+CHECKOUT_URL = "/operations/orders/checkout"
+
+
+def make_user(username, **fields):
+    return User.objects.create_user(username=username, password="Passw0rd!", email=f"{username}@gmail.com", **fields)
+
+
+class CheckoutTestCase(TestCase):
+    def setUp(self):
+        self.laptop = Product.objects.create(sku="A", name="Laptop", price=Decimal("800.00"))
+        self.mouse = Product.objects.create(sku="B", name="Mouse", price=Decimal("12.50"))
+        self.main = Location.objects.create(code="W1", name="Main")
+        self.store = Location.objects.create(code="W2", name="Store")
+        inventory.record_movement(self.laptop.pk, self.main.pk, 3, "receipt")
+        inventory.record_movement(self.laptop.pk, self.store.pk, 5, "receipt")
+        inventory.record_movement(self.mouse.pk, self.store.pk, 2, "receipt")
+
+    def reserved(self, product, location):
+        return inventory.get_balance(product.pk, location.pk)[1]
+
+
+# ------------------------------------------------
+# 🔹 Checkout and reservations
+# ------------------------------------------------
+class CheckoutTests(CheckoutTestCase):
+    def test_lines_split_across_locations(self):
+        lines = [{"product_id": self.laptop.pk, "quantity": 6}, {"product_id": self.mouse.pk, "quantity": 2, "unit_price": "9.99"}]
+        order, created = services.checkout(lines, "k1")
+        self.assertTrue(created)
+        self.assertEqual(order.lines.count(), 3)
+        self.assertEqual(self.reserved(self.laptop, self.main) + self.reserved(self.laptop, self.store), 6)
+
+    def test_insufficient_stock_leaves_nothing_behind(self):
+        with self.assertRaises(inventory.InsufficientStock):
+            services.checkout([{"product_id": self.laptop.pk, "quantity": 9}], "k1")
+        self.assertFalse(SalesOrder.objects.exists())
+        self.assertEqual(self.reserved(self.laptop, self.main), 0)
+
+    def test_retry_returns_same_order_and_conflict_on_other_body(self):
+        lines = [{"product_id": self.laptop.pk, "quantity": 2}]
+        order, _ = services.checkout(lines, "k1")
+        again, created = services.checkout(lines, "k1")
+        self.assertEqual((again.pk, created), (order.pk, False))
+        self.assertEqual(self.reserved(self.laptop, self.main), 2)
+        with self.assertRaises(services.IdempotencyConflict):
+            services.checkout([{"product_id": self.laptop.pk, "quantity": 1}], "k1")
+
+    def test_cancel_releases_stock(self):
+        order, _ = services.checkout([{"product_id": self.laptop.pk, "quantity": 2}], "k1")
+        services.cancel_order(order.pk)
+        self.assertEqual(self.reserved(self.laptop, self.main), 0)
+        with self.assertRaises(ValueError):
+            services.fulfil_order(order.pk)
+
+
+class CheckoutEndpointTests(CheckoutTestCase):
+    def setUp(self):
+        super().setUp()
+        self.alice = APIClient()
+        self.alice.force_authenticate(make_user("alice"))
+        self.bob = APIClient()
+        self.bob.force_authenticate(make_user("bob"))
+
+    def post(self, client, body, key="k1"):
+        return client.post(CHECKOUT_URL, body, format="json", HTTP_IDEMPOTENCY_KEY=key)
+
+    def body(self, quantity=4):
+        return {"lines": [{"product_id": str(self.laptop.pk), "quantity": quantity, "location_ids": [str(self.store.pk)]}]}
+
+    def test_place_and_retry(self):
+        response = self.post(self.alice, self.body())
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()["data"]["lines"][0]["location"], str(self.store.pk))
+        self.assertEqual(self.post(self.alice, self.body()).status_code, 200)
+        self.assertEqual(self.post(self.alice, self.body(1)).status_code, 409)
+
+    def test_keys_are_per_user(self):
+        first = self.post(self.alice, self.body(1)).json()["data"]["id"]
+        response = self.post(self.bob, self.body(1))
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertNotEqual(response.json()["data"]["id"], first)
+        self.assertEqual(self.post(self.bob, self.body(2), key="k1").status_code, 409)
+        self.assertEqual(self.reserved(self.laptop, self.store), 2)
+
+    def test_customer_must_exist_and_belong_to_user(self):
+        alice = User.objects.get(username="alice")
+        own = Customer.objects.create(name="Alice", user=alice)
+        other = Customer.objects.create(name="Acme")
+        missing = self.post(self.alice, {**self.body(1), "customer_id": "01900000-0000-7000-8000-000000000000"})
+        self.assertEqual(missing.status_code, 400)
+        self.assertIn("customer_id", missing.json())
+        self.assertEqual(self.post(self.alice, {**self.body(1), "customer_id": str(other.pk)}, key="k2").status_code, 400)
+        self.assertFalse(SalesOrder.objects.exists())
+
+        response = self.post(self.alice, {**self.body(1), "customer_id": str(own.pk)}, key="k3")
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()["data"]["customer"], str(own.pk))
+
+    def test_staff_may_order_for_any_customer(self):
+        staff = APIClient()
+        staff.force_authenticate(make_user("clerk", is_staff=True))
+        customer = Customer.objects.create(name="Acme")
+        response = self.post(staff, {**self.body(1), "customer_id": str(customer.pk)})
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(SalesOrder.objects.get().customer, customer)
+
+    def test_lines_priced_from_product(self):
+        response = self.post(self.alice, self.body(2))
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()["data"]["lines"][0]["unit_price"], "800.00")
+
+    def test_only_staff_override_price(self):
+        body = {"lines": [{**self.body(1)["lines"][0], "unit_price": "0.00"}]}
+        response = self.post(self.alice, body)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("lines", response.json())
+        self.assertFalse(SalesOrder.objects.exists())
+
+        staff = APIClient()
+        staff.force_authenticate(make_user("clerk", is_staff=True))
+        response = self.post(staff, body)
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()["data"]["lines"][0]["unit_price"], "0.00")
+
+    def test_key_required(self):
+        response = self.alice.post(CHECKOUT_URL, self.body(), format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+# ------------------------------------------------
+# 🔹 Fulfilment through the outbox
+# ------------------------------------------------
+class FulfilmentTests(CheckoutTestCase):
+    def fulfil(self):
+        order, _ = services.checkout([{"product_id": self.laptop.pk, "quantity": 2, "unit_price": "5.50",
+                                       "location_ids": [self.main.pk]}], "k1")
+        services.fulfil_order(order.pk)
+        return order
+
+    def test_sales_accounts_seeded_after_migrate(self):
+        self.assertTrue(set(Account.objects.values_list("code", flat=True)).issuperset({"1000", "1100", "4000"}))
+
+    def test_fulfilment_runs_every_handler(self):
+        order = self.fulfil()
+        self.assertEqual(inventory.get_balance(self.laptop.pk, self.main.pk), (3, 2))
+        outbox.process_batch()
+        self.assertEqual(inventory.get_balance(self.laptop.pk, self.main.pk), (1, 0))
+        self.assertTrue(JournalEntry.objects.filter(source="sale", reference=str(order.pk)).exists())
+        self.assertEqual(Invoice.objects.get(order=order).total, Decimal("11.00"))
+        self.assertEqual(OutboxEvent.objects.get(topic="sales_order.fulfilled").status, "done")
+
+    def test_failing_handler_does_not_hold_back_stock(self):
+        order = self.fulfil()
+        handlers = outbox.handlers_for("sales_order.fulfilled")
+
+        def post_sale(event):
+            raise RuntimeError("ledger down")
+        post_sale.__module__, post_sale.__qualname__ = "accounting.handlers", "post_sale"
+
+        patched = [post_sale if outbox.handler_name(h) == "accounting.handlers.post_sale" else h for h in handlers]
+        with mock.patch.dict(outbox._handlers, {"sales_order.fulfilled": patched}):
+            with self.assertLogs("core.outbox", "WARNING"):
+                outbox.process_batch()
+        self.assertEqual(inventory.get_balance(self.laptop.pk, self.main.pk), (1, 0))
+        self.assertFalse(JournalEntry.objects.filter(reference=str(order.pk)).exists())
+        self.assertEqual(OutboxDelivery.objects.get(handler="accounting.handlers.post_sale").status, "pending")
 
-# Create your tests here.
+        OutboxEvent.objects.update(available_at=order.created_at)
+        outbox.process_batch()
+        self.assertTrue(JournalEntry.objects.filter(source="sale", reference=str(order.pk)).exists())
+        self.assertEqual(inventory.get_balance(self.laptop.pk, self.main.pk), (1, 0))
+        self.assertEqual(OutboxEvent.objects.get(topic="sales_order.fulfilled").status, "done")
@@ -0,0 +1,7 @@
+# operations/urls.py
+from django.urls import path
+from .views import *
+
+urlpatterns = [
+    path('orders/checkout', SalesOrderCheckoutView.as_view(), name='order-checkout'),
+]
@@ -1,3 +1,45 @@
-from django.shortcuts import render
+#operations/views.py
+from rest_framework import generics
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from inventory.services import InsufficientStock
+from operations.serializers import CheckoutSerializer, SalesOrderSerializer
+from operations.services import checkout, IdempotencyConflict
+from core.status import *
 
-# Create your views here.
+
+# ------------------------------------------------
+# ✅ Sales order checkout
+# ------------------------------------------------
+class SalesOrderCheckoutView(generics.GenericAPIView):
+    """
+    POST with an `Idempotency-Key` header; retrying with the same key and body
+    returns the order that was already placed instead of reserving again.
+    """
+    serializer_class = CheckoutSerializer
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        key = request.headers.get('Idempotency-Key', '').strip()
+        if not key or len(key) > 64:
+            return Response({"error": "An Idempotency-Key header (max 64 chars) is required."}, status=S400)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        customer = serializer.validated_data['customer_id']
+
+        try:
+            order, created = checkout(
+                serializer.validated_data['lines'], key,
+                user=request.user, reference=serializer.validated_data['reference'],
+                channel=serializer.validated_data['channel'],
+                customer_id=customer.pk if customer else None,
+            )
+        except InsufficientStock as e:
+            return Response({"error": str(e)}, status=S400)
+        except IdempotencyConflict as e:
+            return Response({"error": str(e)}, status=S409)
+
+        return Response({
+            "message": "Order placed successfully." if created else "Order already placed.",
+            "data": SalesOrderSerializer(order).data
+        }, status=S201 if created else S200)
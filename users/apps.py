@@ -6,3 +6,10 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        from django.conf import settings
+
+        if getattr(settings, 'VALIDATION_PRELOAD', False):
+            from users.validations import preload
+            preload()
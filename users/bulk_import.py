@@ -0,0 +1,252 @@
+# users/bulk_import.py
+import csv
+import io
+import json
+import os
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+
+from auth_api.hashers import hash_process_pool
+from users.models import User, PhoneNumber
+from users.validations import UserDataValidator
+
+USER_FIELDS = ['username', 'email', 'first_name', 'last_name', 'country', 'city', 'postal_code', 'address']
+
+
+# ------------------------------------------------
+# ✅ Streaming readers (one row dict at a time)
+# ------------------------------------------------
+def _text_stream(fileobj):
+    if isinstance(fileobj, io.TextIOBase):
+        return fileobj
+    return io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+
+
+def iter_rows(fileobj, fmt):
+    """
+    Yields (row_number, row) from a JSONL or CSV stream without reading it whole.
+    CSV rows may carry one phone as phone_number / phone_country_code / phone_type;
+    JSONL rows may carry a `phone_numbers` list of {number, country_code, type}.
+    """
+    stream = _text_stream(fileobj)
+    if fmt == 'jsonl':
+        for row_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield row_number, {'__error__': f"Invalid JSON: {e}"}
+                continue
+            if not isinstance(row, dict):
+                row = {'__error__': "Each line must be a JSON object."}
+            yield row_number, row
+    elif fmt == 'csv':
+        for row_number, row in enumerate(csv.DictReader(stream), start=1):
+            if row.get('phone_number'):
+                row['phone_numbers'] = [{
+                    'number': row.pop('phone_number'),
+                    'country_code': row.pop('phone_country_code', None),
+                    'type': row.pop('phone_type', None) or 'primary',
+                }]
+            yield row_number, row
+    else:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+
+def detect_format(filename):
+    ext = os.path.splitext(filename or '')[1].lower()
+    return {'.jsonl': 'jsonl', '.ndjson': 'jsonl', '.csv': 'csv'}.get(ext)
+
+
+# ------------------------------------------------
+# ✅ Row validation (same rules as UserSerializer.validate)
+# ------------------------------------------------
+PHONE_FIELDS = ('number', 'country_code', 'type')
+
+
+def _type_errors(row):
+    """JSONL values can be any JSON type; everything below expects strings."""
+    errors = [
+        f"{field} must be a string."
+        for field in USER_FIELDS + ['password', 'password2']
+        if row.get(field) is not None and not isinstance(row[field], str)
+    ]
+    phones = row.get('phone_numbers')
+    if phones is None:
+        return errors
+    if not isinstance(phones, list) or not all(isinstance(phone, dict) for phone in phones):
+        return errors + ["phone_numbers must be a list of objects."]
+    for phone in phones:
+        errors.extend(
+            f"phone_numbers.{field} must be a string."
+            for field in PHONE_FIELDS
+            if phone.get(field) is not None and not isinstance(phone[field], str)
+        )
+    return errors
+
+
+def validate_row(row):
+    """Returns (cleaned_row, errors)."""
+    if '__error__' in row:
+        return None, [row['__error__']]
+
+    errors = _type_errors(row)
+    if errors:
+        return None, errors
+
+    password = row.get('password') or ''
+    if row.get('password2') not in (None, '') and row['password2'] != password:
+        errors.append("Passwords do not match.")
+
+    errors.extend(UserDataValidator.validate_record(row))
+    if not row.get('email'):
+        errors.append("Email is required for every user.")
+
+    phones = []
+    for phone in row.get('phone_numbers') or []:
+        # bulk_create skips PhoneNumber.save(), so repeat its checks here
+        if not (phone.get('country_code') or '').startswith('+'):
+            errors.append("Country code must start with '+'.")
+            continue
+        try:
+            number = UserDataValidator.validate_phone(phone.get('number'), phone['country_code'])
+        except ValidationError:
+            continue  # already reported by validate_record
+        if any(p['number'] == number for p in phones):
+            continue
+        phones.append({
+            'number': number,
+            'country_code': phone['country_code'],
+            'type': phone.get('type') or 'primary',
+        })
+
+    if errors:
+        return None, errors
+
+    cleaned = {field: (row.get(field) or '').strip() for field in USER_FIELDS}
+    cleaned['email'] = cleaned['email'].lower()
+    cleaned['address'] = cleaned['address'] or None
+    errors = _field_errors(User, cleaned)
+    for phone in phones:
+        errors.extend(f"phone_numbers.{message}" for message in _field_errors(PhoneNumber, phone))
+    if errors:
+        return None, errors
+
+    cleaned['password'] = password
+    cleaned['phone_numbers'] = phones
+    return cleaned, []
+
+
+def _field_errors(model, values):
+    """
+    Runs each model field's clean() (max_length, choices, validators) on the
+    values bulk_create would write, so an over-long postal code is a row
+    error instead of a DataError that rolls back the whole chunk.
+    """
+    errors = []
+    for name, value in values.items():
+        try:
+            model._meta.get_field(name).clean(value, None)
+        except ValidationError as e:
+            errors.extend(f"{name}: {message}" for message in e.messages)
+    return errors
+
+
+# ------------------------------------------------
+# ✅ Import driver
+# ------------------------------------------------
+class ImportReport:
+    def __init__(self):
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, row_number, messages):
+        self.failed += 1
+        self.errors.append({'row': row_number, 'errors': messages})
+
+    def as_dict(self):
+        return {'created': self.created, 'failed': self.failed, 'errors': self.errors}
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _import_chunk(chunk, executor, report, seen_usernames, seen_emails):
+    valid = []
+    for row_number, row in chunk:
+        cleaned, errors = validate_row(row)
+        if not errors:
+            if cleaned['username'] in seen_usernames:
+                errors.append("Duplicate username in import file.")
+            elif cleaned['email'] in seen_emails:
+                errors.append("Duplicate email in import file.")
+        if errors:
+            report.add_error(row_number, errors)
+            continue
+        seen_usernames.add(cleaned['username'])
+        seen_emails.add(cleaned['email'])
+        valid.append((row_number, cleaned))
+
+    # one query each for rows that clash with existing users
+    taken_usernames = set(User.objects.filter(
+        username__in=[c['username'] for _, c in valid]).values_list('username', flat=True))
+    taken_emails = set(User.objects.filter(
+        email__in=[c['email'] for _, c in valid]).values_list('email', flat=True))
+    rows = []
+    for row_number, cleaned in valid:
+        if cleaned['username'] in taken_usernames:
+            report.add_error(row_number, ["A user with that username already exists."])
+        elif cleaned['email'] in taken_emails:
+            report.add_error(row_number, ["A user with that email already exists."])
+        else:
+            rows.append((row_number, cleaned))
+    if not rows:
+        return
+
+    hashes = executor.map(make_password, [c.pop('password') for _, c in rows], chunksize=16)
+    users, phones = [], []
+    for (_, cleaned), password in zip(rows, hashes):
+        phone_rows = cleaned.pop('phone_numbers')
+        user = User(password=password, **cleaned)
+        users.append(user)
+        phones.extend(PhoneNumber(user=user, **phone) for phone in phone_rows)
+
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+            PhoneNumber.objects.bulk_create(phones)
+    except DatabaseError as e:
+        for row_number, _ in rows:
+            report.add_error(row_number, [f"Chunk rolled back: {e}"])
+        return
+    report.created += len(users)
+
+
+def import_users(fileobj, fmt, chunk_size=None, workers=None, executor=None):
+    """
+    Validates and creates users from a JSONL/CSV stream.
+    Rows are read lazily and written with bulk_create in chunks of `chunk_size`,
+    one transaction per chunk; passwords are hashed on `executor`, or on a
+    process pool of `workers` started for this import.
+    Returns an ImportReport with per-row errors.
+    """
+    chunk_size = chunk_size or getattr(settings, 'USER_IMPORT_CHUNK_SIZE', 500)
+    if executor is None:
+        workers = workers or getattr(settings, 'USER_IMPORT_WORKERS', os.cpu_count() or 2)
+        with hash_process_pool(workers) as executor:
+            return import_users(fileobj, fmt, chunk_size, executor=executor)
+
+    report = ImportReport()
+    seen_usernames, seen_emails = set(), set()
+    for chunk in _chunks(iter_rows(fileobj, fmt), chunk_size):
+        _import_chunk(chunk, executor, report, seen_usernames, seen_emails)
+    return report
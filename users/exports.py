@@ -0,0 +1,14 @@
+# users/exports.py
+from core.exports import Export, register
+from users.models import User
+
+register(Export('users', User.objects.order_by('created_at', 'id'), [
+    ('ID', 'id'),
+    ('Username', 'username'),
+    ('Email', 'email'),
+    ('First name', 'first_name'),
+    ('Last name', 'last_name'),
+    ('Active', 'is_active'),
+    ('Staff', 'is_staff'),
+    ('Joined', 'created_at'),
+]))
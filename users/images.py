@@ -0,0 +1,91 @@
+# users/images.py
+import io
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+logger = logging.getLogger(__name__)
+
+# Pillow releases the GIL while decoding/resizing/encoding, so threads are enough here
+_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'PROFILE_IMAGE_WORKERS', 2),
+    thread_name_prefix='profile-img',
+)
+
+
+def variants():
+    """{variant name: max edge in px}"""
+    return getattr(settings, 'PROFILE_IMAGE_VARIANTS', {'thumb': 128, 'medium': 512})
+
+
+def variant_name(name, variant):
+    return f"{os.path.splitext(name)[0]}_{variant}.webp"
+
+
+# ------------------------------------------------
+# ✅ Variant generation (runs on the worker pool)
+# ------------------------------------------------
+def generate_variants(name, storage):
+    from PIL import Image
+
+    pending = {v: size for v, size in variants().items() if not storage.exists(variant_name(name, v))}
+    if not pending:
+        return
+    with storage.open(name, 'rb') as source:
+        image = Image.open(source)
+        image.load()
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+
+    for variant, size in pending.items():
+        resized = image.copy()
+        resized.thumbnail((size, size))
+        buffer = io.BytesIO()
+        resized.save(buffer, format='WEBP', quality=getattr(settings, 'PROFILE_IMAGE_WEBP_QUALITY', 80))
+        storage.save_exact(variant_name(name, variant), ContentFile(buffer.getvalue()))
+
+
+def _run(fn, *args):
+    try:
+        fn(*args)
+    except Exception:
+        logger.exception("Profile image task %s failed for %s", fn.__name__, args[0])
+
+
+def schedule_variants(name, storage):
+    _executor.submit(_run, generate_variants, name, storage)
+
+
+# ------------------------------------------------
+# ✅ Cleanup of replaced images (after commit)
+# ------------------------------------------------
+def _delete_files(name, storage):
+    for path in [name] + [variant_name(name, v) for v in variants()]:
+        storage.delete(path)
+
+
+def delete_if_unreferenced(name, storage):
+    """
+    Content-addressed files can be shared by several profiles, so only
+    remove the original and its variants when no row points at them anymore.
+    """
+    from users.models import Profile
+
+    if Profile.objects.filter(profile_image=name).exists():
+        return
+    _executor.submit(_run, _delete_files, name, storage)
+
+
+def variant_urls(field_file):
+    """{'original': url, <variant>: url}; variants not rendered yet fall back to the original."""
+    if not field_file:
+        return None
+    storage, name = field_file.storage, field_file.name
+    urls = {'original': field_file.url}
+    for variant in variants():
+        path = variant_name(name, variant)
+        urls[variant] = storage.url(path) if storage.exists(path) else urls['original']
+    return urls
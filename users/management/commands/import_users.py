@@ -0,0 +1,38 @@
+# users/management/commands/import_users.py
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from users.bulk_import import import_users, detect_format
+
+
+class Command(BaseCommand):
+    help = "Bulk-creates users (and phone numbers) from a JSONL or CSV file, reporting per-row errors."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=["jsonl", "csv"],
+                            help="Defaults to the file extension")
+        parser.add_argument("--chunk-size", type=int, help="Rows per bulk_create transaction")
+        parser.add_argument("--workers", type=int, help="Password hashing processes")
+        parser.add_argument("--errors", help="Write per-row errors as JSONL to this path")
+
+    def handle(self, *args, **options):
+        fmt = options["format"] or detect_format(options["path"])
+        if fmt is None:
+            raise CommandError("Cannot detect format from the file name; pass --format.")
+
+        with open(options["path"], "rb") as fileobj:
+            report = import_users(fileobj, fmt, options["chunk_size"], options["workers"])
+
+        if options["errors"]:
+            with open(options["errors"], "w") as out:
+                for error in report.errors:
+                    out.write(json.dumps(error) + "\n")
+        else:
+            for error in report.errors:
+                self.stderr.write(f"row {error['row']}: {'; '.join(error['errors'])}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {report.created} users, {report.failed} rows failed"
+        ))
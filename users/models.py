@@ -5,6 +5,13 @@ from django.contrib.auth.models import AbstractUser
 from django.core.validators import RegexValidator
 from django.core.exceptions import ValidationError
 from core.models import Base
+from core.storage import content_addressed_storage
+from users import images
+
+
+# fields copied into JWTs (auth_api.tokens.USER_CLAIMS) or guarding them: changing one
+# bumps token_version, so tokens minted with the old values stop authenticating
+TOKEN_FIELDS = ('username', 'password', 'is_active', 'is_staff', 'is_superuser')
 
 
 class User(AbstractUser, Base):
@@ -15,6 +22,10 @@ class User(AbstractUser, Base):
     country = models.CharField(max_length=100)
     postal_code = models.CharField(max_length=10)
     address = models.CharField(max_length=255, blank=True, null=True)
+    token_version = models.PositiveIntegerField(
+        default=0, editable=False,
+        help_text="Bumped to invalidate every access token issued before it"
+    )
 
     REQUIRED_FIELDS = ['email']
     USERNAME_FIELD = 'username'
@@ -37,7 +48,26 @@ class User(AbstractUser, Base):
         # Example: normalize email before saving
         self.email = self.email.lower().strip()
 
+        bumped = self._bump_token_version(kwargs)
         super().save(*args, **kwargs)
+        if bumped:
+            self.refresh_from_db(fields=['token_version'])
+
+    def _bump_token_version(self, kwargs):
+        if self._state.adding or not self.is_tracked:
+            return False
+        update_fields = kwargs.get('update_fields')
+        changed = {self._meta.get_field(name).attname for name in TOKEN_FIELDS} & set(self.get_dirty_fields())
+        if update_fields is not None:
+            if 'token_version' in update_fields:
+                return False  # revoke_tokens() sets it itself
+            changed &= set(update_fields)
+        if not changed:
+            return False
+        self.token_version = models.F('token_version') + 1
+        if update_fields is not None:
+            kwargs['update_fields'] = [*update_fields, 'token_version']
+        return True
 
     # ------------------------------------------------
     # ✅ UPDATE user fields safely
@@ -50,6 +80,15 @@ class User(AbstractUser, Base):
         self.save()
         return self
 
+    # ------------------------------------------------
+    # ✅ REVOKE every issued access token
+    # ------------------------------------------------
+    def revoke_tokens(self):
+        self.token_version = models.F('token_version') + 1
+        self.save(update_fields=['token_version', 'updated_at'])
+        self.refresh_from_db(fields=['token_version'])
+        return self.token_version
+
     # ------------------------------------------------
     # ✅ DELETE user safely (also removes phone numbers)
     # ------------------------------------------------
@@ -121,7 +160,9 @@ class Profile(Base):
         related_name="profile"
     )
     full_name = models.CharField(max_length=255, blank=True, null=True)
-    profile_image = models.ImageField(upload_to="profiles/", blank=True, null=True)
+    profile_image = models.ImageField(
+        upload_to="profiles/", storage=content_addressed_storage, blank=True, null=True
+    )
     job_title = models.CharField(max_length=255, blank=True, null=True)
     bio = models.TextField(blank=True, null=True)
     date_of_birth = models.DateField(blank=True, null=True)
@@ -135,18 +176,30 @@ class Profile(Base):
         return f"Profile of {self.user.username}"
 
     def save(self, *args, **kwargs):
-        # Delete old image if a new one is uploaded
-        if self.pk:
-            old = Profile.objects.filter(pk=self.pk).first()
-            if old and old.profile_image and old.profile_image != self.profile_image:
-                old.profile_image.delete(save=False)
+        # Remember the old image if a new one is uploaded
+        old_name = None
+        if not self._state.adding:
+            if self.is_tracked:
+                # loaded snapshot (core.models.Base) tells us the old file, no refetch
+                old_name = self.get_dirty_fields().get('profile_image')
+            else:
+                old_name = Profile.objects.filter(pk=self.pk).values_list('profile_image', flat=True).first()
+        image_changed = self._state.adding or (self.is_tracked and self.has_changed('profile_image')) or old_name
 
         if not self.user_id:
             raise ValidationError("Profile must be linked to a valid user.")
         super().save(*args, **kwargs)
 
+        # file work happens after commit, off the request thread (users/images.py)
+        storage, new_name = self.profile_image.storage, self.profile_image.name
+        if image_changed and new_name:
+            transaction.on_commit(lambda: images.schedule_variants(new_name, storage))
+        if old_name and old_name != new_name:
+            transaction.on_commit(lambda: images.delete_if_unreferenced(old_name, storage))
+
     def delete(self, *args, **kwargs):
-        # Delete image from disk when profile is deleted
-        if self.profile_image:
-            self.profile_image.delete(save=False)
-        super().delete(*args, **kwargs)
\ No newline at end of file
+        # Remove the image from disk once the delete is committed
+        storage, name = self.profile_image.storage, self.profile_image.name
+        super().delete(*args, **kwargs)
+        if name:
+            transaction.on_commit(lambda: images.delete_if_unreferenced(name, storage))
@@ -0,0 +1,21 @@
+# users/readers.py
+from core.readers import Schema, Nested
+from users.models import User, PhoneNumber
+
+
+# ------------------------------------------------
+# ✅ Read schemas (same output as the serializers, over .values())
+# ------------------------------------------------
+class PhoneNumberRead(Schema):
+    model = PhoneNumber
+    fields = ('id', 'country_code', 'number', 'type', 'verified', 'created_at', 'updated_at')
+    ordering = ('created_at', 'id')
+
+
+class UserRead(Schema):
+    model = User
+    fields = (
+        'id', 'username', 'email', 'country', 'city', 'postal_code', 'address',
+        'is_active', 'created_at', 'updated_at'
+    )
+    phone_numbers = Nested(PhoneNumberRead, many=True)
@@ -3,21 +3,31 @@ from rest_framework import serializers
 from django.core.exceptions import ValidationError
 from users.models import User, Profile, PhoneNumber
 from users.validations import UserDataValidator
+from users.images import variant_urls
 
 
 # ------------------------------------------------
 # ✅ Profile Serializer
 # ------------------------------------------------
 class ProfileSerializer(serializers.ModelSerializer):
+    profile_image_variants = serializers.SerializerMethodField()
+
     class Meta:
         model = Profile
         fields = [
-            'id', 'full_name', 'profile_image', 'job_title',
+            'id', 'full_name', 'profile_image', 'profile_image_variants', 'job_title',
             'bio', 'date_of_birth', 'gender', 'is_public',
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
 
+    def get_profile_image_variants(self, obj):
+        urls = variant_urls(obj.profile_image)
+        request = self.context.get('request')
+        if urls and request is not None:
+            urls = {name: request.build_absolute_uri(url) for name, url in urls.items()}
+        return urls
+
 
 # ------------------------------------------------
 # ✅ Phone Number Serializer (uses validator)
@@ -1,4 +1,274 @@
-#users/tests.py
-from django.test import TestCase
+import io
+import json
+import os
+import subprocess
+import sys
+import shutil
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from unittest import mock
 
-# Create your tests here.
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import DataError
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from auth_api.hashers import shared_hash_process_pool
+from core.testing import QueryCountMixin
+from users.bulk_import import import_users
+from users import images
+from users.models import User, PhoneNumber, Profile
+from users.validations import UserDataValidator
+
+PASSWORD = "Passw0rd!"
+
+
+def make_user(username="bob", **fields):
+    user = User(username=username, email=f"{username}@gmail.com", city="Cairo", country="Egypt", postal_code="11511", **fields)
+    user.set_password(PASSWORD)
+    user.save()
+    return user
+
+
+def import_row(username, **overrides):
+    row = {
+        "username": username, "email": f"{username}@gmail.com", "password": PASSWORD,
+        "country": "Egypt", "city": "Cairo", "postal_code": "11511",
+    }
+    row.update(overrides)
+    return row
+
+
+# ------------------------------------------------
+# 🔹 User endpoints (query counts)
+# ------------------------------------------------
+class UserEndpointTests(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.admin = make_user("admin", is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.added = 0
+
+    def add_users(self, n):
+        for _ in range(n):
+            self.added += 1
+            user = make_user(f"u{self.added}")
+            PhoneNumber.objects.create(user=user, country_code="+20", number=f"+2010012345{self.added:02d}")
+
+    def add_phones(self, n):
+        for _ in range(n):
+            self.added += 1
+            PhoneNumber.objects.create(user=self.admin, country_code="+20", number=f"+2010012345{self.added:02d}",
+                                       type="secondary")
+
+    def test_list_queries_constant(self):
+        self.assertConstantQueries("get", "/users/", grow=self.add_users)
+        response = self.assertMaxQueries(2, "get", "/users/")
+        self.assertEqual(len(response.json()["results"]), 12)
+
+    def test_detail_queries_constant(self):
+        self.assertConstantQueries("get", f"/users/{self.admin.pk}", grow=self.add_phones)
+        response = self.assertMaxQueries(2, "get", f"/users/{self.admin.pk}")
+        self.assertEqual(len(response.json()["phone_numbers"]), 11)
+
+
+# ------------------------------------------------
+# 🔹 Bulk import
+# ------------------------------------------------
+class BulkImportTests(TestCase):
+    def run_import(self, lines, fmt="jsonl"):
+        data = "\n".join(line if isinstance(line, str) else json.dumps(line) for line in lines) + "\n"
+        with ThreadPoolExecutor(2) as executor:
+            return import_users(io.BytesIO(data.encode()), fmt, chunk_size=2, executor=executor).as_dict()
+
+    def test_valid_rows_created_with_phones(self):
+        report = self.run_import([
+            import_row("u1", email="U1@gmail.com", phone_numbers=[{"number": "+201001234567", "country_code": "+20"}]),
+            import_row("u2"),
+            import_row("u3"),
+        ])
+        self.assertEqual((report["created"], report["failed"]), (3, 0))
+        self.assertEqual(User.objects.get(username="u1").email, "u1@gmail.com")
+        self.assertEqual(PhoneNumber.objects.count(), 1)
+        self.assertTrue(User.objects.get(username="u2").check_password(PASSWORD))
+
+    def test_bad_rows_reported_per_row(self):
+        report = self.run_import([
+            import_row("u1"),
+            "not json",
+            "[1, 2]",
+            "42",
+            import_row("u2", city=5),
+            import_row("u3", phone_numbers="+201001234567"),
+            import_row("u4", phone_numbers=[{"number": 201001234567, "country_code": "+20"}]),
+            import_row("u1", email="other@gmail.com"),
+        ])
+        self.assertEqual(report["created"], 1)
+        errors = {error["row"]: error["errors"] for error in report["errors"]}
+        self.assertEqual(sorted(errors), [2, 3, 4, 5, 6, 7, 8])
+        self.assertIn("Each line must be a JSON object.", errors[3])
+        self.assertIn("city must be a string.", errors[5])
+        self.assertIn("phone_numbers must be a list of objects.", errors[6])
+        self.assertIn("phone_numbers.number must be a string.", errors[7])
+        self.assertIn("Duplicate username in import file.", errors[8])
+
+    def test_values_checked_against_model_fields(self):
+        report = self.run_import([
+            import_row("u1", postal_code="1151100000000"),
+            import_row("u2", phone_numbers=[{"number": "+201001234567", "country_code": "+20", "type": "fax"}]),
+            import_row("u3"),
+        ])
+        self.assertEqual((report["created"], report["failed"]), (1, 2))
+        errors = {error["row"]: error["errors"] for error in report["errors"]}
+        self.assertTrue(errors[1][0].startswith("postal_code: "), errors[1])
+        self.assertTrue(errors[2][0].startswith("phone_numbers.type: "), errors[2])
+
+    def test_phone_stored_in_e164(self):
+        report = self.run_import([import_row("u1", phone_numbers=[{"number": "+20 100 123 4567", "country_code": "+20"}])])
+        self.assertEqual(report["created"], 1)
+        self.assertEqual(PhoneNumber.objects.get().number, "+201001234567")
+
+    def test_database_error_fails_only_its_chunk(self):
+        real = PhoneNumber.objects.bulk_create
+        calls = []
+
+        def bulk_create(objs, *args, **kwargs):
+            calls.append(objs)
+            if len(calls) == 1:
+                raise DataError("value too long for type character varying(20)")
+            return real(objs, *args, **kwargs)
+
+        with mock.patch.object(PhoneNumber.objects, "bulk_create", bulk_create):
+            report = self.run_import([import_row("u1"), import_row("u2"), import_row("u3")])
+        self.assertEqual((report["created"], report["failed"]), (1, 2))
+        self.assertEqual([error["row"] for error in report["errors"]], [1, 2])
+        self.assertEqual(list(User.objects.values_list("username", flat=True)), ["u3"])
+
+    def test_existing_users_rejected(self):
+        make_user("u1")
+        report = self.run_import([import_row("u1", email="new@gmail.com")])
+        self.assertEqual(report["errors"][0]["errors"], ["A user with that username already exists."])
+
+    def test_csv_phone_columns(self):
+        report = self.run_import([
+            "username,email,password,country,city,postal_code,phone_number,phone_country_code",
+            f"u1,u1@gmail.com,{PASSWORD},Egypt,Cairo,11511,+201001234567,+20",
+        ], fmt="csv")
+        self.assertEqual(report["created"], 1)
+        self.assertEqual(PhoneNumber.objects.get().user.username, "u1")
+
+    def test_endpoint_reuses_process_pool(self):
+        admin = make_user("admin", is_staff=True)
+        client = APIClient()
+        client.force_authenticate(admin)
+        for username in ("u1", "u2"):
+            upload = SimpleUploadedFile("users.jsonl", json.dumps(import_row(username)).encode())
+            response = client.post("/users/import", {"file": upload}, format="multipart")
+            self.assertEqual(response.status_code, 200, response.content)
+            self.assertEqual(response.data["data"]["created"], 1)
+        self.assertIs(shared_hash_process_pool(), shared_hash_process_pool())
+
+
+# ------------------------------------------------
+# 🔹 UserDataValidator
+# ------------------------------------------------
+class ValidatorTests(TestCase):
+    def test_email_domain_suffixes(self):
+        self.assertEqual(UserDataValidator.validate_email("a@mail.gmail.com"), "a@mail.gmail.com")
+        with self.assertRaisesMessage(ValidationError, "not recognized"):
+            UserDataValidator.validate_email("a@gmail.com.evil.org")
+        with self.assertRaisesMessage(ValidationError, "Invalid email format"):
+            UserDataValidator.validate_email("not-an-email")
+
+    def test_country_by_code_or_name(self):
+        self.assertEqual(UserDataValidator.validate_country_city("egypt", "cairo"), ("EG", "Cairo"))
+        self.assertEqual(UserDataValidator.validate_country_city("EGY", None), ("EG", None))
+        with self.assertRaises(ValidationError):
+            UserDataValidator.validate_country_city("Atlantis", None)
+
+    def test_phone_normalized_to_e164(self):
+        self.assertEqual(UserDataValidator.validate_phone("01001234567", "EG"), "+201001234567")
+        with self.assertRaises(ValidationError):
+            UserDataValidator.validate_phone("123", "EG")
+
+    def test_validate_record_collects_every_error(self):
+        errors = UserDataValidator.validate_record(import_row("u1", password="short", email="x@bad.org"))
+        self.assertEqual(len(errors), 2)
+
+
+class LazyValidationImportTests(TestCase):
+    def test_phone_and_country_data_not_loaded_at_startup(self):
+        code = (
+            "import sys, django; django.setup(); import business_core.urls; "
+            "print('phonenumbers' in sys.modules, 'pycountry' in sys.modules)"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=os.environ.copy())
+        self.assertEqual(result.stdout.strip(), "False False", result.stderr)
+
+
+# ------------------------------------------------
+# 🔹 Profile images
+# ------------------------------------------------
+class InlineExecutor:
+    """Runs image tasks on submit, so tests need not wait for the worker threads."""
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+def png(color):
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (800, 600), color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class ProfileImageTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        executor = mock.patch.object(images, "_executor", InlineExecutor())
+        executor.start()
+        self.addCleanup(executor.stop)
+        self.user = make_user()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def upload(self, content, client=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = (client or self.client).patch(
+                "/users/profile", {"profile_image": SimpleUploadedFile("a.png", content)}, format="multipart"
+            )
+        self.assertEqual(response.status_code, 200, response.content)
+        return Profile.objects.get(user__username=response.wsgi_request.user.username).profile_image.name
+
+    def exists(self, name):
+        return os.path.exists(os.path.join(self.media_root, name))
+
+    def test_variants_rendered_and_served(self):
+        name = self.upload(png("red"))
+        self.assertTrue(self.exists(images.variant_name(name, "thumb")))
+        variants = self.client.get("/users/profile").data["profile_image_variants"]
+        self.assertTrue(variants["thumb"].endswith("_thumb.webp"))
+
+    def test_shared_file_removed_only_when_unreferenced(self):
+        other = make_user("al")
+        other_client = APIClient()
+        other_client.force_authenticate(other)
+        shared = self.upload(png("red"))
+        self.assertEqual(self.upload(png("red"), other_client), shared)
+
+        self.upload(png("blue"))
+        self.assertTrue(self.exists(shared))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Profile.objects.get(user=other).delete()
+        self.assertFalse(self.exists(shared))
+        self.assertFalse(self.exists(images.variant_name(shared, "thumb")))
@@ -5,5 +5,7 @@ from .views import *
 urlpatterns = [
     path('register', RegisterView.as_view(), name='register'),
      path('profile', ProfileRetrieveUpdateView.as_view(), name='profile'),
-    # path('<int:pk>/', UserDetailView.as_view(), name='user-detail'),
+    path('import', BulkUserImportView.as_view(), name='user-import'),
+    path('', UserListView.as_view(), name='user-list'),
+    path('<uuid:pk>', UserDetailView.as_view(), name='user-detail'),
 ]
@@ -1,10 +1,73 @@
 #users/validations.py
 import re
+from functools import lru_cache
+
 from django.core.exceptions import ValidationError
-from django_countries import countries
-from phonenumbers import parse as parse_phone, is_valid_number, NumberParseException
-import phonenumbers
-import pycountry
+
+# phonenumbers and pycountry (and their datasets) are imported on first use,
+# so workers that never validate user data don't pay for them at boot.
+# VALIDATION_PRELOAD = True loads them in UsersConfig.ready() instead, which
+# runs in the master process under `gunicorn --preload` and is shared after fork.
+
+
+# ------------------------------------------------
+# ✅ Compiled once at import
+# ------------------------------------------------
+USERNAME_RE = re.compile(r'^[A-Za-z0-9_]+$')
+EMAIL_RE = re.compile(r'^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$')
+UPPER_RE = re.compile(r'[A-Z]')
+LOWER_RE = re.compile(r'[a-z]')
+DIGIT_RE = re.compile(r'\d')
+SPECIAL_RE = re.compile(r'[!@#$%^&*(),.?":{}|<>]')
+
+ALLOWED_EMAIL_DOMAINS = frozenset({'gmail.com', 'outlook.com', 'yahoo.com', 'hotmail.com', 'icloud.com'})
+COUNTRY_FIELDS = ('alpha_2', 'alpha_3', 'numeric', 'name', 'official_name', 'common_name')
+PHONE_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=1)
+def country_index():
+    """Normalized code/name -> alpha_2, built once from pycountry."""
+    import pycountry
+
+    index = {}
+    for country in pycountry.countries:
+        for field in COUNTRY_FIELDS:
+            value = getattr(country, field, None)
+            if value:
+                index.setdefault(value.strip().lower(), country.alpha_2)
+    return index
+
+
+def _domain_allowed(domain):
+    # every dot-suffix of the domain ("mail.gmail.com" -> "gmail.com", "com") is a set hit
+    parts = domain.split('.')
+    return any('.'.join(parts[i:]) in ALLOWED_EMAIL_DOMAINS for i in range(len(parts) - 1))
+
+
+@lru_cache(maxsize=PHONE_CACHE_SIZE)
+def _normalize_phone(phone_number, country_code):
+    """Returns (e164, error); cached because the same numbers recur across requests."""
+    import phonenumbers
+    from phonenumbers import parse as parse_phone, is_valid_number, NumberParseException
+
+    try:
+        parsed = parse_phone(phone_number, country_code or None)
+    except NumberParseException:
+        return None, "Invalid phone number format."
+
+    if not is_valid_number(parsed):
+        return None, "Invalid phone number for the specified country."
+
+    return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164), None
+
+
+def preload():
+    """Imports the validation datasets and builds the indexes up front."""
+    import phonenumbers
+
+    phonenumbers.PhoneMetadata.load_all()
+    country_index()
 
 
 class UserDataValidator:
@@ -19,7 +82,7 @@ class UserDataValidator:
         if not username:
             raise ValidationError("Username must be provided.")
 
-        if not re.match(r'^[A-Za-z0-9_]+$', username):
+        if not USERNAME_RE.match(username):
             return ValidationError("Username cannot contain spaces or special characters.")
 
         return username
@@ -29,13 +92,13 @@ class UserDataValidator:
     def validate_password(cls, password, username=None):
         if len(password) < 8:
             raise ValidationError("Password must be at least 8 characters long.")
-        if not re.search(r'[A-Z]', password):
+        if not UPPER_RE.search(password):
             raise ValidationError("Password must contain at least one uppercase letter.")
-        if not re.search(r'[a-z]', password):
+        if not LOWER_RE.search(password):
             raise ValidationError("Password must contain at least one lowercase letter.")
-        if not re.search(r'\d', password):
+        if not DIGIT_RE.search(password):
             raise ValidationError("Password must contain at least one digit.")
-        if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+        if not SPECIAL_RE.search(password):
             raise ValidationError("Password must contain at least one special character.")
         if username and username.lower() in password.lower():
             raise ValidationError("Password should not contain your username.")
@@ -47,13 +110,11 @@ class UserDataValidator:
         if not email:
             return None  # Optional
 
-        email_regex = r'^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$'
-        if not re.match(email_regex, email):
+        if not EMAIL_RE.match(email):
             raise ValidationError("Invalid email format.")
 
-        allowed_domains = ['gmail.com', 'outlook.com', 'yahoo.com', 'hotmail.com', 'icloud.com']
-        domain = email.split('@')[-1].lower()
-        if not any(domain.endswith(d) for d in allowed_domains):
+        domain = email.rsplit('@', 1)[-1].lower()
+        if not _domain_allowed(domain):
             raise ValidationError("Email domain is not recognized as a valid provider.")
         return email
 
@@ -63,9 +124,8 @@ class UserDataValidator:
         if not country_name:
             return None, None
 
-        try:
-            country = pycountry.countries.lookup(country_name)
-        except LookupError:
+        alpha_2 = country_index().get(country_name.strip().lower()) if isinstance(country_name, str) else None
+        if alpha_2 is None:
             raise ValidationError(f"Invalid country name: {country_name}")
 
         # Optional: Check city exists using pycountry or simpledb
@@ -75,7 +135,7 @@ class UserDataValidator:
             if len(city_name) < 2:
                 raise ValidationError("City name is too short to be valid.")
 
-        return country.alpha_2, city_name
+        return alpha_2, city_name
 
     # 5️⃣ Validate Phone Number
     @classmethod
@@ -83,15 +143,41 @@ class UserDataValidator:
         if not phone_number:
             raise ValidationError("Phone number is required.")
 
-        try:
-            if country_code:
-                parsed = parse_phone(phone_number, country_code)
-            else:
-                parsed = parse_phone(phone_number, None)
-        except NumberParseException:
-            raise ValidationError("Invalid phone number format.")
-
-        if not is_valid_number(parsed):
-            raise ValidationError("Invalid phone number for the specified country.")
+        e164, error = _normalize_phone(phone_number, country_code)
+        if error:
+            raise ValidationError(error)
+        return e164
 
-        return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+    # 6️⃣ Validate a whole record (registration / import row)
+    @classmethod
+    def validate_record(cls, record):
+        """
+        Runs the registration checks on one dict and returns the list of
+        messages (empty when valid) instead of stopping at the first error.
+        """
+        errors = []
+        username = record.get('username')
+        checks = (
+            (cls.validate_username, (username,)),
+            (cls.validate_password, (record.get('password') or '', username)),
+            (cls.validate_email, (record.get('email'),)),
+            (cls.validate_country_city, (record.get('country'), record.get('city'))),
+        )
+        for check, args in checks:
+            try:
+                check(*args)
+            except ValidationError as e:
+                errors.extend(e.messages)
+
+        for phone in record.get('phone_numbers') or []:
+            try:
+                cls.validate_phone(phone.get('number'), phone.get('country_code'))
+            except ValidationError as e:
+                errors.extend(e.messages)
+        return errors
+
+    # 7️⃣ Validate many records at once
+    @classmethod
+    def validate_many(cls, records):
+        """Returns one error list per record, in input order."""
+        return [cls.validate_record(record) for record in records]
@@ -4,7 +4,12 @@ from rest_framework.response import Response
 from users.models import User,Profile
 from users.serializers import UserSerializer, ProfileSerializer
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.parsers import MultiPartParser
+from users.bulk_import import import_users, detect_format
+from auth_api.hashers import shared_hash_process_pool
+from users.readers import UserRead
+from core.readers import SchemaReadMixin
 class RegisterView(generics.CreateAPIView):
 
     queryset = User.objects.all()
@@ -45,7 +50,7 @@ class ProfileRetrieveUpdateView(generics.RetrieveUpdateAPIView):
     def get_object(self):
         # Use the authenticated user instead of first()
         user = self.request.user
-        profile, _ = Profile.objects.get_or_create(user=user)
+        profile, _ = Profile.objects.get_or_create(user_id=user.pk)
         return profile
 
     def update(self, request, *args, **kwargs):
@@ -58,3 +63,43 @@ class ProfileRetrieveUpdateView(generics.RetrieveUpdateAPIView):
             "message": "Profile updated successfully.",
             "profile": serializer.data
         }, status=status.HTTP_200_OK)
+
+
+class UserListView(SchemaReadMixin, generics.ListAPIView):
+    """Admin user list; reads through UserRead (2 queries per page, phone numbers included)."""
+    queryset = User.objects.all()
+    serializer_class = UserSerializer
+    read_schema = UserRead
+    permission_classes = [IsAdminUser]
+
+
+class UserDetailView(SchemaReadMixin, generics.RetrieveAPIView):
+    queryset = User.objects.all()
+    serializer_class = UserSerializer
+    read_schema = UserRead
+    permission_classes = [IsAdminUser]
+
+
+class BulkUserImportView(generics.GenericAPIView):
+    """
+    POST a JSONL or CSV file as `file` (multipart); `format` overrides the
+    extension-based detection. Returns created/failed counts and per-row errors.
+    """
+    permission_classes = [IsAdminUser]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request, *args, **kwargs):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"error": "No file uploaded."}, status=status.HTTP_400_BAD_REQUEST)
+
+        fmt = request.data.get('format') or detect_format(upload.name)
+        if fmt not in ('jsonl', 'csv'):
+            return Response({"error": "Format must be jsonl or csv."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # large uploads are spooled to a temp file, so rows are read straight from disk
+        report = import_users(upload.file, fmt, executor=shared_hash_process_pool())
+        return Response(
+            {"message": "Import finished", "data": report.as_dict()},
+            status=status.HTTP_200_OK
+        )